@@ -9,6 +9,7 @@ sys.path.append(os.path.dirname(__file__))
 from config import STREAMLIT_CONFIG
 from utils.auth import check_authentication, show_login_form, show_user_info
 from utils.database import get_db_manager
+from utils.logging_setup import bind_request_context
 from utils.helpers import create_stats_overview
 
 # =====================================================
@@ -142,6 +143,7 @@ st.markdown("""
 
 def main():
     """Função principal da aplicação"""
+    bind_request_context()
     
     # Verificar autenticação
     if not check_authentication():
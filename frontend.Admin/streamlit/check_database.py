@@ -1,5 +1,9 @@
 # check_database.py - Verificar e ajustar estrutura da tabela
-from utils.database import get_db_manager
+from utils.database import get_db_manager, IMAGE_STATUS_COLUMN_DDL
+from utils.jobs import JOBS_TABLE_DDL
+from utils.indexes import create_missing_indexes, get_missing_indexes
+from utils.counters import install_counters
+from utils.reprocess import RENDITIONS_TABLE_DDL
 
 def check_and_fix_database():
     """Verifica a estrutura da tabela e adiciona colunas faltantes"""
@@ -32,7 +36,10 @@ def check_and_fix_database():
             'approved_at': 'ALTER TABLE tournament_images ADD COLUMN IF NOT EXISTS approved_at TIMESTAMP;',
             'mime_type': 'ALTER TABLE tournament_images ADD COLUMN IF NOT EXISTS mime_type VARCHAR(50);',
             'title': 'ALTER TABLE tournament_images ADD COLUMN IF NOT EXISTS title VARCHAR(255);',
-            'description': 'ALTER TABLE tournament_images ADD COLUMN IF NOT EXISTS description TEXT;'
+            'description': 'ALTER TABLE tournament_images ADD COLUMN IF NOT EXISTS description TEXT;',
+            'review_claimed_by': 'ALTER TABLE tournament_images ADD COLUMN IF NOT EXISTS review_claimed_by VARCHAR(100);',
+            'review_claimed_at': 'ALTER TABLE tournament_images ADD COLUMN IF NOT EXISTS review_claimed_at TIMESTAMP;',
+            'status': IMAGE_STATUS_COLUMN_DDL.strip()
         }
         
         # Verificar quais colunas estão faltando
@@ -68,6 +75,41 @@ def check_and_fix_database():
                     print(alter_sql)
         else:
             print("\n✅ Todas as colunas necessárias estão presentes!")
+        
+        # Tabelas auxiliares do dashboard (idempotentes)
+        auxiliary_tables = {
+            'admin_jobs': JOBS_TABLE_DDL,
+            'tournament_image_renditions': RENDITIONS_TABLE_DDL,
+        }
+        
+        print("\nVerificando tabelas auxiliares:")
+        for table_name, ddl in auxiliary_tables.items():
+            if db.execute_ddl(ddl):
+                print(f"✅ Tabela '{table_name}' disponível")
+            else:
+                print(f"❌ Erro ao criar tabela '{table_name}'")
+        
+        # Contadores por (categoria, ativa, aprovada) mantidos por triggers
+        print("\nInstalando contadores de imagens:")
+        if install_counters(db):
+            print("✅ Tabela 'tournament_image_counters' instalada e recalculada")
+        else:
+            print("❌ Erro ao instalar contadores de imagens")
+        
+        # Índices exigidos pelo dashboard (CREATE INDEX CONCURRENTLY)
+        print("\nVerificando índices:")
+        db.schema_cache.clear()  # colunas podem ter sido adicionadas acima
+        missing_indexes = get_missing_indexes(db)
+        if not missing_indexes:
+            print("✅ Todos os índices exigidos existem")
+        else:
+            for index in missing_indexes:
+                print(f"- {index['name']}: {index['purpose']}")
+            try:
+                result = create_missing_indexes(db=db)
+                print(f"✅ {len(result['created'])} índices criados")
+            except RuntimeError as e:
+                print(f"❌ {e}")
             
     except Exception as e:
         print(f"❌ Erro ao verificar banco: {e}")
@@ -37,6 +37,17 @@ UPLOAD_CONFIG = {
     },
     'thumbnail_size': (150, 150),
     'quality': 85,
+    'thumbnail_quality': 85,
+    'max_dimension': 1024,  # Lado máximo da imagem principal após otimização
+    # 'fixed' usa quality/thumbnail_quality; 'adaptive' escolhe a qualidade
+    # por imagem (bisseção) para atingir o piso de SSIM dentro do orçamento
+    'encoding': {
+        'mode': os.getenv('ADMIN_ENCODING_MODE', 'fixed'),
+        'min_quality': 40,
+        'max_quality': 92,
+        'main': {'max_bytes': 300 * 1024, 'ssim_floor': 0.95},
+        'thumbnail': {'max_bytes': 16 * 1024, 'ssim_floor': 0.92},
+    },
 }
 
 # Caminhos de armazenamento
@@ -140,11 +151,14 @@ AUTH_CONFIG = {
     'admin_users': {
         'admin': {
             'password': os.getenv('ADMIN_PASSWORD', 'matchit_admin_2025'),
+            # users.id gravado em approved_by (INTEGER); sem ele approved_by não é alterado
+            'user_id': int(os.getenv('ADMIN_USER_ID')) if os.getenv('ADMIN_USER_ID') else None,
             'role': 'super_admin',
             'permissions': ['read', 'write', 'delete', 'admin']
         },
         'moderator': {
             'password': os.getenv('MODERATOR_PASSWORD', 'matchit_mod_2025'),
+            'user_id': int(os.getenv('MODERATOR_USER_ID')) if os.getenv('MODERATOR_USER_ID') else None,
             'role': 'moderator', 
             'permissions': ['read', 'write']
         }
@@ -182,15 +196,236 @@ PAGINATION_CONFIG = {
     'max_results': 1000,
 }
 
+# =====================================================
+# CONFIGURAÇÕES DA FILA DE REVISÃO
+# =====================================================
+
+REVIEW_QUEUE_CONFIG = {
+    'batch_size': 10,           # Imagens reservadas por lote
+    'flush_size': 5,            # Decisões acumuladas antes de gravar no banco
+    'claim_lease_minutes': 15,  # Reservas expiradas voltam para a fila
+}
+
+# =====================================================
+# CONFIGURAÇÕES DE TAREFAS EM SEGUNDO PLANO
+# =====================================================
+
+JOBS_CONFIG = {
+    'max_workers': 2,             # Tarefas executadas em paralelo
+    'progress_interval': 1.0,     # Intervalo mínimo (s) entre gravações de progresso
+    'history_limit': 20,          # Tarefas exibidas no painel
+    'panel_refresh_seconds': 2,   # Atualização automática do painel
+    'heartbeat_interval': 15,     # Intervalo (s) entre heartbeats das tarefas do processo
+    'stale_after_seconds': 120,   # Tarefa ativa sem heartbeat há mais tempo é considerada interrompida
+}
+
+# =====================================================
+# CONFIGURAÇÕES DE RECONCILIAÇÃO DE ARQUIVOS
+# =====================================================
+
+ORPHAN_CONFIG = {
+    'workers': 8,            # Threads para chamadas stat/exists
+    'chunk_size': 1000,      # Arquivos/registros processados por lote
+    'report_limit': 200,     # Amostras de caminhos/IDs guardadas no resultado
+    'min_age_minutes': 60,   # Ignora arquivos recentes (upload em andamento)
+}
+
+# =====================================================
+# CONFIGURAÇÕES DE BACKUP
+# =====================================================
+
+BACKUP_CONFIG = {
+    'path': os.path.join(os.path.dirname(__file__), 'backups'),
+    # Tabelas copiadas (as inexistentes no banco são ignoradas)
+    'tables': [
+        'tournament_images',
+        'tournament_sessions',
+        'tournament_choices',
+        'tournament_results',
+    ],
+    'compression': 'zstd',        # Usa gzip se o pacote 'zstandard' não estiver instalado
+    'zstd_level': 3,
+    'gzip_level': 6,
+    'read_block_size': 1024 * 1024,
+}
+
+# Criar diretório de backups
+os.makedirs(BACKUP_CONFIG['path'], exist_ok=True)
+
+# =====================================================
+# CONFIGURAÇÕES DE REPROCESSAMENTO
+# =====================================================
+
+REPROCESS_CONFIG = {
+    'workers': min(os.cpu_count() or 2, 8),  # Processos de renderização
+    'chunk_size': 200,  # Imagens por lote (cada lote grava o checkpoint)
+    'start_method': 'forkserver',  # 'spawn' onde forkserver não existe
+}
+
+# =====================================================
+# CONFIGURAÇÕES DO STORE DE THUMBNAILS
+# =====================================================
+
+# Thumbnails em pack files + índice (leitura via mmap) em vez de um arquivo
+# por imagem. Thumbnails empacotados não existem como arquivos em /uploads.
+THUMBNAIL_STORE_CONFIG = {
+    'enabled': os.getenv('ADMIN_THUMBNAIL_STORE', 'false').lower() == 'true',
+    'path': os.path.join(THUMBNAILS_PATH, 'packs'),
+    'pack_max_bytes': 256 * 1024 * 1024,
+    # Compacta em segundo plano quando o espaço morto passa dos dois limites
+    'compact_dead_ratio': 0.3,
+    'compact_min_dead_bytes': 16 * 1024 * 1024,
+}
+
+# =====================================================
+# CONFIGURAÇÕES DE URLS DAS IMAGENS
+# =====================================================
+
+RENDITION_URL_CONFIG = {
+    # 'nginx': /uploads servido pelo nginx (ETag + cache longo)
+    # 'bytes': bytes enviados pelo websocket (sem servidor de arquivos)
+    'mode': os.getenv('ADMIN_RENDITION_URLS', 'bytes'),
+    # Origem vista pelo navegador (vazio: derivada dos headers da sessão)
+    'public_url': os.getenv('ADMIN_PUBLIC_URL', ''),
+    # Caminho (na origem acima) ou URL absoluta do location /uploads do nginx
+    'nginx_base_url': os.getenv('ADMIN_UPLOADS_URL', '/uploads'),
+}
+
+# =====================================================
+# CONFIGURAÇÕES DE ÍNDICES
+# =====================================================
+
+INDEX_CONFIG = {
+    'fillfactor': 90,                        # Padrão do B-tree no PostgreSQL
+    'bloat_ratio_threshold': 0.3,            # Fração estimada de espaço desperdiçado
+    'bloat_min_size_bytes': 1024 * 1024,     # Ignora índices pequenos
+}
+
+# =====================================================
+# CONFIGURAÇÕES DE CONTAGEM
+# =====================================================
+
+COUNT_CONFIG = {
+    # 'exact', 'approximate' ou 'auto' (estimativas a partir do limite abaixo)
+    'mode': os.getenv('ADMIN_COUNT_MODE', 'auto'),
+    'approximate_threshold': 1_000_000,  # Linhas (pg_class.reltuples)
+    'recount_workers': 1,
+}
+
+# =====================================================
+# CONFIGURAÇÕES DE CONSULTAS PARALELAS
+# =====================================================
+
+# Pool psycopg3 usado para buscar em paralelo as consultas de uma página
+ASYNC_DB_CONFIG = {
+    'min_size': 1,
+    'max_size': 8,
+    'timeout': 30,  # Segundos aguardando uma conexão livre
+}
+
+# Alternativa síncrona: DatabaseManager.run_parallel (threads + pool psycopg2)
+PARALLEL_QUERY_CONFIG = {
+    'max_workers': 4,  # Consultas simultâneas por processo (= conexões do pool)
+}
+
+# =====================================================
+# CONFIGURAÇÕES DE CACHE
+# =====================================================
+
+CACHE_CONFIG = {
+    # Canal NOTIFY usado para propagar limpezas entre réplicas
+    'notify_channel': 'matchit_admin_cache',
+    'listen': True,
+    'namespaces': {
+        'queries': {
+            'max_entries': 256,
+            'ttl': 30,
+            'description': 'Resultados de listagens de imagens',
+        },
+        'rollups': {
+            'max_entries': 32,
+            'ttl': 60,
+            'description': 'Agregados do dashboard e das categorias',
+        },
+        'schema': {
+            'max_entries': 64,
+            'ttl': 300,
+            'description': 'Colunas das tabelas (information_schema)',
+        },
+        'counts': {
+            'max_entries': 256,
+            'ttl': 300,
+            'description': 'Contagens exatas (recontadas em segundo plano)',
+        },
+        'thumbnails': {
+            'max_entries': 2000,
+            'max_bytes': 64 * 1024 * 1024,
+            'ttl': 3600,
+            'description': 'Bytes dos thumbnails em disco',
+        },
+        'contact_sheets': {
+            'max_entries': 64,
+            'max_bytes': 32 * 1024 * 1024,
+            'ttl': 3600,
+            'description': 'Contact sheets (uma imagem por página do grid)',
+        },
+    },
+}
+
+# =====================================================
+# CONFIGURAÇÕES DO CONTACT SHEET
+# =====================================================
+
+CONTACT_SHEET_CONFIG = {
+    'columns': 5,
+    'cell_size': 160,  # Pixels por célula (thumbnail centralizado)
+    'padding': 4,
+    'quality': 80,
+}
+
+# =====================================================
+# CONFIGURAÇÕES DA GALERIA
+# =====================================================
+
+GALLERY_CONFIG = {
+    'max_rows': 2000,  # Imagens carregadas no modo galeria (sem paginação)
+    'row_height': 96,
+    'height': 720,  # Altura da área com rolagem virtualizada
+}
+
+# =====================================================
+# CONFIGURAÇÕES DE EXPORTAÇÃO
+# =====================================================
+
+EXPORT_CONFIG = {
+    'path': os.path.join(os.path.dirname(__file__), 'exports'),
+    'chunk_size': 5000,  # Linhas por lote no cursor do servidor
+    'formats': ['csv', 'parquet'],
+}
+
+# Criar diretório de exportações
+os.makedirs(EXPORT_CONFIG['path'], exist_ok=True)
+
 # =====================================================
 # CONFIGURAÇÕES DE LOGS
 # =====================================================
 
 LOGGING_CONFIG = {
     'level': 'INFO',
-    'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    'file': os.path.join(os.path.dirname(__file__), 'logs', 'admin_dashboard.log')
+    'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s',  # Console
+    'file': os.path.join(os.path.dirname(__file__), 'logs', 'admin_dashboard.log'),  # JSON, um evento por linha
+    'max_bytes': 20 * 1024 * 1024,   # Rotação por tamanho
+    'backup_count': 5,
 }
 
 # Criar diretório de logs
-os.makedirs(os.path.dirname(LOGGING_CONFIG['file']), exist_ok=True)
\ No newline at end of file
+os.makedirs(os.path.dirname(LOGGING_CONFIG['file']), exist_ok=True)
+
+LOG_VIEWER_CONFIG = {
+    'default_lines': 200,
+    'max_lines': 2000,
+    'block_size': 64 * 1024,               # Bloco lido de trás para frente
+    'max_scan_bytes': 32 * 1024 * 1024,    # Limite de leitura ao buscar as últimas linhas
+    'max_follow_bytes': 1024 * 1024,       # Limite por atualização ao acompanhar
+    'refresh_seconds': 2,
+}
\ No newline at end of file
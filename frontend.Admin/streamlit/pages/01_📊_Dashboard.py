@@ -12,11 +12,13 @@ sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from utils.auth import require_auth
 from utils.database import get_db_manager
+from utils.logging_setup import bind_request_context
 from utils.helpers import format_number, get_categories_enum, create_metric_card
 from config import TOURNAMENT_CONFIG
 
 def main():
     """Página principal do dashboard com estatísticas gerais"""
+    bind_request_context()
     
     # Verificar autenticação
     if not require_auth():
@@ -29,12 +31,15 @@ def main():
     db = get_db_manager()
     
     try:
+        # Todos os dados da página em uma query (cache de curta duração)
+        overview = db.get_dashboard_overview()
+        totals = overview['totals']
+        
         # === MÉTRICAS PRINCIPAIS ===
         col1, col2, col3, col4 = st.columns(4)
         
         # Total de imagens
-        total_images_query = "SELECT COUNT(*) as total FROM tournament_images"
-        total_images = db.fetch_one(total_images_query)['total']
+        total_images = totals['total']
         
         with col1:
             create_metric_card(
@@ -45,12 +50,7 @@ def main():
             )
         
         # Imagens aprovadas
-        approved_query = """
-            SELECT COUNT(*) as approved 
-            FROM tournament_images 
-            WHERE approved = true
-        """
-        approved_images = db.fetch_one(approved_query)['approved']
+        approved_images = totals['approved']
         approval_rate = (approved_images / total_images * 100) if total_images > 0 else 0
         
         with col2:
@@ -62,12 +62,7 @@ def main():
             )
         
         # Imagens pendentes
-        pending_query = """
-            SELECT COUNT(*) as pending 
-            FROM tournament_images 
-            WHERE approved = false AND active = true
-        """
-        pending_images = db.fetch_one(pending_query)['pending']
+        pending_images = totals['pending']
         
         with col3:
             create_metric_card(
@@ -97,30 +92,9 @@ def main():
             st.subheader("📈 Distribuição por Status")
             
             # Gráfico de status das imagens (baseado em approved e active)
-            status_query = """
-                SELECT 
-                    CASE 
-                        WHEN approved = true THEN 'approved'
-                        WHEN approved = false AND active = true THEN 'pending'
-                        WHEN active = false THEN 'inactive'
-                        ELSE 'unknown'
-                    END as status,
-                    COUNT(*) as count
-                FROM tournament_images
-                GROUP BY 
-                    CASE 
-                        WHEN approved = true THEN 'approved'
-                        WHEN approved = false AND active = true THEN 'pending'
-                        WHEN active = false THEN 'inactive'
-                        ELSE 'unknown'
-                    END
-                ORDER BY count DESC
-            """
-            status_data = db.fetch_all(status_query)
+            df_status = overview['status']
             
-            if status_data:
-                df_status = pd.DataFrame(status_data)
-                
+            if not df_status.empty:
                 # Mapear cores para cada status
                 color_map = {
                     'approved': '#28a745',    # Verde
@@ -147,19 +121,9 @@ def main():
             st.subheader("📊 Imagens por Categoria")
             
             # Gráfico de distribuição por categoria
-            category_query = """
-                SELECT category, COUNT(*) as count
-                FROM tournament_images
-                WHERE approved = true
-                GROUP BY category
-                ORDER BY count DESC
-                LIMIT 10
-            """
-            category_data = db.fetch_all(category_query)
+            df_category = overview['categories']
             
-            if category_data:
-                df_category = pd.DataFrame(category_data)
-                
+            if not df_category.empty:
                 fig_category = px.bar(
                     df_category,
                     x='category',
@@ -181,30 +145,11 @@ def main():
         # === TABELA DE ATIVIDADE RECENTE ===
         st.subheader("🕒 Atividade Recente")
         
-        recent_query = """
-            SELECT 
-                id,
-                title,
-                category,
-                CASE 
-                    WHEN approved = true THEN 'approved'
-                    WHEN approved = false AND active = true THEN 'pending'
-                    WHEN active = false THEN 'inactive'
-                    ELSE 'unknown'
-                END as status,
-                uploaded_at as upload_date,
-                image_url as file_path
-            FROM tournament_images
-            ORDER BY uploaded_at DESC
-            LIMIT 10
-        """
-        recent_data = db.fetch_all(recent_query)
+        df_recent = overview['recent']
         
-        if recent_data:
-            df_recent = pd.DataFrame(recent_data)
-            
-            # Formatar data
-            df_recent['upload_date'] = pd.to_datetime(df_recent['upload_date']).dt.strftime('%d/%m/%Y %H:%M')
+        if not df_recent.empty:
+            # Formatar data (coluna já chega como datetime64)
+            df_recent['upload_date'] = df_recent['upload_date'].dt.strftime('%d/%m/%Y %H:%M')
             
             # Adicionar indicadores de status
             status_indicators = {
@@ -246,13 +191,7 @@ def main():
         
         with col2:
             # Média de uploads por dia (últimos 30 dias)
-            uploads_query = """
-                SELECT COUNT(*) as daily_uploads
-                FROM tournament_images
-                WHERE uploaded_at >= NOW() - INTERVAL '30 days'
-            """
-            uploads_data = db.fetch_one(uploads_query)
-            daily_avg = uploads_data['daily_uploads'] / 30 if uploads_data else 0
+            daily_avg = totals['uploads_30d'] / 30
             
             st.metric(
                 label="Uploads/Dia (30d)",
@@ -262,13 +201,7 @@ def main():
         
         with col3:
             # Tamanho médio dos arquivos
-            size_query = """
-                SELECT AVG(file_size) as avg_size
-                FROM tournament_images
-                WHERE file_size IS NOT NULL
-            """
-            size_data = db.fetch_one(size_query)
-            avg_size = size_data['avg_size'] if size_data and size_data['avg_size'] else 0
+            avg_size = totals['avg_file_size'] or 0
             avg_size_mb = avg_size / (1024 * 1024) if avg_size > 0 else 0
             
             st.metric(
@@ -281,27 +214,9 @@ def main():
         st.markdown("---")
         st.subheader("📅 Timeline de Uploads (Últimos 30 dias)")
         
-        timeline_query = """
-            SELECT 
-                DATE(uploaded_at) as date,
-                COUNT(*) as uploads,
-                CASE 
-                    WHEN approved = true THEN 'approved'
-                    WHEN approved = false AND active = true THEN 'pending'
-                    WHEN active = false THEN 'inactive'
-                    ELSE 'unknown'
-                END as status
-            FROM tournament_images
-            WHERE uploaded_at >= NOW() - INTERVAL '30 days'
-            GROUP BY DATE(uploaded_at), status
-            ORDER BY date DESC
-        """
-        timeline_data = db.fetch_all(timeline_query)
+        df_timeline = overview['timeline']
         
-        if timeline_data:
-            df_timeline = pd.DataFrame(timeline_data)
-            df_timeline['date'] = pd.to_datetime(df_timeline['date'])
-            
+        if not df_timeline.empty:
             fig_timeline = px.bar(
                 df_timeline,
                 x='date',
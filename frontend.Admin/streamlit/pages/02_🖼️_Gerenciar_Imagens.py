@@ -1,5 +1,6 @@
 # pages/02_🖼️_Gerenciar_Imagens.py - Página de gerenciamento CRUD de imagens
 import streamlit as st
+import streamlit.components.v1 as components
 import pandas as pd
 import os
 import sys
@@ -10,12 +11,25 @@ sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from utils.auth import require_auth, can_write, can_delete, get_current_user_data
 from utils.database import get_db_manager
-from utils.image_handler import show_image_upload_form, ImageHandler
+from utils.logging_setup import bind_request_context
+from utils.image_handler import show_image_upload_form, ImageHandler, get_image_handler, renditions_by_url
+from utils.reprocess import record_rendition
+from utils.contact_sheet import build_contact_sheet, cell_at, highlight_selection, to_data_url
+from utils.gallery import show_image_gallery
+from utils.export import export_catalog_to_file
+from utils.review_queue import ReviewQueue
 from utils.helpers import (
     create_filter_sidebar, show_pagination, format_date, format_file_size,
-    show_bulk_actions, show_confirmation_dialog, truncate_text, get_category_display_info
+    show_bulk_actions, show_confirmation_dialog, truncate_text, get_category_display_info,
+    get_date_range
 )
-from config import TOURNAMENT_CATEGORIES
+from config import TOURNAMENT_CATEGORIES, EXPORT_CONFIG, GALLERY_CONFIG
+
+try:
+    from streamlit_image_coordinates import streamlit_image_coordinates
+    IMAGE_CLICK_AVAILABLE = True
+except ImportError:  # Sem o componente, a seleção no contact sheet é por número
+    IMAGE_CLICK_AVAILABLE = False
 
 # =====================================================
 # CONFIGURAÇÃO DA PÁGINA
@@ -27,6 +41,17 @@ st.set_page_config(
     layout="wide"
 )
 
+# Fragmentos reexecutam só a própria função; sem suporte, a página inteira
+fragment = st.fragment if hasattr(st, 'fragment') else (lambda func: func)
+
+def rerun_fragment():
+    """Reexecuta apenas o fragmento atual (ou a página, sem suporte a fragmentos)"""
+    
+    if hasattr(st, 'fragment'):
+        st.rerun(scope="fragment")
+    else:
+        st.rerun()
+
 # =====================================================
 # FUNÇÃO PRINCIPAL
 # =====================================================
@@ -34,6 +59,7 @@ st.set_page_config(
 @require_auth(['read'])
 def main():
     """Função principal da página de gerenciamento de imagens"""
+    bind_request_context()
     
     st.markdown("# 🖼️ Gerenciamento de Imagens")
     st.markdown("---")
@@ -46,18 +72,24 @@ def main():
         st.session_state.current_view = 'list'
     
     # Tabs principais
-    tab1, tab2, tab3 = st.tabs(["📋 Listar Imagens", "📤 Upload", "🔧 Ações em Lote"])
+    tab1, tab2, tab3, tab4 = st.tabs(["📋 Listar Imagens", "✅ Fila de Revisão", "📤 Upload", "🔧 Ações em Lote"])
     
     with tab1:
         show_images_list()
     
     with tab2:
+        if can_write():
+            show_review_queue_section()
+        else:
+            st.error("❌ Você não tem permissão para revisar imagens")
+    
+    with tab3:
         if can_write():
             show_upload_section()
         else:
             st.error("❌ Você não tem permissão para fazer upload de imagens")
     
-    with tab3:
+    with tab4:
         if can_write():
             show_bulk_actions_section()
         else:
@@ -73,13 +105,16 @@ def show_images_list():
         # Buscar imagens com filtros
         db = get_db_manager()
         
+        # Exportação do catálogo completo (independente da paginação)
+        show_catalog_export(filters)
+        
         # Parâmetros da consulta
         query_params = {
             'category': filters['category'],
             'active_only': filters['active_only'],
             'approved_only': filters['approved_only'],
             'search_term': filters['search_term'],
-            'limit': 100,  # Buscar mais para paginação local
+            'limit': image_query_limit(st.session_state.get('view_mode')),
             'offset': 0
         }
         
@@ -93,17 +128,43 @@ def show_images_list():
         if filters['date_filter'] != 'Todos':
             images = apply_date_filter(images, filters)
         
+        # Ordenação, paginação, seleção e edição rodam no fragmento, sem nova consulta
+        show_images_results(images, query_params['limit'])
+        
+    except Exception as e:
+        st.error(f"❌ Erro ao carregar imagens: {str(e)}")
+        st.exception(e)
+
+@fragment
+def show_images_results(images, loaded_limit):
+    """
+    Exibe as imagens já consultadas (fragmento)
+    
+    Seleção, ordenação, página e edição reexecutam apenas este fragmento,
+    reaproveitando a lista recebida da última execução completa.
+    """
+    
+    try:
         # Header da lista
         col1, col2, col3 = st.columns([2, 1, 1])
         
         with col1:
             st.markdown(f"### 📊 **{len(images)}** imagens encontradas")
+            
+            if st.session_state.selected_images:
+                st.caption(f"☑️ {len(st.session_state.selected_images)} selecionadas (ações na aba 🔧 Ações em Lote)")
         
         with col2:
             view_mode = st.selectbox(
                 "👁️ Visualização",
-                options=['list', 'grid', 'table'],
-                format_func=lambda x: {'list': '📋 Lista', 'grid': '🔲 Grid', 'table': '📄 Tabela'}[x],
+                options=['list', 'grid', 'sheet', 'gallery', 'table'],
+                format_func=lambda x: {
+                    'list': '📋 Lista',
+                    'grid': '🔲 Grid',
+                    'sheet': '🧩 Contact Sheet',
+                    'gallery': '🖼️ Galeria',
+                    'table': '📄 Tabela'
+                }[x],
                 key='view_mode'
             )
         
@@ -121,25 +182,116 @@ def show_images_list():
                 key='sort_by'
             )
         
+        # A galeria sem paginação consulta mais imagens: entrar ou sair dela refaz a consulta
+        if image_query_limit(view_mode) != loaded_limit:
+            st.rerun()
+        
         # Ordenar imagens
         images = sort_images(images, sort_by)
         
+        # Modal de edição aberto por um botão "Editar"
+        editing_id = st.session_state.get('editing_image_id')
+        editing = next((image for image in images if image['id'] == editing_id), None)
+        if editing is not None:
+            show_edit_image_modal(editing)
+        
+        # Galeria com thumbnails por URL: um único elemento, sem paginação
+        if view_mode == 'gallery' and loaded_limit == GALLERY_CONFIG['max_rows']:
+            show_images_gallery(images)
+            return
+        
         # Paginação
         offset, limit = show_pagination(len(images))
         paginated_images = images[offset:offset + limit]
         
         # Exibir imagens conforme o modo selecionado
-        if view_mode == 'grid':
+        if view_mode == 'gallery':
+            # Thumbnails como bytes: a galeria fica limitada a uma página
+            show_images_gallery(paginated_images)
+        elif view_mode == 'grid':
             show_images_grid(paginated_images)
+        elif view_mode == 'sheet':
+            show_images_contact_sheet(paginated_images)
         elif view_mode == 'table':
             show_images_table(paginated_images)
         else:
             show_images_list_view(paginated_images)
             
     except Exception as e:
-        st.error(f"❌ Erro ao carregar imagens: {str(e)}")
+        st.error(f"❌ Erro ao exibir imagens: {str(e)}")
         st.exception(e)
 
+def image_query_limit(view_mode):
+    """
+    Imagens buscadas para a listagem
+    
+    A galeria carrega até GALLERY_CONFIG['max_rows'] imagens de uma vez só
+    quando os thumbnails vão por URL; com bytes, cada execução enviaria
+    todos eles pelo websocket.
+    """
+    
+    if view_mode == 'gallery' and renditions_by_url():
+        return GALLERY_CONFIG['max_rows']
+    return 100  # Buscar mais para paginação local
+
+def start_editing(image_id):
+    """Abre o modal de edição de uma imagem"""
+    
+    st.session_state.editing_image_id = image_id
+
+def stop_editing():
+    """Fecha o modal de edição"""
+    
+    st.session_state.pop('editing_image_id', None)
+
+def show_catalog_export(filters):
+    """Exibe controles de exportação em streaming do catálogo filtrado"""
+    
+    with st.expander("📤 Exportar Catálogo Completo"):
+        st.caption("Exporta todas as imagens que atendem aos filtros da barra lateral, sem limite de página")
+        
+        export_format = st.radio(
+            "Formato",
+            options=EXPORT_CONFIG['formats'],
+            format_func=lambda x: {'csv': '📄 CSV', 'parquet': '🗃️ Parquet'}.get(x, x),
+            horizontal=True,
+            key="export_format"
+        )
+        
+        if st.button("📦 Gerar Exportação", key="export_generate"):
+            start_date, end_date = get_date_range(filters)
+            
+            try:
+                with st.spinner("Exportando catálogo..."):
+                    st.session_state.last_export = export_catalog_to_file(
+                        get_db_manager(),
+                        fmt=export_format,
+                        category=filters['category'],
+                        active_only=filters['active_only'],
+                        approved_only=filters['approved_only'],
+                        search_term=filters['search_term'],
+                        start_date=start_date,
+                        end_date=end_date
+                    )
+            except Exception as e:
+                st.error(f"❌ Erro ao exportar catálogo: {str(e)}")
+        
+        last_export = st.session_state.get('last_export')
+        if last_export and os.path.exists(last_export['path']):
+            st.success(
+                f"✅ {last_export['rows']} imagens exportadas "
+                f"({format_file_size(last_export['file_size'])})"
+            )
+            
+            with open(last_export['path'], 'rb') as export_file:
+                st.download_button(
+                    label="⬇️ Baixar Exportação",
+                    data=export_file,
+                    file_name=last_export['filename'],
+                    mime=last_export['mime_type'],
+                    key="export_download"
+                )
+
 def show_images_grid(images):
     """Exibe imagens em formato grid"""
     
@@ -155,6 +307,95 @@ def show_images_grid(images):
                 with col:
                     show_image_card(image)
 
+def toggle_image_selection(image_id):
+    """Inverte a seleção de uma imagem, mantendo os checkboxes das outras visões em sincronia"""
+    
+    if image_id in st.session_state.selected_images:
+        st.session_state.selected_images.remove(image_id)
+    else:
+        st.session_state.selected_images.append(image_id)
+    
+    st.session_state.pop(f"select_{image_id}", None)
+    st.session_state.pop(f"list_select_{image_id}", None)
+
+def sync_contact_sheet_selection(key, cells):
+    """Aplica a seleção por número de célula à lista de imagens selecionadas"""
+    
+    chosen = {cells[number - 1] for number in st.session_state[key]}
+    
+    for image_id in cells:
+        if (image_id in chosen) != (image_id in st.session_state.selected_images):
+            toggle_image_selection(image_id)
+
+def show_images_contact_sheet(images):
+    """Exibe a página de thumbnails como uma única imagem (contact sheet)"""
+    
+    if not images:
+        return
+    
+    sheet = build_contact_sheet(images, get_image_handler())
+    sheet_image = highlight_selection(sheet, st.session_state.selected_images)
+    
+    if IMAGE_CLICK_AVAILABLE:
+        st.caption("Clique em uma imagem para selecioná-la ou removê-la da seleção")
+        
+        click = streamlit_image_coordinates(to_data_url(sheet_image), width=sheet['width'], key="contact_sheet_click")
+        
+        # O componente repete o último clique a cada rerun; processar só cliques novos
+        if click and click != st.session_state.get('contact_sheet_last_click'):
+            st.session_state.contact_sheet_last_click = click
+            scale = sheet['width'] / (click.get('width') or sheet['width'])
+            image_id = cell_at(sheet, click['x'] * scale, click['y'] * scale)
+            
+            if image_id is not None:
+                toggle_image_selection(image_id)
+                rerun_fragment()
+    else:
+        st.image(sheet_image)
+        
+        # Seleção por número da célula, semeada a partir da seleção atual
+        key = f"contact_sheet_cells_{'_'.join(str(image_id) for image_id in sheet['cells'])}"
+        st.session_state[key] = [
+            number for number, image_id in enumerate(sheet['cells'], start=1)
+            if image_id in st.session_state.selected_images
+        ]
+        
+        st.multiselect(
+            "Selecionar por número",
+            options=list(range(1, len(sheet['cells']) + 1)),
+            key=key,
+            on_change=sync_contact_sheet_selection,
+            args=(key, sheet['cells'])
+        )
+    
+    with st.expander("🔢 Legenda"):
+        for number, image in enumerate(images, start=1):
+            marker = "☑️" if image['id'] in st.session_state.selected_images else "▫️"
+            st.caption(f"{marker} **{number}.** {truncate_text(image.get('title', 'Sem título'), 60)} (ID {image['id']})")
+
+def add_to_selection(image_ids):
+    """Adiciona imagens à seleção usada pelas ações em lote"""
+    
+    for image_id in image_ids:
+        if image_id not in st.session_state.selected_images:
+            toggle_image_selection(image_id)
+    
+    st.success(f"☑️ {len(image_ids)} imagens adicionadas à seleção")
+
+def show_images_gallery(images):
+    """Exibe as imagens na galeria (tabela única com thumbnails)"""
+    
+    actions = {"☑️ Adicionar à seleção": add_to_selection}
+    
+    if can_write():
+        actions.update({
+            "✅ Aprovar": lambda ids: execute_bulk_action('approve', ids),
+            "🟢 Ativar": lambda ids: execute_bulk_action('activate', ids),
+            "🔴 Desativar": lambda ids: execute_bulk_action('deactivate', ids),
+        })
+    
+    show_image_gallery(images, key="image_gallery", actions=actions, handler=get_image_handler())
+
 def show_image_card(image):
     """Exibe card individual de imagem"""
     
@@ -173,13 +414,11 @@ def show_image_card(image):
         
         # Preview da imagem
         if image.get('thumbnail_url'):
-            # Tentar carregar thumbnail local
-            from config import THUMBNAILS_PATH
-            thumbnail_filename = os.path.basename(image['thumbnail_url'])
-            thumbnail_path = os.path.join(THUMBNAILS_PATH, thumbnail_filename)
+            # URL servida por arquivo ou bytes (store empacotado)
+            thumbnail = get_image_handler().thumbnail_src(image)
             
-            if os.path.exists(thumbnail_path):
-                st.image(thumbnail_path, use_column_width=True)
+            if thumbnail is not None:
+                st.image(thumbnail, use_column_width=True)
             else:
                 st.info("🖼️ Preview indisponível")
         else:
@@ -213,8 +452,10 @@ def show_image_card(image):
         st.caption(f"👁️ {image.get('total_views', 0)} | 🎯 {image.get('total_selections', 0)} | 🏆 {image.get('win_rate', 0):.1f}%")
         
         # Botão de edição
-        if st.button("✏️ Editar", key=f"edit_{image['id']}", use_container_width=True):
-            show_edit_image_modal(image)
+        st.button(
+            "✏️ Editar", key=f"edit_{image['id']}", use_container_width=True,
+            on_click=start_editing, args=(image['id'],)
+        )
 
 def show_images_list_view(images):
     """Exibe imagens em formato de lista"""
@@ -265,8 +506,7 @@ def show_images_list_view(images):
             
             # Ações
             with col5:
-                if st.button("✏️ Editar", key=f"list_edit_{image['id']}"):
-                    show_edit_image_modal(image)
+                st.button("✏️ Editar", key=f"list_edit_{image['id']}", on_click=start_editing, args=(image['id'],))
                 
                 if can_delete():
                     if st.button("🗑️ Excluir", key=f"list_delete_{image['id']}"):
@@ -329,12 +569,10 @@ def show_edit_image_modal(image):
         with col1:
             # Preview da imagem
             if image.get('thumbnail_url'):
-                from config import THUMBNAILS_PATH
-                thumbnail_filename = os.path.basename(image['thumbnail_url'])
-                thumbnail_path = os.path.join(THUMBNAILS_PATH, thumbnail_filename)
+                thumbnail = get_image_handler().thumbnail_src(image)
                 
-                if os.path.exists(thumbnail_path):
-                    st.image(thumbnail_path, caption="Preview atual", width=200)
+                if thumbnail is not None:
+                    st.image(thumbnail, caption="Preview atual", width=200)
         
         with col2:
             # Campos de edição
@@ -371,19 +609,20 @@ def show_edit_image_modal(image):
         
         with col1:
             if st.form_submit_button("💾 Salvar Alterações", use_container_width=True):
-                update_image(image['id'], {
+                update_image(image, {
                     'title': new_title,
                     'description': new_description,
                     'tags': new_tags,
                     'category': new_category,
                     'active': new_active,
                     'approved': new_approved,
-                    'approved_by': get_current_user_data().get('username') if new_approved else None
+                    'approved_by': get_current_user_data().get('user_id') if new_approved else None
                 })
         
         with col2:
             if st.form_submit_button("🚫 Cancelar", use_container_width=True):
-                st.rerun()
+                stop_editing()
+                rerun_fragment()
         
         with col3:
             if can_delete() and st.form_submit_button("🗑️ Excluir", use_container_width=True):
@@ -403,6 +642,9 @@ def show_upload_section():
         image_id = db.insert_tournament_image(uploaded_image_data)
         
         if image_id:
+            # Já gerada com o perfil atual: o reprocessamento pode pulá-la
+            record_rendition(db, image_id, uploaded_image_data['profile_hash'], uploaded_image_data['quality'])
+            
             st.success(f"🎉 Imagem inserida com sucesso! ID: {image_id}")
             
             # Limpar cache e recarregar
@@ -411,10 +653,148 @@ def show_upload_section():
         else:
             st.error("❌ Erro ao inserir imagem no banco de dados")
 
+# Atalhos de teclado da fila de revisão: A aprova, R rejeita, S pula
+REVIEW_SHORTCUTS_JS = """
+<script>
+const doc = window.parent.document;
+if (!doc.reviewShortcutsInstalled) {
+    doc.reviewShortcutsInstalled = true;
+    const labels = {a: "Aprovar (A)", r: "Rejeitar (R)", s: "Pular (S)"};
+    doc.addEventListener("keydown", (event) => {
+        const tag = (event.target.tagName || "").toLowerCase();
+        if (tag === "input" || tag === "textarea" || event.ctrlKey || event.metaKey || event.altKey) {
+            return;
+        }
+        const label = labels[event.key.toLowerCase()];
+        if (!label) {
+            return;
+        }
+        const button = Array.from(doc.querySelectorAll("button"))
+            .find((el) => el.innerText.includes(label));
+        if (button) {
+            button.click();
+        }
+    });
+}
+</script>
+"""
+
+def get_review_queue():
+    """Retorna a fila de revisão do moderador atual (uma por sessão)"""
+    
+    current_user = get_current_user_data()
+    moderator = current_user.get('username', 'admin') if current_user else 'admin'
+    
+    queue = st.session_state.get('review_queue')
+    if queue is None or queue.moderator != moderator:
+        queue = ReviewQueue(get_db_manager(), moderator, current_user.get('user_id') if current_user else None)
+        st.session_state.review_queue = queue
+    
+    return queue
+
+def restart_review_queue():
+    """Encerra a fila atual, liberando reservas, e inicia uma nova"""
+    
+    queue = st.session_state.pop('review_queue', None)
+    if queue is not None:
+        queue.close()
+
+def show_review_queue_section():
+    """Exibe a fila de revisão de imagens pendentes"""
+    
+    st.markdown("### ✅ Fila de Revisão")
+    st.caption("Imagens pendentes reservadas para você. Atalhos: **A** aprova, **R** rejeita, **S** pula")
+    
+    queue = get_review_queue()
+    
+    try:
+        image = queue.current()
+    except Exception as e:
+        st.error(f"❌ Erro ao carregar fila de revisão: {str(e)}")
+        st.info("💡 Execute `python check_database.py` para criar as colunas de reserva da fila")
+        return
+    
+    # Status da sessão de revisão
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Revisadas nesta sessão", queue.reviewed_count)
+    with col2:
+        st.metric("Restantes no lote", queue.remaining_in_batch())
+    with col3:
+        st.metric("Decisões não gravadas", len(queue.pending_decisions))
+    
+    if image is None:
+        try:
+            queue.flush()
+        except Exception as e:
+            st.error(f"❌ Erro ao gravar decisões: {str(e)}")
+        
+        st.success("🎉 Nenhuma imagem pendente de revisão")
+        st.button("🔄 Verificar Novamente", on_click=restart_review_queue, key="review_restart")
+        return
+    
+    col1, col2 = st.columns([1, 2])
+    
+    with col1:
+        if image.get('thumbnail_src'):
+            st.image(image['thumbnail_src'], use_column_width=True)
+        else:
+            st.info("🖼️ Preview indisponível")
+    
+    with col2:
+        st.markdown(f"**{image.get('title') or 'Sem título'}**")
+        
+        category_info = get_category_display_info(image.get('category', ''))
+        st.markdown(f"🏷️ {category_info['icon']} {category_info['display_name']}")
+        
+        if image.get('description'):
+            st.write(image['description'])
+        
+        if image.get('tags'):
+            st.caption("🏷️ " + ", ".join(image['tags']))
+        
+        st.caption(
+            f"📅 {format_date(image.get('upload_date'))} | "
+            f"📏 {image.get('image_width') or '?'}x{image.get('image_height') or '?'}px | "
+            f"💾 {format_file_size(image.get('file_size') or 0)}"
+        )
+        
+        col_a, col_b, col_c = st.columns(3)
+        with col_a:
+            st.button("✅ Aprovar (A)", on_click=queue.approve, key="review_approve", use_container_width=True)
+        with col_b:
+            st.button("❌ Rejeitar (R)", on_click=queue.reject, key="review_reject", use_container_width=True)
+        with col_c:
+            st.button("⏭️ Pular (S)", on_click=queue.skip, key="review_skip", use_container_width=True)
+    
+    st.markdown("---")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("💾 Gravar Decisões Agora", key="review_flush"):
+            try:
+                updated = queue.flush()
+                st.success(f"✅ {updated} decisões gravadas")
+            except Exception as e:
+                st.error(f"❌ Erro ao gravar decisões: {str(e)}")
+    with col2:
+        st.button("⏹️ Encerrar Revisão", on_click=restart_review_queue, key="review_close")
+    
+    components.html(REVIEW_SHORTCUTS_JS, height=0)
+
+@fragment
 def show_bulk_actions_section():
-    """Exibe seção de ações em lote"""
+    """Exibe seção de ações em lote (fragmento)"""
+    
+    col1, col2 = st.columns([3, 1])
     
-    st.markdown("### 🔧 Ações em Lote")
+    with col1:
+        st.markdown("### 🔧 Ações em Lote")
+    
+    with col2:
+        # Seleções feitas na lista só reexecutam o fragmento da lista
+        if st.button("🔄 Atualizar seleção", key="refresh_bulk_selection"):
+            rerun_fragment()
     
     if not st.session_state.selected_images:
         st.info("📝 Selecione imagens na aba 'Listar Imagens' para realizar ações em lote")
@@ -496,16 +876,23 @@ def sort_images(images, sort_by):
     
     return sorted(images, key=key_func, reverse=reverse)
 
-def update_image(image_id, updates):
-    """Atualiza dados de uma imagem"""
+def update_image(image, updates):
+    """
+    Atualiza dados de uma imagem
+    
+    O registro em memória é atualizado junto, então basta reexecutar o
+    fragmento da lista (sem nova consulta ao banco).
+    """
     
     try:
         db = get_db_manager()
-        success = db.update_tournament_image(image_id, updates)
+        success = db.update_tournament_image(image['id'], updates)
         
         if success:
-            st.success("✅ Imagem atualizada com sucesso!")
-            st.rerun()
+            image.update(updates)
+            stop_editing()
+            st.toast("✅ Imagem atualizada com sucesso!")
+            rerun_fragment()
         else:
             st.error("❌ Erro ao atualizar imagem")
             
@@ -548,7 +935,7 @@ def execute_bulk_action(action, image_ids):
     try:
         db = get_db_manager()
         current_user = get_current_user_data()
-        user_id = current_user.get('username', 'admin') if current_user else 'admin'
+        user_id = current_user.get('user_id') if current_user else None
         
         if action == 'approve':
             success = db.bulk_update_approval(image_ids, True, user_id)
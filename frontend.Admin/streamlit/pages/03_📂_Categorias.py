@@ -8,6 +8,7 @@ sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from utils.auth import require_auth
 from utils.database import get_db_manager
+from utils.logging_setup import bind_request_context
 from utils.helpers import create_stats_overview, format_number
 from config import TOURNAMENT_CATEGORIES
 
@@ -28,6 +29,7 @@ st.set_page_config(
 @require_auth(['read'])
 def main():
     """Função principal da página de categorias"""
+    bind_request_context()
     
     st.markdown("# 📂 Gerenciamento de Categorias")
     st.markdown("---")
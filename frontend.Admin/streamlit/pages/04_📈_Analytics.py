@@ -14,11 +14,14 @@ sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from utils.auth import require_auth
 from utils.database import get_db_manager
+from utils.async_database import fetch_frames_concurrently
+from utils.logging_setup import bind_request_context
 from utils.helpers import format_number, get_categories_enum, create_metric_card
 from config import TOURNAMENT_CONFIG
 
 def main():
     """Página de analytics avançados com relatórios detalhados"""
+    bind_request_context()
     
     # Verificar autenticação
     if not require_auth():
@@ -60,48 +63,139 @@ def main():
         date_filter = f"uploaded_at >= NOW() - INTERVAL '{days} days'"
         category_filter = f"AND category = '{selected_category}'" if selected_category != "Todas" else ""
         
-        # Filtro de status baseado nas colunas boolean da tabela
-        if selected_status == "approved":
-            status_filter = "AND approved = true"
-        elif selected_status == "pending":
-            status_filter = "AND approved = false AND active = true"
-        elif selected_status == "rejected":
-            status_filter = "AND active = false"
-        elif selected_status == "inactive":
-            status_filter = "AND active = false"
+        # Filtro de status (coluna gerada 'status' quando disponível)
+        status_sql = db.status_sql()
+        if selected_status in ("rejected", "inactive"):
+            # Rejeitadas ficam inativas
+            status_filter = f"AND {status_sql} = 'inactive'"
+        elif selected_status != "Todos":
+            status_filter = f"AND {status_sql} = '{selected_status}'"
         else:
             status_filter = ""  # Todos
         
         where_clause = f"WHERE {date_filter} {category_filter} {status_filter}"
         
+        # === CONSULTAS DA PÁGINA ===
+        # Independentes entre si: buscadas em paralelo (uma conexão cada)
+        popular_query = f"""
+            SELECT category, COUNT(*) as count
+            FROM tournament_images {where_clause}
+            GROUP BY category
+            ORDER BY count DESC
+            LIMIT 1
+        """
+        
+        timeline_query = f"""
+            SELECT 
+                DATE(uploaded_at) as date,
+                COUNT(*) as total_uploads,
+                COUNT(*) FILTER (WHERE {status_sql} = 'approved') as approved_uploads,
+                COUNT(*) FILTER (WHERE {status_sql} = 'pending') as pending_uploads,
+                COUNT(*) FILTER (WHERE {status_sql} = 'inactive') as rejected_uploads
+            FROM tournament_images {where_clause}
+            GROUP BY DATE(uploaded_at)
+            ORDER BY date
+        """
+        
+        category_performance_query = f"""
+            SELECT 
+                category,
+                COUNT(*) as total,
+                SUM(CASE WHEN approved = true THEN 1 ELSE 0 END) as approved,
+                ROUND(
+                    SUM(CASE WHEN approved = true THEN 1 ELSE 0 END) * 100.0 / COUNT(*), 
+                    1
+                ) as approval_rate
+            FROM tournament_images {where_clause}
+            GROUP BY category
+            HAVING COUNT(*) > 0
+            ORDER BY total DESC
+        """
+        
+        size_query = f"""
+            SELECT 
+                CASE 
+                    WHEN file_size < 500000 THEN 'Pequeno (<500KB)'
+                    WHEN file_size < 1000000 THEN 'Médio (500KB-1MB)'
+                    WHEN file_size < 2000000 THEN 'Grande (1-2MB)'
+                    ELSE 'Muito Grande (>2MB)'
+                END as size_category,
+                COUNT(*) as count,
+                ROUND(AVG(file_size / 1024.0 / 1024.0), 2) as avg_size_mb
+            FROM tournament_images {where_clause}
+            AND file_size IS NOT NULL
+            GROUP BY size_category
+            ORDER BY avg_size_mb
+        """
+        
+        popular_images_query = f"""
+            SELECT 
+                image_name as title,
+                category,
+                {status_sql} as status,
+                uploaded_at as upload_date,
+                file_size
+            FROM tournament_images {where_clause}
+            AND approved = true
+            ORDER BY uploaded_at DESC
+            LIMIT 10
+        """
+        
+        summary_query = f"""
+            SELECT 
+                category,
+                COUNT(*) as total,
+                SUM(CASE WHEN approved = true THEN 1 ELSE 0 END) as approved,
+                COUNT(*) FILTER (WHERE {status_sql} = 'pending') as pending,
+                COUNT(*) FILTER (WHERE {status_sql} = 'inactive') as rejected,
+                ROUND(AVG(file_size / 1024.0 / 1024.0), 2) as avg_size_mb,
+                ROUND(
+                    SUM(CASE WHEN approved = true THEN 1 ELSE 0 END) * 100.0 / COUNT(*), 
+                    1
+                ) as approval_rate
+            FROM tournament_images {where_clause}
+            GROUP BY category
+            ORDER BY total DESC
+        """
+        
+        frames = fetch_frames_concurrently({
+            'top_category': (popular_query, None),
+            'timeline': (timeline_query, None),
+            'category_performance': (category_performance_query, None),
+            'size': (size_query, None),
+            'popular_images': (popular_images_query, None),
+            'summary': (summary_query, None)
+        })
+        
         st.markdown("---")
         
         # === MÉTRICAS DO PERÍODO ===
         col1, col2, col3, col4 = st.columns(4)
         
         # Total de imagens no período
-        total_query = f"SELECT COUNT(*) as total FROM tournament_images {where_clause}"
-        total_data = db.fetch_one(total_query)
-        total_period = total_data['total'] if total_data else 0
+        # Contagens exatas ou estimadas (catálogos grandes, ver COUNT_CONFIG)
+        total_count = db.count_rows(where_clause)
+        total_period = total_count['value']
         
         with col1:
             create_metric_card(
                 "📊 Total no Período",
                 format_number(total_period),
-                help_text=f"Imagens {selected_period.lower()}"
+                help_text=f"Imagens {selected_period.lower()}",
+                approximate=total_count['approximate']
             )
         
         # Taxa de aprovação no período
-        approved_query = f"SELECT COUNT(*) as approved FROM tournament_images {where_clause} AND approved = true"
-        approved_data = db.fetch_one(approved_query)
-        approved_period = approved_data['approved'] if approved_data else 0
+        approved_count = db.count_rows(f"{where_clause} AND approved = true")
+        approved_period = approved_count['value']
         approval_rate = (approved_period / total_period * 100) if total_period > 0 else 0
         
         with col2:
             create_metric_card(
                 "✅ Taxa de Aprovação",
                 f"{approval_rate:.1f}%",
-                help_text="Percentual aprovado no período"
+                help_text="Percentual aprovado no período",
+                approximate=total_count['approximate'] or approved_count['approximate']
             )
         
         # Média diária
@@ -115,15 +209,8 @@ def main():
             )
         
         # Categoria mais popular
-        popular_query = f"""
-            SELECT category, COUNT(*) as count
-            FROM tournament_images {where_clause}
-            GROUP BY category
-            ORDER BY count DESC
-            LIMIT 1
-        """
-        popular_data = db.fetch_one(popular_query)
-        top_category = popular_data['category'] if popular_data else "N/A"
+        top_frame = frames['top_category']
+        top_category = top_frame['category'].iloc[0] if not top_frame.empty else "N/A"
         
         with col4:
             create_metric_card(
@@ -139,23 +226,9 @@ def main():
         # Gráfico de tendência temporal
         st.subheader("📊 Tendência Temporal")
         
-        timeline_query = f"""
-            SELECT 
-                DATE(uploaded_at) as date,
-                COUNT(*) as total_uploads,
-                SUM(CASE WHEN approved = true THEN 1 ELSE 0 END) as approved_uploads,
-                SUM(CASE WHEN approved = false AND active = true THEN 1 ELSE 0 END) as pending_uploads,
-                SUM(CASE WHEN active = false THEN 1 ELSE 0 END) as rejected_uploads
-            FROM tournament_images {where_clause}
-            GROUP BY DATE(uploaded_at)
-            ORDER BY date
-        """
-        timeline_data = db.fetch_all(timeline_query)
+        df_timeline = frames['timeline']
         
-        if timeline_data:
-            df_timeline = pd.DataFrame(timeline_data)
-            df_timeline['date'] = pd.to_datetime(df_timeline['date'])
-            
+        if not df_timeline.empty:
             # Criar gráfico com múltiplas linhas
             fig_timeline = go.Figure()
             
@@ -209,25 +282,9 @@ def main():
         with col1:
             st.subheader("📊 Performance por Categoria")
             
-            category_performance_query = f"""
-                SELECT 
-                    category,
-                    COUNT(*) as total,
-                    SUM(CASE WHEN approved = true THEN 1 ELSE 0 END) as approved,
-                    ROUND(
-                        SUM(CASE WHEN approved = true THEN 1 ELSE 0 END) * 100.0 / COUNT(*), 
-                        1
-                    ) as approval_rate
-                FROM tournament_images {where_clause}
-                GROUP BY category
-                HAVING COUNT(*) > 0
-                ORDER BY total DESC
-            """
-            category_data = db.fetch_all(category_performance_query)
+            df_category = frames['category_performance']
             
-            if category_data:
-                df_category = pd.DataFrame(category_data)
-                
+            if not df_category.empty:
                 # Gráfico de barras horizontal
                 fig_category = px.bar(
                     df_category,
@@ -248,7 +305,7 @@ def main():
         with col2:
             st.subheader("🎯 Taxa de Aprovação por Categoria")
             
-            if category_data:
+            if not df_category.empty:
                 # Gráfico de radar para taxas de aprovação
                 categories_radar = df_category['category'].tolist()
                 approval_rates = df_category['approval_rate'].tolist()
@@ -286,26 +343,9 @@ def main():
         
         with col1:
             # Distribuição de tamanhos de arquivo
-            size_query = f"""
-                SELECT 
-                    CASE 
-                        WHEN file_size < 500000 THEN 'Pequeno (<500KB)'
-                        WHEN file_size < 1000000 THEN 'Médio (500KB-1MB)'
-                        WHEN file_size < 2000000 THEN 'Grande (1-2MB)'
-                        ELSE 'Muito Grande (>2MB)'
-                    END as size_category,
-                    COUNT(*) as count,
-                    ROUND(AVG(file_size / 1024.0 / 1024.0), 2) as avg_size_mb
-                FROM tournament_images {where_clause}
-                AND file_size IS NOT NULL
-                GROUP BY size_category
-                ORDER BY avg_size_mb
-            """
-            size_data = db.fetch_all(size_query)
+            df_size = frames['size']
             
-            if size_data:
-                df_size = pd.DataFrame(size_data)
-                
+            if not df_size.empty:
                 fig_size = px.pie(
                     df_size,
                     values='count',
@@ -319,29 +359,11 @@ def main():
         
         with col2:
             # Top imagens por visualizações (simulado - seria baseado em dados reais de uso)
-            popular_images_query = f"""
-                SELECT 
-                    image_name as title,
-                    category,
-                    CASE 
-                        WHEN approved = true THEN 'approved'
-                        WHEN approved = false AND active = true THEN 'pending'
-                        WHEN active = false THEN 'inactive'
-                        ELSE 'unknown'
-                    END as status,
-                    uploaded_at as upload_date,
-                    file_size
-                FROM tournament_images {where_clause}
-                AND approved = true
-                ORDER BY uploaded_at DESC
-                LIMIT 10
-            """
-            popular_data = db.fetch_all(popular_images_query)
+            df_popular = frames['popular_images']
             
-            if popular_data:
+            if not df_popular.empty:
                 st.write("**🏆 Imagens Aprovadas Recentes**")
-                df_popular = pd.DataFrame(popular_data)
-                df_popular['upload_date'] = pd.to_datetime(df_popular['upload_date']).dt.strftime('%d/%m/%Y')
+                df_popular['upload_date'] = df_popular['upload_date'].dt.strftime('%d/%m/%Y')
                 df_popular['file_size_mb'] = (df_popular['file_size'] / 1024 / 1024).round(2)
                 
                 st.dataframe(
@@ -364,27 +386,9 @@ def main():
         
         with st.container():
             # Tabela com todas as estatísticas
-            summary_query = f"""
-                SELECT 
-                    category,
-                    COUNT(*) as total,
-                    SUM(CASE WHEN approved = true THEN 1 ELSE 0 END) as approved,
-                    SUM(CASE WHEN status = 'pending' THEN 1 ELSE 0 END) as pending,
-                    SUM(CASE WHEN status = 'rejected' THEN 1 ELSE 0 END) as rejected,
-                    ROUND(AVG(file_size / 1024.0 / 1024.0), 2) as avg_size_mb,
-                    ROUND(
-                        SUM(CASE WHEN approved = true THEN 1 ELSE 0 END) * 100.0 / COUNT(*), 
-                        1
-                    ) as approval_rate
-                FROM tournament_images {where_clause}
-                GROUP BY category
-                ORDER BY total DESC
-            """
-            summary_data = db.fetch_all(summary_query)
+            df_summary = frames['summary']
             
-            if summary_data:
-                df_summary = pd.DataFrame(summary_data)
-                
+            if not df_summary.empty:
                 st.dataframe(
                     df_summary,
                     column_config={
@@ -416,13 +420,14 @@ def main():
         st.markdown("---")
         st.subheader("💡 Insights Automáticos")
         
-        if timeline_data and category_data:
+        if not df_timeline.empty and not df_category.empty:
             insights = []
             
             # Insight sobre crescimento
-            if len(timeline_data) >= 7:
-                recent_avg = sum([row['total_uploads'] for row in timeline_data[-7:]]) / 7
-                older_avg = sum([row['total_uploads'] for row in timeline_data[:-7]]) / max(1, len(timeline_data) - 7)
+            if len(df_timeline) >= 7:
+                uploads = df_timeline['total_uploads']
+                recent_avg = uploads.iloc[-7:].sum() / 7
+                older_avg = uploads.iloc[:-7].sum() / max(1, len(df_timeline) - 7)
                 
                 if recent_avg > older_avg * 1.2:
                     insights.append("📈 **Crescimento acelerado**: Os uploads aumentaram significativamente nos últimos dias")
@@ -436,10 +441,9 @@ def main():
                 insights.append("⚠️ **Atenção**: Taxa de aprovação baixa, revisar critérios")
             
             # Insight sobre categorias
-            df_cat = pd.DataFrame(category_data)
-            if len(df_cat) > 0:
-                top_category = df_cat.iloc[0]['category']
-                top_count = df_cat.iloc[0]['total']
+            if len(df_category) > 0:
+                top_category = df_category.iloc[0]['category']
+                top_count = df_category.iloc[0]['total']
                 insights.append(f"🏆 **Categoria dominante**: {top_category} representa {top_count} uploads")
             
             # Mostrar insights
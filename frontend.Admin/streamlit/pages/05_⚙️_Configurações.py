@@ -8,13 +8,24 @@ from datetime import datetime
 # Configurar path para imports
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
-from utils.auth import require_auth, get_current_user_data
+from utils.auth import require_auth, get_current_user_data, is_super_admin
 from utils.database import get_db_manager
-from utils.helpers import get_categories_enum
+from utils.logging_setup import bind_request_context
+from utils.helpers import get_categories_enum, format_file_size
+from utils.jobs import submit_job, show_jobs_panel
+from utils.reconcile import reconcile_uploads
+from utils.backup import create_backup, restore_backup, list_backups
+from utils.cache import get_cache_registry
+from utils.log_viewer import show_log_viewer
+from utils.indexes import get_index_status, get_missing_indexes, create_missing_indexes, reindex
+from utils.reprocess import reprocess_catalog
+from utils.thumbnail_store import get_thumbnail_store, compact_thumbnail_store
+from utils.image_handler import rendition_profile, profile_hash
 from config import DATABASE_CONFIG, STREAMLIT_CONFIG, UPLOAD_CONFIG, SECURITY_CONFIG
 
 def main():
     """Página de configurações do sistema administrativo"""
+    bind_request_context()
     
     # Verificar autenticação
     if not require_auth():
@@ -284,6 +295,15 @@ def main():
                 
                 if st.button("💾 Salvar Configurações de Upload"):
                     st.success("Configurações de upload salvas!")
+            
+            # Reprocessamento do catálogo
+            st.markdown("---")
+            show_reprocess_panel(current_user)
+            
+            store = get_thumbnail_store()
+            if store is not None:
+                st.markdown("---")
+                show_thumbnail_store_panel(store, current_user)
         
         # === TAB SISTEMA ===
         with tab4:
@@ -336,24 +356,85 @@ def main():
                 
                 # Limpeza de dados
                 if st.button("🧹 Limpar Cache"):
-                    st.success("Cache limpo com sucesso!")
+                    removed = get_cache_registry().flush()
+                    st.cache_data.clear()
+                    st.success(f"Cache limpo com sucesso! ({removed} entradas removidas)")
+                
+                remove_orphans = st.checkbox(
+                    "Remover arquivos sem registro no banco",
+                    value=False,
+                    key="orphans_remove_files"
+                )
+                fix_dangling = st.checkbox(
+                    "Desativar registros sem arquivo em disco",
+                    value=False,
+                    key="orphans_fix_dangling"
+                )
                 
                 if st.button("🗑️ Remover Arquivos Órfãos"):
-                    st.info("Verificando arquivos órfãos...")
-                    st.success("5 arquivos órfãos removidos!")
-                
-                if st.button("📊 Recriar Índices"):
-                    st.info("Recriando índices do banco...")
-                    st.success("Índices recriados com sucesso!")
+                    actions = []
+                    if remove_orphans:
+                        actions.append("remoção de órfãos")
+                    if fix_dangling:
+                        actions.append("desativação de registros sem arquivo")
+                    submit_job(
+                        'reconcile_uploads',
+                        "Reconciliar arquivos de upload" + (f" ({', '.join(actions)})" if actions else " (relatório)"),
+                        reconcile_uploads,
+                        remove_files=remove_orphans,
+                        fix_dangling=fix_dangling,
+                        created_by=current_user['username'] if current_user else None
+                    )
                 
                 # Backup
                 st.markdown("---")
                 st.write("**💾 Backup**")
                 
+                include_files = st.checkbox(
+                    "Incluir arquivos de upload (incremental)",
+                    value=True,
+                    key="backup_include_files"
+                )
+                
                 if st.button("📥 Criar Backup"):
-                    st.info("Criando backup...")
-                    backup_file = f"backup_matchit_{datetime.now().strftime('%Y%m%d_%H%M%S')}.sql"
-                    st.success(f"Backup criado: {backup_file}")
+                    submit_job(
+                        'backup',
+                        "Backup do banco" + (" e uploads" if include_files else ""),
+                        create_backup,
+                        include_files=include_files,
+                        created_by=current_user['username'] if current_user else None
+                    )
+                
+                backups = list_backups()
+                if backups:
+                    with st.expander(f"📚 Backups Disponíveis ({len(backups)})"):
+                        for backup in backups[:10]:
+                            metrics = backup.get('metrics', {})
+                            st.caption(
+                                f"**{backup['name']}** · {format_file_size(metrics.get('archive_bytes', 0))} · "
+                                f"{metrics.get('seconds', 0)}s · {metrics.get('throughput_mb_s') or 0} MB/s"
+                            )
+                        
+                        if is_super_admin():
+                            st.markdown("---")
+                            restore_name = st.selectbox(
+                                "Backup para restaurar",
+                                options=[backup['name'] for backup in backups],
+                                key="restore_backup_name"
+                            )
+                            confirm_restore = st.checkbox(
+                                "Entendo que a restauração substitui os dados atuais",
+                                key="restore_confirm"
+                            )
+                            
+                            if st.button("♻️ Restaurar Backup", disabled=not confirm_restore):
+                                submit_job(
+                                    'restore',
+                                    f"Restaurar backup {restore_name}",
+                                    restore_backup,
+                                    backup_name=restore_name,
+                                    created_by=current_user['username'] if current_user else None
+                                )
                 
                 # Logs
                 st.markdown("---")
@@ -365,17 +446,19 @@ def main():
                     index=1
                 )
                 
-                if st.button("📄 Ver Logs Recentes"):
-                    st.text_area(
-                        "Últimas entradas do log",
-                        value="""[2025-07-30 10:30:15] INFO: Sistema iniciado
-[2025-07-30 10:31:22] INFO: Usuário admin logou
-[2025-07-30 10:32:10] INFO: Upload de imagem realizado
-[2025-07-30 10:33:05] WARNING: Tentativa de upload de formato inválido
-[2025-07-30 10:34:18] INFO: Imagem aprovada pelo admin""",
-                        height=150,
-                        disabled=True
-                    )
+                show_log_viewer(log_level)
+            
+            # Índices
+            st.markdown("---")
+            show_index_panel(db, current_user)
+            
+            # Caches
+            st.markdown("---")
+            show_cache_panel()
+            
+            # Tarefas em segundo plano
+            st.markdown("---")
+            show_jobs_panel()
         
         # === TAB INFORMAÇÕES ===
         with tab5:
@@ -446,6 +529,163 @@ def main():
     finally:
         db.close()
 
+def show_cache_panel():
+    """Estatísticas dos caches registrados e limpeza por namespace"""
+    st.write("**📦 Caches**")
+    
+    registry = get_cache_registry()
+    cache_stats = registry.stats()
+    
+    if not cache_stats:
+        st.info("Nenhum cache registrado neste processo")
+        return
+    
+    st.dataframe(
+        [
+            {
+                'Cache': item['namespace'],
+                'Descrição': item['description'],
+                'Entradas': item['entries'],
+                'Memória': format_file_size(item['bytes']),
+                'Acertos': item['hits'],
+                'Falhas': item['misses'],
+                'Taxa de acerto': f"{item['hit_ratio']:.0%}",
+                'Remoções (LRU)': item['evictions'],
+                'Expiradas': item['expirations'],
+            }
+            for item in cache_stats
+        ],
+        use_container_width=True,
+        hide_index=True
+    )
+    
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        selected = st.multiselect(
+            "Caches a limpar",
+            options=registry.namespaces(),
+            key="cache_flush_namespaces"
+        )
+    with col2:
+        st.write("")
+        if st.button("Limpar selecionados", disabled=not selected):
+            removed = registry.flush(selected)
+            # toast sobrevive ao rerun que atualiza a tabela
+            st.toast(f"{removed} entradas removidas (propagado para as demais instâncias)")
+            st.rerun()
+
+def show_reprocess_panel(current_user):
+    """Regera imagens existentes com o perfil atual de UPLOAD_CONFIG"""
+    st.write("**🔁 Reprocessar Catálogo**")
+    
+    profile = rendition_profile()
+    st.caption(
+        f"Perfil atual `{profile_hash(profile)}`: codificação {profile['encoding']['mode']}, "
+        f"qualidade {profile['quality']}, "
+        f"lado máximo {profile['max_dimension']}px, miniatura "
+        f"{profile['thumbnail_size'][0]}x{profile['thumbnail_size'][1]}px"
+    )
+    
+    selected = st.multiselect(
+        "Categorias",
+        options=get_categories_enum(),
+        help="Vazio: todas as categorias",
+        key="reprocess_categories"
+    )
+    force = st.checkbox(
+        "Reprocessar também imagens já geradas com o perfil atual",
+        value=False,
+        key="reprocess_force"
+    )
+    
+    if st.button("🔁 Reprocessar Imagens"):
+        submit_job(
+            'reprocess_catalog',
+            f"Reprocessar imagens ({', '.join(selected) if selected else 'todas as categorias'})",
+            reprocess_catalog,
+            categories=selected or None,
+            force=force,
+            created_by=current_user['username'] if current_user else None
+        )
+
+def show_thumbnail_store_panel(store, current_user):
+    """Uso do store de thumbnails empacotados"""
+    st.write("**🗃️ Store de Thumbnails**")
+    
+    store_stats = store.stats()
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Thumbnails", format_number(store_stats['entries']))
+    with col2:
+        st.metric("Em uso", format_file_size(store_stats['live_bytes']))
+    with col3:
+        st.metric("Espaço morto", format_file_size(store_stats['dead_bytes']))
+    
+    if st.button("🗜️ Compactar Store", disabled=not store_stats['dead_bytes']):
+        submit_job(
+            'compact_thumbnails',
+            "Compactar store de thumbnails",
+            compact_thumbnail_store,
+            created_by=current_user['username'] if current_user else None
+        )
+
+def show_index_panel(db, current_user):
+    """Índices exigidos, uso, bloat estimado e manutenção"""
+    st.write("**📊 Índices**")
+    created_by = current_user['username'] if current_user else None
+    
+    try:
+        index_status = get_index_status(db)
+        missing = get_missing_indexes(db)
+    except Exception as e:
+        st.info(f"Estatísticas de índices não disponíveis: {e}")
+        return
+    
+    if index_status:
+        st.dataframe(
+            [
+                {
+                    'Índice': row['index_name'],
+                    'Exigido': '✅' if row['required'] else '',
+                    'Válido': '✅' if row['is_valid'] else '❌',
+                    'Leituras': row['scans'],
+                    'Tamanho': format_file_size(row['size_bytes']),
+                    'Bloat estimado': f"{row['bloat_ratio']:.0%}",
+                }
+                for row in index_status
+            ],
+            use_container_width=True,
+            hide_index=True
+        )
+    
+    if missing:
+        st.warning(f"{len(missing)} índices exigidos ausentes: {', '.join(index['name'] for index in missing)}")
+        if st.button("➕ Criar índices faltantes"):
+            submit_job(
+                'create_indexes',
+                "Criar índices exigidos (CONCURRENTLY)",
+                create_missing_indexes,
+                created_by=created_by
+            )
+    
+    bloated = [row['index_name'] for row in index_status if row['bloated']]
+    selected = st.multiselect(
+        "Índices a recriar",
+        options=[row['index_name'] for row in index_status],
+        default=bloated,
+        help="Pré-selecionados: índices com bloat estimado acima do limite",
+        key="reindex_names"
+    )
+    
+    if st.button("📊 Recriar Índices", disabled=not selected):
+        submit_job(
+            'reindex',
+            f"REINDEX CONCURRENTLY ({len(selected)} índices)",
+            reindex,
+            index_names=selected,
+            created_by=created_by
+        )
+
 def format_number(num):
     """Formatar números grandes"""
     if num >= 1000000:
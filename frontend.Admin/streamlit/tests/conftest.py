@@ -0,0 +1,5 @@
+# tests/conftest.py - Torna os módulos do dashboard importáveis nos testes
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
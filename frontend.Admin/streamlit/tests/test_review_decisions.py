@@ -0,0 +1,48 @@
+# tests/test_review_decisions.py - UPDATE em lote das decisões da fila de revisão
+import re
+
+import pytest
+
+pytest.importorskip('psycopg2')
+pytest.importorskip('streamlit')
+
+from utils.database import REVIEW_DECISIONS_SQL, REVIEW_DECISIONS_TEMPLATE, review_decision_rows
+
+
+def _values_columns():
+    """Colunas de d(...) no FROM (VALUES %s)"""
+    match = re.search(r"AS d\(([^)]*)\)", REVIEW_DECISIONS_SQL)
+    return [column.strip() for column in match.group(1).split(',')]
+
+
+def _template_types():
+    return re.findall(r"%s::(\w+)", REVIEW_DECISIONS_TEMPLATE)
+
+
+def test_template_types_match_columns():
+    types = dict(zip(_values_columns(), _template_types()))
+
+    # approved_by é INTEGER (users.id); o nome só vai para review_claimed_by
+    assert types == {
+        'id': 'integer',
+        'approved': 'boolean',
+        'approved_by': 'integer',
+        'moderator': 'text',
+    }
+
+
+def test_approved_by_is_set_from_integer_column_only():
+    assert 'd.moderator ELSE t.approved_by' not in REVIEW_DECISIONS_SQL
+    assert 'THEN d.approved_by ELSE t.approved_by' in REVIEW_DECISIONS_SQL
+    assert 't.review_claimed_by = d.moderator' in REVIEW_DECISIONS_SQL
+
+
+def test_rows_follow_template_order():
+    rows = review_decision_rows({10: True, 11: False}, 'moderator', 7)
+
+    assert rows == [(10, True, 7, 'moderator'), (11, False, 7, 'moderator')]
+    assert all(len(row) == len(_template_types()) for row in rows)
+
+
+def test_rows_without_moderator_id():
+    assert review_decision_rows({10: True}, 'moderator') == [(10, True, None, 'moderator')]
@@ -0,0 +1,188 @@
+# tests/test_thumbnail_store.py - Testes do store de thumbnails empacotado
+import os
+import threading
+import time
+
+import pytest
+
+from utils import thumbnail_store
+from utils.thumbnail_store import ThumbnailStore, _RECORD, _OP_PUT
+
+
+@pytest.fixture(autouse=True)
+def no_refresh_throttle(monkeypatch):
+    """Sem intervalo entre verificações: cada leitura vê escritas de outras instâncias"""
+    monkeypatch.setattr(thumbnail_store, 'REFRESH_INTERVAL', 0)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ThumbnailStore(str(tmp_path))
+
+
+def test_put_and_get(store):
+    store.put('thumb_a.jpg', b'aaaa')
+    store.put('thumb_b.jpg', b'bbbbbb')
+
+    assert store.get('thumb_a.jpg').tobytes() == b'aaaa'
+    assert store.get('thumb_b.jpg').tobytes() == b'bbbbbb'
+    assert store.get('thumb_c.jpg') is None
+
+
+def test_overwrite_changes_version_and_counts_dead_bytes(store):
+    store.put('thumb_a.jpg', b'old')
+    first = store.version('thumb_a.jpg')
+
+    store.put('thumb_a.jpg', b'newer')
+
+    assert store.version('thumb_a.jpg') != first
+    assert store.get('thumb_a.jpg').tobytes() == b'newer'
+    stats = store.stats()
+    assert stats['entries'] == 1
+    assert stats['live_bytes'] == 5
+    assert stats['dead_bytes'] == 3
+
+
+def test_delete_writes_tombstone(store, tmp_path):
+    store.put('thumb_a.jpg', b'aaaa')
+
+    assert store.delete('thumb_a.jpg') is True
+    assert store.delete('thumb_a.jpg') is False
+    assert store.get('thumb_a.jpg') is None
+
+    # O tombstone sobrevive à releitura do índice
+    reopened = ThumbnailStore(str(tmp_path))
+    assert reopened.get('thumb_a.jpg') is None
+    assert reopened.stats()['dead_bytes'] == 4
+
+
+def test_other_instance_sees_writes(tmp_path):
+    writer = ThumbnailStore(str(tmp_path))
+    reader = ThumbnailStore(str(tmp_path))
+
+    writer.put('thumb_a.jpg', b'aaaa')
+    assert reader.get('thumb_a.jpg').tobytes() == b'aaaa'
+
+    writer.put('thumb_a.jpg', b'bbbb')
+    assert reader.get('thumb_a.jpg').tobytes() == b'bbbb'
+
+
+def test_partial_record_is_applied_once_complete(store, tmp_path):
+    store.put('thumb_a.jpg', b'aaaa')
+
+    # Simula outro processo no meio da escrita de um registro
+    name = 'thumb_b.jpg'.encode('utf-8')
+    with open(store._pack_path(store.current_pack), 'ab') as f:
+        offset = f.tell()
+        f.write(b'bbbb')
+    record = _RECORD.pack(_OP_PUT, store.current_pack, offset, 4, len(name)) + name
+    with open(store.index_path, 'ab') as f:
+        f.write(record[:_RECORD.size + 3])
+
+    assert store.get('thumb_b.jpg') is None
+    assert store.get('thumb_a.jpg').tobytes() == b'aaaa'
+
+    with open(store.index_path, 'ab') as f:
+        f.write(record[_RECORD.size + 3:])
+
+    assert store.get('thumb_b.jpg').tobytes() == b'bbbb'
+
+
+def test_pack_rollover(store):
+    store.pack_max_bytes = 10
+    store.put('thumb_a.jpg', b'a' * 8)
+    store.put('thumb_b.jpg', b'b' * 8)
+
+    assert store.stats()['packs'] == 2
+    assert store.get('thumb_a.jpg').tobytes() == b'a' * 8
+    assert store.get('thumb_b.jpg').tobytes() == b'b' * 8
+
+
+def test_compact_swaps_generation_and_keeps_live_entries(store, tmp_path):
+    store.put('thumb_a.jpg', b'old-a')
+    store.put('thumb_a.jpg', b'new-a')
+    store.put('thumb_b.jpg', b'bbbb')
+    store.delete('thumb_b.jpg')
+    old_generation_dir = store._generation_dir(store.generation)
+
+    result = store.compact()
+
+    assert result == {'entries': 1, 'reclaimed_bytes': 9}
+    assert store.generation == 1
+    assert not os.path.exists(old_generation_dir)
+    assert store.get('thumb_a.jpg').tobytes() == b'new-a'
+    assert store.get('thumb_b.jpg') is None
+    assert store.stats()['dead_bytes'] == 0
+
+    reopened = ThumbnailStore(str(tmp_path))
+    assert reopened.generation == 1
+    assert reopened.get('thumb_a.jpg').tobytes() == b'new-a'
+
+
+def test_reader_follows_compaction_by_other_instance(tmp_path):
+    writer = ThumbnailStore(str(tmp_path))
+    reader = ThumbnailStore(str(tmp_path))
+    writer.put('thumb_a.jpg', b'aaaa')
+    assert reader.get('thumb_a.jpg').tobytes() == b'aaaa'
+
+    writer.compact()
+    writer.put('thumb_b.jpg', b'bbbb')
+
+    assert reader.get('thumb_b.jpg').tobytes() == b'bbbb'
+    assert reader.generation == writer.generation
+
+
+def test_get_retries_when_generation_removed_before_open(tmp_path, monkeypatch):
+    writer = ThumbnailStore(str(tmp_path))
+    writer.put('thumb_a.jpg', b'aaaa')
+    reader = ThumbnailStore(str(tmp_path))
+    writer.compact()
+
+    # O reader ainda aponta para a geração removida e não verifica CURRENT
+    monkeypatch.setattr(thumbnail_store, 'REFRESH_INTERVAL', 3600)
+    reader._checked_at = time.monotonic()
+
+    assert reader.get('thumb_a.jpg').tobytes() == b'aaaa'
+    assert reader.generation == writer.generation
+
+
+def test_reads_do_not_wait_for_compaction(store, monkeypatch):
+    store.put('thumb_a.jpg', b'old-a')
+    store.put('thumb_a.jpg', b'new-a')
+    store.put('thumb_b.jpg', b'bbbb')
+
+    # Segura a compactação no meio da cópia (fsync do novo pack)
+    copying = threading.Event()
+    release = threading.Event()
+    real_fsync = os.fsync
+
+    def slow_fsync(fd):
+        copying.set()
+        release.wait(5)
+        real_fsync(fd)
+
+    monkeypatch.setattr(thumbnail_store.os, 'fsync', slow_fsync)
+    compaction = threading.Thread(target=store.compact)
+    compaction.start()
+    try:
+        assert copying.wait(5)
+
+        results = {}
+        reader = threading.Thread(target=lambda: results.update(
+            a=store.get('thumb_a.jpg').tobytes(),
+            b=store.get('thumb_b.jpg').tobytes(),
+            stats=store.stats(),
+        ))
+        reader.start()
+        reader.join(1)
+
+        assert not reader.is_alive(), "leitura bloqueada pela compactação"
+        assert results['a'] == b'new-a'
+        assert results['b'] == b'bbbb'
+        assert results['stats']['generation'] == 0
+    finally:
+        release.set()
+        compaction.join(5)
+
+    assert store.generation == 1
+    assert store.get('thumb_a.jpg').tobytes() == b'new-a'
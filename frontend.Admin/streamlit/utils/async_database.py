@@ -0,0 +1,237 @@
+# utils/async_database.py - Acesso assíncrono ao PostgreSQL (psycopg3)
+import asyncio
+import threading
+import time
+import logging
+import sys
+import os
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Dict, List, Optional, Tuple
+
+import pandas as pd
+import streamlit as st
+
+# Adicionar o diretório parent ao path para importar config
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import DATABASE_URL, ASYNC_DB_CONFIG
+from utils.database import get_db_manager, _column_to_array, _query_summary
+
+try:
+    from psycopg.rows import dict_row
+    from psycopg_pool import AsyncConnectionPool
+    ASYNC_AVAILABLE = True
+except ImportError:  # psycopg3 é opcional; as páginas caem no DatabaseManager
+    ASYNC_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDatabaseManager:
+    """
+    Variante assíncrona da camada genérica do DatabaseManager
+
+    Espelha apenas os métodos genéricos (execute_query, fetch_one,
+    fetch_all, execute_many, execute_ddl, fetch_frame), com os mesmos nomes
+    e retornos, como corrotinas. Os métodos de domínio (get_tournament_images,
+    get_dashboard_stats, get_category_stats, inserts e updates) dependem de
+    caches, contadores e introspecção do schema e continuam apenas no
+    DatabaseManager; páginas com consultas independentes montam o SQL e
+    usam gather_frames().
+
+    O pool e o event loop vivem em uma thread própria, já que a página
+    Streamlit roda em uma thread síncrona; run() e gather_frames() fazem a
+    ponte.
+    """
+
+    def __init__(self):
+        if not ASYNC_AVAILABLE:
+            raise RuntimeError("psycopg[binary] e psycopg-pool são necessários para o acesso assíncrono")
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="async-db-loop", daemon=True)
+        self._thread.start()
+        self.pool = self.run(self._open_pool())
+
+    async def _open_pool(self) -> 'AsyncConnectionPool':
+        """Cria o pool dentro do event loop da thread"""
+        pool = AsyncConnectionPool(
+            DATABASE_URL,
+            min_size=ASYNC_DB_CONFIG['min_size'],
+            max_size=ASYNC_DB_CONFIG['max_size'],
+            timeout=ASYNC_DB_CONFIG['timeout'],
+            open=False
+        )
+        await pool.open()
+        logger.info("Pool assíncrono aberto (max_size=%s)", ASYNC_DB_CONFIG['max_size'])
+        return pool
+
+    def run(self, coro: Awaitable) -> Any:
+        """Executa uma corrotina no loop do gerenciador e aguarda o resultado"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    @asynccontextmanager
+    async def get_connection(self):
+        """Context manager para conexões do pool"""
+        async with self.pool.connection() as conn:
+            yield conn
+
+    async def execute_query(self, query: str, params: tuple = None, fetch: bool = True,
+                            commit: bool = False) -> Optional[List[Dict]]:
+        """
+        Executa uma query e retorna os resultados
+
+        Args:
+            query: SQL query para executar
+            params: Parâmetros para a query
+            fetch: Se deve fazer fetch dos resultados
+            commit: Se deve confirmar a transação após o fetch
+
+        Returns:
+            Lista de dicionários com os resultados ou None
+        """
+        try:
+            async with self.get_connection() as conn:
+                async with conn.cursor(row_factory=dict_row) as cursor:
+                    await cursor.execute(query, params)
+
+                    if fetch:
+                        results = await cursor.fetchall()
+                        if commit:
+                            await conn.commit()
+                        return results
+
+                    await conn.commit()
+                    return None
+
+        except Exception as e:
+            logger.error(
+                "Erro ao executar query assíncrona: %s", e,
+                extra={'query': _query_summary(query), 'param_count': len(params) if params else 0}
+            )
+            raise
+
+    async def fetch_one(self, query: str, params: tuple = None) -> Optional[Dict]:
+        """Executa query e retorna apenas o primeiro resultado"""
+        results = await self.execute_query(query, params)
+        return results[0] if results else None
+
+    async def fetch_all(self, query: str, params: tuple = None) -> List[Dict]:
+        """Executa query e retorna todos os resultados"""
+        return await self.execute_query(query, params) or []
+
+    async def execute_many(self, query: str, params_list: List[tuple]) -> bool:
+        """Executa uma query com múltiplos conjuntos de parâmetros"""
+        try:
+            async with self.get_connection() as conn:
+                async with conn.cursor() as cursor:
+                    await cursor.executemany(query, params_list)
+                await conn.commit()
+                return True
+        except Exception as e:
+            logger.error("Erro ao executar batch assíncrono: %s", e)
+            return False
+
+    async def execute_ddl(self, query: str, params: Tuple = None, autocommit: bool = False) -> bool:
+        """Executa comandos DDL (CREATE, ALTER, DROP, etc.)"""
+        try:
+            async with self.get_connection() as conn:
+                await conn.set_autocommit(autocommit)
+                await conn.execute(query, params)
+                if not autocommit:
+                    await conn.commit()
+                return True
+        except Exception as e:
+            logger.error("Erro ao executar DDL assíncrono: %s", e, extra={'query': _query_summary(query)})
+            return False
+
+    async def fetch_frame(self, query: str, params: tuple = None) -> pd.DataFrame:
+        """
+        Executa query e retorna um DataFrame tipado pelos OIDs das colunas
+
+        Mesma conversão do DatabaseManager.fetch_frame.
+        """
+        try:
+            async with self.get_connection() as conn:
+                async with conn.cursor() as cursor:
+                    await cursor.execute(query, params)
+                    rows = await cursor.fetchall()
+                    description = cursor.description or []
+        except Exception as e:
+            logger.error("Erro ao executar query colunar assíncrona: %s", e, extra={'query': _query_summary(query)})
+            raise
+
+        names = [column.name for column in description]
+        type_codes = [column.type_code for column in description]
+        columns = list(zip(*rows)) if rows else [()] * len(names)
+
+        return pd.DataFrame({
+            name: _column_to_array(values, type_code)
+            for name, type_code, values in zip(names, type_codes, columns)
+        })
+
+    async def gather(self, **coros: Awaitable) -> Dict[str, Any]:
+        """
+        Aguarda várias corrotinas ao mesmo tempo
+
+        Returns:
+            Dict {nome: resultado}; a primeira exceção é propagada
+        """
+        results = await asyncio.gather(*coros.values())
+        return dict(zip(coros.keys(), results))
+
+    def gather_frames(self, queries: Dict[str, Tuple[str, Optional[tuple]]]) -> Dict[str, pd.DataFrame]:
+        """
+        Executa consultas independentes em paralelo (uma conexão cada)
+
+        A latência passa a ser a da consulta mais lenta, não a soma.
+
+        Args:
+            queries: Dict {nome: (sql, params)}
+
+        Returns:
+            Dict {nome: DataFrame}
+        """
+        started = time.perf_counter()
+        frames = self.run(self.gather(**{
+            name: self.fetch_frame(query, params) for name, (query, params) in queries.items()
+        }))
+        logger.debug("%s consultas em paralelo em %.3fs", len(queries), time.perf_counter() - started)
+        return frames
+
+    def close(self) -> None:
+        """Fecha o pool e encerra o event loop"""
+        self.run(self.pool.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+@st.cache_resource
+def get_async_db_manager() -> AsyncDatabaseManager:
+    """Retorna instância única do AsyncDatabaseManager"""
+    return AsyncDatabaseManager()
+
+
+def fetch_frames_concurrently(queries: Dict[str, Tuple[str, Optional[tuple]]]) -> Dict[str, pd.DataFrame]:
+    """
+    Busca vários DataFrames independentes, em paralelo quando possível
+
+    Usa o AsyncDatabaseManager se psycopg3 estiver instalado; caso
+    contrário executa em sequência pelo DatabaseManager.
+
+    Args:
+        queries: Dict {nome: (sql, params)}
+
+    Returns:
+        Dict {nome: DataFrame}
+    """
+    manager = None
+    if ASYNC_AVAILABLE:
+        try:
+            manager = get_async_db_manager()
+        except Exception as e:
+            logger.error("Pool assíncrono indisponível, usando consultas sequenciais: %s", e)
+
+    if manager is not None:
+        return manager.gather_frames(queries)
+
+    db = get_db_manager()
+    return {name: db.fetch_frame(query, params) for name, (query, params) in queries.items()}
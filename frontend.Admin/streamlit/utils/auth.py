@@ -30,7 +30,7 @@ class AuthManager:
         try:
             return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
         except Exception as e:
-            logger.error(f"Erro ao verificar senha: {e}")
+            logger.error("Erro ao verificar senha: %s", e)
             return False
     
     def authenticate_user(self, username: str, password: str) -> Optional[Dict]:
@@ -45,7 +45,7 @@ class AuthManager:
             Dict com dados do usuário se autenticado, None caso contrário
         """
         if username not in self.admin_users:
-            logger.warning(f"Tentativa de login com usuário inexistente: {username}")
+            logger.warning("Tentativa de login com usuário inexistente: %s", username)
             return None
             
         user_data = self.admin_users[username]
@@ -60,16 +60,17 @@ class AuthManager:
             password_valid = password == stored_password
         
         if password_valid:
-            logger.info(f"Login bem-sucedido para usuário: {username}")
+            logger.info("Login bem-sucedido para usuário: %s", username)
             return {
                 'username': username,
+                'user_id': user_data.get('user_id'),
                 'role': user_data['role'],
                 'permissions': user_data['permissions'],
                 'login_time': datetime.now(),
                 'last_activity': datetime.now()
             }
         else:
-            logger.warning(f"Tentativa de login com senha incorreta para: {username}")
+            logger.warning("Tentativa de login com senha incorreta para: %s", username)
             return None
     
     def is_session_valid(self, user_data: Dict) -> bool:
@@ -105,7 +106,7 @@ class AuthManager:
         """Efetua logout do usuário atual"""
         if 'user' in st.session_state:
             username = st.session_state.user.get('username', 'unknown')
-            logger.info(f"Logout realizado para usuário: {username}")
+            logger.info("Logout realizado para usuário: %s", username)
             del st.session_state.user
         
         # Limpar outras variáveis de sessão relacionadas
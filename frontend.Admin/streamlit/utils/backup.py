@@ -0,0 +1,398 @@
+# utils/backup.py - Backup e restauração em streaming (banco + uploads)
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tarfile
+import time
+import logging
+from datetime import datetime
+from typing import Dict, Iterator, List, Tuple
+
+# Adicionar o diretório parent ao path para importar config
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import BACKUP_CONFIG, BASE_UPLOAD_PATH
+from utils.database import get_db_manager
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = 'manifest.json'
+FILES_INDEX = 'files.jsonl'
+
+try:
+    import zstandard
+except ImportError:  # zstd é opcional; gzip é o fallback
+    zstandard = None
+
+
+class _CountingWriter:
+    """Repassa escritas para outro arquivo contando os bytes"""
+
+    def __init__(self, target):
+        self.target = target
+        self.bytes_written = 0
+
+    def write(self, data) -> int:
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        self.bytes_written += len(data)
+        return self.target.write(data)
+
+
+def _compression() -> Tuple[str, str]:
+    """Retorna (algoritmo, extensão) conforme configuração e pacotes instalados"""
+    if BACKUP_CONFIG['compression'] == 'zstd' and zstandard is not None:
+        return 'zstd', '.zst'
+    return 'gzip', '.gz'
+
+
+def _open_writer(path: str, algorithm: str):
+    """Abre arquivo comprimido para escrita em streaming"""
+    if algorithm == 'zstd':
+        compressor = zstandard.ZstdCompressor(level=BACKUP_CONFIG['zstd_level'], threads=-1)
+        return compressor.stream_writer(open(path, 'wb'), closefd=True)
+    return gzip.open(path, 'wb', compresslevel=BACKUP_CONFIG['gzip_level'])
+
+
+def _open_reader(path: str, algorithm: str):
+    """Abre arquivo comprimido para leitura em streaming"""
+    if algorithm == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("Backup comprimido com zstd requer o pacote 'zstandard'")
+        return zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+    return gzip.open(path, 'rb')
+
+
+def _sha256(path: str) -> str:
+    """Hash SHA-256 do arquivo lido em blocos"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(BACKUP_CONFIG['read_block_size']), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _iter_upload_files(root: str) -> Iterator[Tuple[str, os.stat_result]]:
+    """Percorre recursivamente os uploads retornando (caminho relativo, stat)"""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield os.path.relpath(entry.path, root), entry.stat(follow_symlinks=False)
+        except FileNotFoundError:
+            continue
+
+
+def list_backups() -> List[Dict]:
+    """
+    Lista backups existentes, do mais recente para o mais antigo
+
+    Returns:
+        Lista de manifests (com a chave 'name')
+    """
+    backups = []
+    root = BACKUP_CONFIG['path']
+
+    for name in sorted(os.listdir(root), reverse=True) if os.path.isdir(root) else []:
+        manifest_path = os.path.join(root, name, MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            continue
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            manifest['name'] = name
+            backups.append(manifest)
+        except (OSError, ValueError) as e:
+            logger.error("Manifest inválido em %s: %s", manifest_path, e)
+
+    return backups
+
+
+def _load_files_index(backup_name: str) -> Dict[str, Dict]:
+    """Carrega o índice de arquivos de um backup"""
+    index = {}
+    path = os.path.join(BACKUP_CONFIG['path'], backup_name, FILES_INDEX)
+    if not os.path.exists(path):
+        return index
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            entry = json.loads(line)
+            index[entry['path']] = entry
+    return index
+
+
+def _existing_tables(db, tables: List[str]) -> List[str]:
+    """Filtra as tabelas configuradas que existem no banco, mantendo a ordem"""
+    rows = db.fetch_all(
+        "SELECT table_name FROM information_schema.tables WHERE table_schema = 'public' AND table_name = ANY(%s)",
+        (tables,)
+    )
+    existing = {row['table_name'] for row in rows}
+    return [table for table in tables if table in existing]
+
+
+def _table_columns(db, table: str) -> List[str]:
+    """Colunas graváveis da tabela (ignora colunas geradas)"""
+    rows = db.fetch_all(
+        """
+        SELECT column_name FROM information_schema.columns
+        WHERE table_schema = 'public' AND table_name = %s AND is_generated = 'NEVER'
+        ORDER BY ordinal_position
+        """,
+        (table,)
+    )
+    return [row['column_name'] for row in rows]
+
+
+def create_backup(job=None, include_files: bool = True, db=None) -> Dict:
+    """
+    Cria backup do banco (COPY TO STDOUT comprimido) e dos uploads
+
+    Os uploads são incrementais: arquivos com mesmo tamanho e mtime do
+    backup anterior, ou com mesmo hash, não são copiados de novo; o índice
+    aponta para o backup que contém cada arquivo.
+
+    Args:
+        job: JobContext opcional para progresso e cancelamento
+        include_files: Inclui os diretórios de upload
+        db: DatabaseManager (padrão: instância compartilhada)
+
+    Returns:
+        Manifest do backup criado
+    """
+    db = db or get_db_manager()
+    algorithm, extension = _compression()
+    started = time.monotonic()
+
+    name = f"matchit_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    backup_dir = os.path.join(BACKUP_CONFIG['path'], name)
+    os.makedirs(os.path.join(backup_dir, 'db'), exist_ok=True)
+
+    def progress(done, total, message):
+        if job is not None:
+            job.check_cancelled()
+            job.update(done, total, message=message)
+
+    manifest = {
+        'created_at': datetime.now().isoformat(),
+        'compression': algorithm,
+        'tables': {},
+        'files': None,
+    }
+
+    try:
+        # === BANCO DE DADOS ===
+        tables = _existing_tables(db, BACKUP_CONFIG['tables'])
+        db_bytes = 0
+
+        for position, table in enumerate(tables):
+            progress(position, len(tables) + 1, f"Exportando tabela {table}...")
+
+            columns = _table_columns(db, table)
+            column_list = ', '.join(f'"{column}"' for column in columns)
+            filename = f"{table}.csv{extension}"
+
+            with _open_writer(os.path.join(backup_dir, 'db', filename), algorithm) as writer:
+                counter = _CountingWriter(writer)
+                rows = db.copy_to(f"SELECT {column_list} FROM {table}", counter)
+
+            db_bytes += counter.bytes_written
+            manifest['tables'][table] = {
+                'file': f"db/{filename}",
+                'columns': columns,
+                'rows': rows,
+                'bytes': counter.bytes_written,
+            }
+
+        # === ARQUIVOS DE UPLOAD ===
+        if include_files:
+            manifest['files'] = _backup_files(backup_dir, name, algorithm, extension, progress, len(tables))
+
+        elapsed = time.monotonic() - started
+        files_bytes = manifest['files']['bytes_added'] if manifest['files'] else 0
+        manifest['metrics'] = {
+            'seconds': round(elapsed, 2),
+            'db_bytes': db_bytes,
+            'files_bytes': files_bytes,
+            'throughput_mb_s': round((db_bytes + files_bytes) / (1024 * 1024) / elapsed, 2) if elapsed else None,
+            'archive_bytes': sum(
+                os.path.getsize(os.path.join(directory, filename))
+                for directory, _, filenames in os.walk(backup_dir)
+                for filename in filenames
+            ),
+        }
+
+        with open(os.path.join(backup_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    except BaseException:
+        # Backup incompleto não deve servir de base para o próximo incremental
+        shutil.rmtree(backup_dir, ignore_errors=True)
+        raise
+
+    if job is not None:
+        job.update(1, message=f"Backup {name} criado", force=True)
+
+    logger.info("Backup criado: %s (%s)", name, manifest['metrics'])
+    manifest['name'] = name
+    return manifest
+
+
+def _backup_files(backup_dir: str, name: str, algorithm: str, extension: str,
+                  progress, table_count: int) -> Dict:
+    """Grava o tar incremental dos uploads e o índice de arquivos"""
+    previous = list_backups()
+    previous_index = _load_files_index(previous[0]['name']) if previous else {}
+
+    archive_name = f"files.tar{extension}"
+    stats = {'archive': archive_name, 'total_files': 0, 'added_files': 0, 'bytes_added': 0,
+             'base': previous[0]['name'] if previous else None}
+
+    with _open_writer(os.path.join(backup_dir, archive_name), algorithm) as writer, \
+            tarfile.open(fileobj=writer, mode='w|') as tar, \
+            open(os.path.join(backup_dir, FILES_INDEX), 'w', encoding='utf-8') as index:
+
+        for rel_path, stat in _iter_upload_files(BASE_UPLOAD_PATH):
+            stats['total_files'] += 1
+            if stats['total_files'] % 500 == 0:
+                progress(table_count, table_count + 1, f"Arquivos: {stats['total_files']} verificados, "
+                                                       f"{stats['added_files']} copiados")
+
+            full_path = os.path.join(BASE_UPLOAD_PATH, rel_path)
+            entry = {'path': rel_path, 'size': stat.st_size, 'mtime': stat.st_mtime}
+            old = previous_index.get(rel_path)
+
+            if old and old['size'] == stat.st_size and old['mtime'] == stat.st_mtime:
+                entry.update(sha256=old.get('sha256'), backup=old['backup'])
+            else:
+                entry['sha256'] = _sha256(full_path)
+                if old and old['size'] == stat.st_size and old.get('sha256') == entry['sha256']:
+                    entry['backup'] = old['backup']
+                else:
+                    tar.add(full_path, arcname=rel_path, recursive=False)
+                    entry['backup'] = name
+                    stats['added_files'] += 1
+                    stats['bytes_added'] += stat.st_size
+
+            index.write(json.dumps(entry) + '\n')
+
+    return stats
+
+
+def restore_backup(job=None, backup_name: str = None, restore_tables: bool = True,
+                   restore_files: bool = True, db=None) -> Dict:
+    """
+    Restaura um backup criado por create_backup
+
+    As tabelas são truncadas e recarregadas via COPY FROM STDIN em uma
+    única transação; após o commit os caches de consultas são limpos em
+    todas as réplicas. Os arquivos são extraídos da cadeia de backups
+    incrementais conforme o índice.
+
+    Args:
+        job: JobContext opcional para progresso e cancelamento
+        backup_name: Nome do diretório do backup
+        restore_tables: Restaura o banco de dados
+        restore_files: Restaura os uploads
+        db: DatabaseManager (padrão: instância compartilhada)
+
+    Returns:
+        Dict com linhas e arquivos restaurados
+    """
+    db = db or get_db_manager()
+    backup_dir = os.path.join(BACKUP_CONFIG['path'], backup_name)
+
+    with open(os.path.join(backup_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    algorithm = manifest['compression']
+    summary = {'backup': backup_name, 'tables': {}, 'restored_files': 0}
+
+    def progress(message):
+        if job is not None:
+            job.check_cancelled()
+            job.update(message=message, force=True)
+
+    if restore_tables and manifest['tables']:
+        tables = list(manifest['tables'].keys())
+        progress(f"Restaurando tabelas: {', '.join(tables)}")
+
+        with db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(f"TRUNCATE {', '.join(tables)}")
+
+                for table, info in manifest['tables'].items():
+                    column_list = ', '.join(f'"{column}"' for column in info['columns'])
+                    with _open_reader(os.path.join(backup_dir, info['file']), algorithm) as reader:
+                        cursor.copy_expert(
+                            f"COPY {table} ({column_list}) FROM STDIN WITH (FORMAT csv, HEADER)",
+                            reader,
+                            size=BACKUP_CONFIG['read_block_size']
+                        )
+                    summary['tables'][table] = cursor.rowcount
+
+                    # Reposiciona a sequência do id serial
+                    if 'id' in info['columns']:
+                        cursor.execute(
+                            f"""
+                            SELECT setval(pg_get_serial_sequence(%s, 'id'),
+                                          COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)
+                            WHERE pg_get_serial_sequence(%s, 'id') IS NOT NULL
+                            """,
+                            (table, table)
+                        )
+
+            conn.commit()
+
+        # Caches (nesta e nas demais réplicas) ainda guardam os dados anteriores
+        db.invalidate_image_caches()
+
+    if restore_files and manifest.get('files'):
+        summary['restored_files'] = _restore_files(backup_name, progress)
+
+    logger.info("Backup restaurado: %s", summary)
+    return summary
+
+
+def _restore_files(backup_name: str, progress) -> int:
+    """Extrai os arquivos do índice a partir de cada backup da cadeia"""
+    needed: Dict[str, set] = {}
+    for entry in _load_files_index(backup_name).values():
+        needed.setdefault(entry['backup'], set()).add(entry['path'])
+
+    restored = 0
+    upload_root = os.path.realpath(BASE_UPLOAD_PATH)
+
+    for source, paths in needed.items():
+        progress(f"Extraindo {len(paths)} arquivos de {source}...")
+        source_manifest_path = os.path.join(BACKUP_CONFIG['path'], source, MANIFEST_FILE)
+        with open(source_manifest_path, 'r', encoding='utf-8') as f:
+            source_manifest = json.load(f)
+
+        archive = os.path.join(BACKUP_CONFIG['path'], source, source_manifest['files']['archive'])
+        with _open_reader(archive, source_manifest['compression']) as reader, \
+                tarfile.open(fileobj=reader, mode='r|') as tar:
+            for member in tar:
+                if member.name not in paths or not member.isfile():
+                    continue
+
+                target = os.path.realpath(os.path.join(upload_root, member.name))
+                if not target.startswith(upload_root + os.sep):
+                    logger.warning("Ignorando caminho fora dos uploads: %s", member.name)
+                    continue
+
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with tar.extractfile(member) as src, open(target, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, BACKUP_CONFIG['read_block_size'])
+                os.utime(target, (member.mtime, member.mtime))
+                restored += 1
+
+    return restored
@@ -0,0 +1,287 @@
+# utils/cache.py - Registro unificado de caches do dashboard administrativo
+import json
+import os
+import select
+import sys
+import threading
+import time
+import uuid
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+import psycopg2
+
+# Adicionar o diretório parent ao path para importar config
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import CACHE_CONFIG, DATABASE_URL
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def estimate_size(value: Any, depth: int = 3) -> int:
+    """
+    Estima os bytes ocupados por um valor em cache
+
+    Percorre listas, tuplas e dicts até depth níveis; DataFrames usam
+    memory_usage(deep=True). É uma estimativa, não uma medida exata.
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    if hasattr(value, 'memory_usage') and hasattr(value, 'columns'):
+        return int(value.memory_usage(deep=True).sum())
+
+    size = sys.getsizeof(value)
+    if depth <= 0:
+        return size
+
+    if isinstance(value, dict):
+        size += sum(estimate_size(k, depth - 1) + estimate_size(v, depth - 1) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, depth - 1) for item in value)
+
+    return size
+
+
+class CacheNamespace:
+    """Cache LRU com TTL, limite de bytes e estatísticas de uso"""
+
+    def __init__(self, name: str, max_entries: int = 256, ttl: Optional[float] = None,
+                 max_bytes: Optional[int] = None, description: str = ''):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.description = description
+
+        self._entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._lock = threading.RLock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.flushes = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Retorna o valor em cache ou default"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, expires_at, size = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, size: Optional[int] = None) -> None:
+        """Armazena um valor, removendo os menos usados se passar dos limites"""
+        ttl = self.ttl if ttl is None else ttl
+        size = estimate_size(value) if size is None else size
+        expires_at = time.monotonic() + ttl if ttl else None
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (value, expires_at, size)
+            self.bytes += size
+
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or (self.max_bytes is not None and self.bytes > self.max_bytes and len(self._entries) > 1)
+            ):
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def get_or_set(self, key: Hashable, loader: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """Retorna o valor em cache ou carrega com loader() e armazena"""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = loader()
+            self.set(key, value, ttl=ttl)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove uma entrada"""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> int:
+        """Remove todas as entradas e retorna quantas foram removidas"""
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            self.bytes = 0
+            self.flushes += 1
+            return count
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, size = self._entries.pop(key)
+        self.bytes -= size
+
+    def stats(self) -> Dict:
+        """Estatísticas do namespace"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'namespace': self.name,
+                'description': self.description,
+                'entries': len(self._entries),
+                'bytes': self.bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'flushes': self.flushes,
+            }
+
+
+class CacheRegistry:
+    """
+    Registro de todos os caches do processo
+
+    Limpezas seletivas são propagadas para as outras réplicas via
+    NOTIFY no PostgreSQL; cada réplica mantém uma thread em LISTEN.
+    """
+
+    def __init__(self):
+        self.origin = uuid.uuid4().hex
+        self.channel = CACHE_CONFIG['notify_channel']
+        self._namespaces: Dict[str, CacheNamespace] = {}
+        self._lock = threading.Lock()
+        self._listener: Optional[threading.Thread] = None
+
+    def register(self, name: str, **options) -> CacheNamespace:
+        """
+        Registra (ou retorna) um namespace de cache
+
+        Opções ausentes vêm de CACHE_CONFIG['namespaces'][name].
+        """
+        with self._lock:
+            if name not in self._namespaces:
+                settings = dict(CACHE_CONFIG['namespaces'].get(name, {}))
+                settings.update(options)
+                self._namespaces[name] = CacheNamespace(name, **settings)
+            return self._namespaces[name]
+
+    def namespaces(self) -> List[str]:
+        """Nomes dos namespaces registrados"""
+        with self._lock:
+            return sorted(self._namespaces)
+
+    def stats(self) -> List[Dict]:
+        """Estatísticas de todos os namespaces"""
+        with self._lock:
+            namespaces = list(self._namespaces.values())
+        return [namespace.stats() for namespace in sorted(namespaces, key=lambda ns: ns.name)]
+
+    def flush_local(self, names: Optional[Iterable[str]] = None) -> int:
+        """Limpa namespaces apenas neste processo"""
+        with self._lock:
+            targets = [self._namespaces[name] for name in (names or self._namespaces) if name in self._namespaces]
+        return sum(namespace.clear() for namespace in targets)
+
+    def flush(self, names: Optional[Iterable[str]] = None, propagate: bool = True) -> int:
+        """
+        Limpa namespaces (todos se names for None) e avisa as outras réplicas
+
+        Args:
+            names: Namespaces a limpar
+            propagate: Envia NOTIFY para as demais réplicas
+
+        Returns:
+            Entradas removidas neste processo
+        """
+        names = list(names) if names is not None else None
+        removed = self.flush_local(names)
+
+        if propagate:
+            payload = json.dumps({'origin': self.origin, 'namespaces': names})
+            try:
+                with psycopg2.connect(DATABASE_URL) as conn:
+                    with conn.cursor() as cursor:
+                        cursor.execute("SELECT pg_notify(%s, %s)", (self.channel, payload))
+                conn.close()
+            except Exception as e:
+                logger.error("Erro ao propagar limpeza de cache: %s", e)
+
+        logger.info("Cache limpo: %s (%s entradas)", names or 'todos', removed)
+        return removed
+
+    def start_listener(self) -> None:
+        """Inicia (uma vez) a thread que recebe limpezas de outras réplicas"""
+        if not CACHE_CONFIG['listen']:
+            return
+
+        with self._lock:
+            if self._listener is not None and self._listener.is_alive():
+                return
+            self._listener = threading.Thread(target=self._listen, name="cache-listener", daemon=True)
+            self._listener.start()
+
+    def _listen(self) -> None:
+        """Loop de LISTEN com reconexão"""
+        backoff = 1
+        while True:
+            conn = None
+            try:
+                conn = psycopg2.connect(DATABASE_URL)
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {self.channel}")
+                backoff = 1
+
+                while True:
+                    if select.select([conn], [], [], 30) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        self._handle_notify(conn.notifies.pop(0).payload)
+
+            except Exception as e:
+                logger.error("Listener de cache desconectado: %s", e)
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 60)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+    def _handle_notify(self, payload: str) -> None:
+        """Aplica uma limpeza recebida de outra réplica"""
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            return
+
+        if message.get('origin') == self.origin:
+            return
+
+        self.flush_local(message.get('namespaces'))
+
+
+_registry = CacheRegistry()
+
+
+def get_cache_registry() -> CacheRegistry:
+    """Retorna o registro de caches do processo, iniciando o listener"""
+    _registry.start_listener()
+    return _registry
+
+
+def get_cache(name: str, **options) -> CacheNamespace:
+    """Atalho para registrar/obter um namespace"""
+    return get_cache_registry().register(name, **options)
@@ -0,0 +1,157 @@
+# utils/contact_sheet.py - Página de thumbnails composta em uma única imagem
+import io
+import os
+import sys
+import base64
+import logging
+from typing import Dict, Iterable, List, Optional
+
+from PIL import Image, ImageDraw
+
+# Adicionar o diretório parent ao path para importar config
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import CONTACT_SHEET_CONFIG
+from utils.cache import get_cache
+
+logger = logging.getLogger(__name__)
+
+_BACKGROUND = (245, 245, 245)
+_LABEL_BACKGROUND = (0, 0, 0)
+_LABEL_TEXT = (255, 255, 255)
+_SELECTED_OUTLINE = (255, 75, 75)
+
+
+def _cell_origin(index: int, columns: int, cell_size: int, padding: int) -> tuple:
+    """Canto superior esquerdo da célula index"""
+    row, column = divmod(index, columns)
+    return (padding + column * (cell_size + padding), padding + row * (cell_size + padding))
+
+
+def _render(thumbnails: List[Optional[bytes]], columns: int, cell_size: int, padding: int) -> Image.Image:
+    """Compõe os thumbnails em uma grade numerada (células vazias ficam em branco)"""
+    rows = max(1, -(-len(thumbnails) // columns))
+    width = padding + columns * (cell_size + padding)
+    height = padding + rows * (cell_size + padding)
+
+    sheet = Image.new('RGB', (width, height), _BACKGROUND)
+    draw = ImageDraw.Draw(sheet)
+
+    for index, data in enumerate(thumbnails):
+        x, y = _cell_origin(index, columns, cell_size, padding)
+
+        if data is not None:
+            try:
+                with Image.open(io.BytesIO(data)) as thumb:
+                    thumb.draft('RGB', (cell_size, cell_size))
+                    thumb = thumb.convert('RGB')
+                    thumb.thumbnail((cell_size, cell_size))
+                    sheet.paste(thumb, (x + (cell_size - thumb.width) // 2, y + (cell_size - thumb.height) // 2))
+            except Exception as e:
+                logger.warning("Thumbnail inválido no contact sheet (célula %s): %s", index + 1, e)
+
+        # Número da célula, usado pela seleção sem clique
+        label = str(index + 1)
+        draw.rectangle([x, y, x + 8 + 7 * len(label), y + 14], fill=_LABEL_BACKGROUND)
+        draw.text((x + 4, y + 2), label, fill=_LABEL_TEXT)
+
+    return sheet
+
+
+def build_contact_sheet(images: List[Dict], handler=None, columns: Optional[int] = None) -> Dict:
+    """
+    Gera (ou obtém do cache) o contact sheet de uma página de imagens
+
+    A chave do cache é a lista de ids com a versão de cada thumbnail
+    (posição no store ou mtime), então a imagem só é recomposta quando a
+    página muda ou algum thumbnail é regravado.
+
+    Args:
+        images: Imagens da página, na ordem de exibição
+        handler: ImageHandler usado para ler os thumbnails
+        columns: Colunas da grade (padrão: CONTACT_SHEET_CONFIG)
+
+    Returns:
+        Dict com bytes JPEG, dimensões, geometria da grade e ids por célula
+    """
+    if handler is None:
+        from utils.image_handler import get_image_handler
+        handler = get_image_handler()
+
+    columns = columns or CONTACT_SHEET_CONFIG['columns']
+    cell_size = CONTACT_SHEET_CONFIG['cell_size']
+    padding = CONTACT_SHEET_CONFIG['padding']
+
+    key = (columns, cell_size, padding, tuple((image['id'], handler.thumbnail_version(image)) for image in images))
+    cache = get_cache('contact_sheets')
+    sheet = cache.get(key)
+    if sheet is not None:
+        return sheet
+
+    composed = _render([handler.read_thumbnail(image) for image in images], columns, cell_size, padding)
+    buffer = io.BytesIO()
+    composed.save(buffer, 'JPEG', quality=CONTACT_SHEET_CONFIG['quality'], optimize=True)
+
+    sheet = {
+        'image': buffer.getvalue(),
+        'width': composed.width,
+        'height': composed.height,
+        'columns': columns,
+        'cell_size': cell_size,
+        'padding': padding,
+        'cells': [image['id'] for image in images],
+    }
+    cache.set(key, sheet, size=len(sheet['image']))
+    return sheet
+
+
+def cell_at(sheet: Dict, x: float, y: float) -> Optional[int]:
+    """
+    Id da imagem sob um ponto do contact sheet
+
+    Args:
+        sheet: Resultado de build_contact_sheet
+        x, y: Coordenadas em pixels da imagem composta
+
+    Returns:
+        Id da imagem ou None (espaçamento ou célula vazia)
+    """
+    pitch = sheet['cell_size'] + sheet['padding']
+    column, offset_x = divmod(int(x) - sheet['padding'], pitch)
+    row, offset_y = divmod(int(y) - sheet['padding'], pitch)
+
+    if column < 0 or row < 0 or column >= sheet['columns']:
+        return None
+    if offset_x >= sheet['cell_size'] or offset_y >= sheet['cell_size']:
+        return None
+
+    index = row * sheet['columns'] + column
+    return sheet['cells'][index] if index < len(sheet['cells']) else None
+
+
+def highlight_selection(sheet: Dict, selected_ids: Iterable[int]) -> bytes:
+    """
+    Bytes do contact sheet com as células selecionadas contornadas
+
+    Sem seleção na página retorna a imagem em cache sem recodificar.
+    """
+    selected = set(selected_ids)
+    indexes = [index for index, image_id in enumerate(sheet['cells']) if image_id in selected]
+    if not indexes:
+        return sheet['image']
+
+    with Image.open(io.BytesIO(sheet['image'])) as composed:
+        composed = composed.convert('RGB')
+        draw = ImageDraw.Draw(composed)
+        size = sheet['cell_size']
+        for index in indexes:
+            x, y = _cell_origin(index, sheet['columns'], size, sheet['padding'])
+            draw.rectangle([x, y, x + size - 1, y + size - 1], outline=_SELECTED_OUTLINE, width=4)
+
+        buffer = io.BytesIO()
+        composed.save(buffer, 'JPEG', quality=CONTACT_SHEET_CONFIG['quality'])
+        return buffer.getvalue()
+
+
+def to_data_url(data: bytes) -> str:
+    """Data URL JPEG (para componentes que recebem a imagem como src)"""
+    return "data:image/jpeg;base64," + base64.b64encode(data).decode('ascii')
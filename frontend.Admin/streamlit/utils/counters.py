@@ -0,0 +1,106 @@
+# utils/counters.py - Contadores de imagens mantidos por triggers
+import logging
+
+logger = logging.getLogger(__name__)
+
+COUNTERS_TABLE = 'tournament_image_counters'
+
+# Uma linha por (categoria, ativa, aprovada). NULL em active/approved conta
+# como os padrões exibidos no dashboard (ativa, não aprovada).
+COUNTERS_TABLE_DDL = """
+CREATE TABLE IF NOT EXISTS tournament_image_counters (
+    category TEXT NOT NULL,
+    active BOOLEAN NOT NULL,
+    approved BOOLEAN NOT NULL,
+    image_count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (category, active, approved)
+);
+"""
+
+COUNTERS_FUNCTIONS_DDL = """
+CREATE OR REPLACE FUNCTION tournament_image_counters_sync() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE tournament_image_counters
+        SET image_count = image_count - 1
+        WHERE category = OLD.category::text
+          AND active = COALESCE(OLD.active, true)
+          AND approved = COALESCE(OLD.approved, false);
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO tournament_image_counters (category, active, approved, image_count)
+        VALUES (NEW.category::text, COALESCE(NEW.active, true), COALESCE(NEW.approved, false), 1)
+        ON CONFLICT (category, active, approved)
+        DO UPDATE SET image_count = tournament_image_counters.image_count + 1;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION tournament_image_counters_reset() RETURNS trigger AS $$
+BEGIN
+    DELETE FROM tournament_image_counters;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# Instalação e backfill na mesma transação, com escrita bloqueada na tabela
+# de imagens: nenhuma alteração fica fora da contagem inicial
+COUNTERS_INSTALL_SQL = """
+LOCK TABLE tournament_images IN SHARE ROW EXCLUSIVE MODE;
+
+DROP TRIGGER IF EXISTS trg_tournament_image_counters_ins_del ON tournament_images;
+DROP TRIGGER IF EXISTS trg_tournament_image_counters_upd ON tournament_images;
+DROP TRIGGER IF EXISTS trg_tournament_image_counters_truncate ON tournament_images;
+
+CREATE TRIGGER trg_tournament_image_counters_ins_del
+AFTER INSERT OR DELETE ON tournament_images
+FOR EACH ROW EXECUTE PROCEDURE tournament_image_counters_sync();
+
+-- Só atualizações que mudam a chave do contador pagam o custo do trigger
+CREATE TRIGGER trg_tournament_image_counters_upd
+AFTER UPDATE OF category, active, approved ON tournament_images
+FOR EACH ROW
+WHEN (OLD.category IS DISTINCT FROM NEW.category
+      OR COALESCE(OLD.active, true) IS DISTINCT FROM COALESCE(NEW.active, true)
+      OR COALESCE(OLD.approved, false) IS DISTINCT FROM COALESCE(NEW.approved, false))
+EXECUTE PROCEDURE tournament_image_counters_sync();
+
+-- TRUNCATE (ex.: restauração de backup) zera os contadores; o COPY que
+-- vem em seguida dispara os triggers de linha e os reconstrói
+CREATE TRIGGER trg_tournament_image_counters_truncate
+AFTER TRUNCATE ON tournament_images
+FOR EACH STATEMENT EXECUTE PROCEDURE tournament_image_counters_reset();
+
+DELETE FROM tournament_image_counters;
+
+INSERT INTO tournament_image_counters (category, active, approved, image_count)
+SELECT category::text, COALESCE(active, true), COALESCE(approved, false), COUNT(*)
+FROM tournament_images
+GROUP BY 1, 2, 3;
+"""
+
+
+def install_counters(db) -> bool:
+    """
+    Cria a tabela de contadores, as funções e os triggers e refaz a contagem
+
+    Idempotente: pode ser executado novamente para corrigir divergências.
+
+    Args:
+        db: DatabaseManager
+
+    Returns:
+        True se sucesso
+    """
+    for ddl in (COUNTERS_TABLE_DDL, COUNTERS_FUNCTIONS_DDL, COUNTERS_INSTALL_SQL):
+        if not db.execute_ddl(ddl):
+            return False
+
+    db.schema_cache.invalidate(COUNTERS_TABLE)
+    db.invalidate_image_caches()
+    logger.info("Contadores de imagens instalados e recalculados")
+    return True
@@ -1,26 +1,166 @@
 # utils/database.py - Gerenciador de conexão com PostgreSQL
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
+from psycopg2.pool import ThreadedConnectionPool
 import streamlit as st
+import numpy as np
+import pandas as pd
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, BinaryIO, Iterator
 from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+import uuid
+from datetime import datetime
 import sys
 import os
 
 # Adicionar o diretório parent ao path para importar config
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-from config import DATABASE_URL, DB_CONFIG
+from config import DATABASE_URL, DB_CONFIG, COUNT_CONFIG, PARALLEL_QUERY_CONFIG
+from utils.cache import get_cache, get_cache_registry
+from utils.logging_setup import setup_logging
 
-# Configurar logging
-logging.basicConfig(level=logging.INFO)
+# Configurar logging (JSON assíncrono, ver utils/logging_setup.py)
+setup_logging()
 logger = logging.getLogger(__name__)
 
+# OIDs dos tipos PostgreSQL usados na montagem de colunas (pg_type)
+PG_BOOL_OIDS = {16}
+PG_INT_OIDS = {20, 21, 23, 26}
+PG_FLOAT_OIDS = {700, 701, 1700}
+PG_DATETIME_OIDS = {1082, 1114, 1184}
+
+# Status derivado de approved/active, usado em todas as quebras por status
+IMAGE_STATUS_SQL = """
+CASE
+    WHEN approved = true THEN 'approved'
+    WHEN approved = false AND active = true THEN 'pending'
+    WHEN active = false THEN 'inactive'
+    ELSE 'unknown'
+END
+"""
+
+# Coluna gerada com o mesmo status (check_database.py); evita recalcular o
+# CASE por linha e permite index-only scans no índice (status, category, uploaded_at)
+IMAGE_STATUS_COLUMN_DDL = f"""
+ALTER TABLE tournament_images
+ADD COLUMN IF NOT EXISTS status VARCHAR(10)
+GENERATED ALWAYS AS ({" ".join(IMAGE_STATUS_SQL.split())}) STORED;
+"""
+
+# Contagens simples em get_dashboard_stats (podem usar estimativas, ver count_rows)
+_COUNT_QUERY_PREFIX = "SELECT COUNT(*) as count FROM tournament_images"
+
+# Decisões da fila de revisão (apply_review_decisions). approved_by é INTEGER
+# (users.id); o nome do moderador só é comparado com review_claimed_by (texto)
+REVIEW_DECISIONS_SQL = """
+UPDATE tournament_images AS t
+SET approved = d.approved,
+    active = d.approved,
+    approved_by = CASE WHEN d.approved AND d.approved_by IS NOT NULL THEN d.approved_by ELSE t.approved_by END,
+    approved_at = CASE WHEN d.approved THEN NOW() ELSE t.approved_at END,
+    updated_at = NOW(),
+    review_claimed_by = NULL,
+    review_claimed_at = NULL
+FROM (VALUES %s) AS d(id, approved, approved_by, moderator)
+WHERE t.id = d.id AND t.review_claimed_by = d.moderator
+"""
+REVIEW_DECISIONS_TEMPLATE = "(%s::integer, %s::boolean, %s::integer, %s::text)"
+
+def review_decision_rows(decisions: Dict[int, bool], moderator: str,
+                         moderator_id: Optional[int] = None) -> List[Tuple]:
+    """Linhas do VALUES de REVIEW_DECISIONS_SQL, na ordem de REVIEW_DECISIONS_TEMPLATE"""
+    return [(image_id, approved, moderator_id, moderator) for image_id, approved in decisions.items()]
+
+# Tamanho máximo do texto de query gravado nos logs de erro
+LOG_QUERY_MAX_CHARS = 500
+
+def _query_summary(query) -> str:
+    """Query em uma linha e truncada para os logs (parâmetros nunca são gravados)"""
+    if isinstance(query, bytes):
+        query = query.decode('utf-8', errors='replace')
+    query = " ".join(str(query).split())
+    if len(query) > LOG_QUERY_MAX_CHARS:
+        return query[:LOG_QUERY_MAX_CHARS] + "..."
+    return query
+
+def _column_to_array(values: tuple, type_code: int):
+    """
+    Converte os valores de uma coluna em array tipado pelo OID do PostgreSQL
+    
+    Colunas inteiras e booleanas com NULL usam os dtypes anuláveis do pandas
+    (Int64/boolean); numeric vira float64 com NaN no lugar de NULL.
+    """
+    count = len(values)
+    has_nulls = any(value is None for value in values)
+    
+    if type_code in PG_INT_OIDS:
+        if has_nulls:
+            return pd.array(values, dtype='Int64')
+        return np.fromiter(values, dtype=np.int64, count=count)
+    
+    if type_code in PG_FLOAT_OIDS:
+        return np.fromiter(
+            (np.nan if value is None else float(value) for value in values),
+            dtype=np.float64,
+            count=count
+        )
+    
+    if type_code in PG_BOOL_OIDS:
+        if has_nulls:
+            return pd.array(values, dtype='boolean')
+        return np.fromiter(values, dtype=np.bool_, count=count)
+    
+    if type_code in PG_DATETIME_OIDS:
+        return pd.to_datetime(pd.Series(values, dtype=object)).array
+    
+    # Texto, enums, arrays e demais tipos ficam como objeto
+    array = np.empty(count, dtype=object)
+    array[:] = values
+    return array
+
+def _arrow_type(type_code: int):
+    """Retorna o tipo Arrow correspondente ao OID ou None para inferir"""
+    import pyarrow as pa
+    
+    if type_code in PG_INT_OIDS:
+        return pa.int64()
+    if type_code in PG_FLOAT_OIDS:
+        return pa.float64()
+    if type_code in PG_BOOL_OIDS:
+        return pa.bool_()
+    if type_code == 1082:
+        return pa.date32()
+    if type_code == 1114:
+        return pa.timestamp('us')
+    if type_code == 1184:
+        return pa.timestamp('us', tz='UTC')
+    return None
+
 class DatabaseManager:
     """Gerenciador de conexão e operações com PostgreSQL"""
     
     def __init__(self):
         self.connection_pool = None
+        self.schema_cache = get_cache('schema')
+        self.query_cache = get_cache('queries')
+        self.rollup_cache = get_cache('rollups')
+        self.count_cache = get_cache('counts')
+        # Recontagens exatas em segundo plano (modo aproximado)
+        self._recount_executor = ThreadPoolExecutor(
+            max_workers=COUNT_CONFIG['recount_workers'],
+            thread_name_prefix="exact-count"
+        )
+        self._recounts_in_flight = set()
+        self._recounts_lock = threading.Lock()
+        # Consultas independentes em paralelo (run_parallel)
+        self._parallel_executor = ThreadPoolExecutor(
+            max_workers=PARALLEL_QUERY_CONFIG['max_workers'],
+            thread_name_prefix="parallel-query"
+        )
+        self._pool_lock = threading.Lock()
         self._test_connection()
     
     def _test_connection(self) -> bool:
@@ -32,7 +172,7 @@ class DatabaseManager:
                     logger.info("✅ Conexão com banco de dados estabelecida com sucesso")
                     return True
         except Exception as e:
-            logger.error(f"❌ Erro ao conectar com banco de dados: {e}")
+            logger.error("❌ Erro ao conectar com banco de dados: %s", e)
             st.error(f"Erro de conexão com banco: {e}")
             return False
     
@@ -46,13 +186,98 @@ class DatabaseManager:
         except Exception as e:
             if conn:
                 conn.rollback()
-            logger.error(f"Erro na conexão: {e}")
+            logger.error("Erro na conexão: %s", e)
             raise
         finally:
             if conn:
                 conn.close()
     
-    def execute_query(self, query: str, params: tuple = None, fetch: bool = True) -> Optional[List[Dict]]:
+    def _get_connection_pool(self) -> ThreadedConnectionPool:
+        """Cria sob demanda o pool usado por run_parallel"""
+        with self._pool_lock:
+            if self.connection_pool is None:
+                self.connection_pool = ThreadedConnectionPool(
+                    1, PARALLEL_QUERY_CONFIG['max_workers'], DATABASE_URL
+                )
+            return self.connection_pool
+    
+    @contextmanager
+    def get_pooled_connection(self):
+        """Context manager para conexões do pool (devolvidas sem transação aberta)"""
+        pool = self._get_connection_pool()
+        conn = pool.getconn()
+        try:
+            yield conn
+        finally:
+            if not conn.closed:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    pass
+            pool.putconn(conn, close=bool(conn.closed))
+    
+    def _timed_fetch(self, query: str, params: tuple) -> Dict:
+        """Executa uma consulta de leitura em uma conexão do pool e mede o tempo"""
+        started = time.perf_counter()
+        try:
+            with self.get_pooled_connection() as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                    cursor.execute(query, params)
+                    rows = cursor.fetchall()
+            return {'rows': rows, 'elapsed': time.perf_counter() - started, 'error': None}
+        except Exception as e:
+            logger.error("Erro em consulta paralela: %s", e, extra={'query': _query_summary(query)})
+            return {'rows': [], 'elapsed': time.perf_counter() - started, 'error': str(e)}
+    
+    def run_parallel(self, queries: Dict[str, Tuple[str, Optional[tuple]]]) -> Dict[str, Dict]:
+        """
+        Executa consultas de leitura independentes ao mesmo tempo
+        
+        Cada consulta usa sua própria conexão do pool; no máximo
+        PARALLEL_QUERY_CONFIG['max_workers'] rodam simultaneamente. Um erro
+        em uma consulta não interrompe as demais.
+        
+        Args:
+            queries: Dict {nome: (sql, params)}
+            
+        Returns:
+            Dict {nome: {'rows': lista de dicts, 'elapsed': segundos,
+            'error': mensagem ou None}}
+        """
+        started = time.perf_counter()
+        futures = {
+            name: self._parallel_executor.submit(self._timed_fetch, query, params)
+            for name, (query, params) in queries.items()
+        }
+        results = {name: future.result() for name, future in futures.items()}
+        
+        logger.debug(
+            "%s consultas paralelas em %.3fs", len(queries), time.perf_counter() - started,
+            extra={'timings': {name: round(result['elapsed'], 4) for name, result in results.items()}}
+        )
+        return results
+    
+    def close(self) -> None:
+        """
+        Chamado pelas páginas ao final de cada execução
+        
+        O gerenciador é compartilhado entre sessões (st.cache_resource):
+        conexões avulsas já são fechadas por get_connection e as do pool
+        ficam abertas para as próximas execuções. Use shutdown() para
+        encerrar de fato.
+        """
+    
+    def shutdown(self) -> None:
+        """Fecha o pool de conexões e os executores em segundo plano"""
+        self._parallel_executor.shutdown(wait=True)
+        self._recount_executor.shutdown(wait=False)
+        with self._pool_lock:
+            if self.connection_pool is not None:
+                self.connection_pool.closeall()
+                self.connection_pool = None
+    
+    def execute_query(self, query: str, params: tuple = None, fetch: bool = True,
+                      commit: bool = False) -> Optional[List[Dict]]:
         """
         Executa uma query e retorna os resultados
         
@@ -60,6 +285,7 @@ class DatabaseManager:
             query: SQL query para executar
             params: Parâmetros para a query
             fetch: Se deve fazer fetch dos resultados
+            commit: Se deve confirmar a transação após o fetch (INSERT/UPDATE ... RETURNING)
             
         Returns:
             Lista de dicionários com os resultados ou None
@@ -70,18 +296,76 @@ class DatabaseManager:
                     cursor.execute(query, params)
                     
                     if fetch:
+                        # RealDictRow já é um dict, sem necessidade de copiar cada linha
                         results = cursor.fetchall()
-                        return [dict(row) for row in results]
+                        if commit:
+                            conn.commit()
+                        return results
                     else:
                         conn.commit()
                         return None
                         
         except Exception as e:
-            logger.error(f"Erro ao executar query: {e}")
-            logger.error(f"Query: {query}")
-            logger.error(f"Params: {params}")
+            logger.error(
+                "Erro ao executar query: %s", e,
+                extra={'query': _query_summary(query), 'param_count': len(params) if params else 0}
+            )
             raise
     
+    def stream_chunks(self, query: str, params: tuple = None, chunk_size: int = 2000,
+                      as_dict: bool = True) -> Iterator[List]:
+        """
+        Executa query em um cursor nomeado no servidor e retorna lotes de linhas
+        
+        Apenas chunk_size linhas ficam em memória por vez; o restante permanece
+        no servidor até ser solicitado. A conexão é liberada quando o iterador
+        termina ou é descartado.
+        
+        Args:
+            query: SQL query para executar
+            params: Parâmetros para a query
+            chunk_size: Linhas por lote buscado no servidor
+            as_dict: Se True retorna dicts (RealDictCursor), senão tuplas
+            
+        Returns:
+            Iterador de listas de linhas
+        """
+        cursor_name = f"stream_{uuid.uuid4().hex[:12]}"
+        cursor_factory = RealDictCursor if as_dict else None
+        
+        try:
+            with self.get_connection() as conn:
+                with conn.cursor(name=cursor_name, cursor_factory=cursor_factory) as cursor:
+                    cursor.itersize = chunk_size
+                    cursor.execute(query, params)
+                    
+                    while True:
+                        rows = cursor.fetchmany(chunk_size)
+                        if not rows:
+                            break
+                        yield rows
+                        
+        except Exception as e:
+            logger.error("Erro ao executar query em streaming: %s", e, extra={'query': _query_summary(query)})
+            raise
+    
+    def stream_query(self, query: str, params: tuple = None, chunk_size: int = 2000,
+                     as_dict: bool = True) -> Iterator:
+        """
+        Executa query em um cursor nomeado e retorna as linhas uma a uma
+        
+        Args:
+            query: SQL query para executar
+            params: Parâmetros para a query
+            chunk_size: Linhas por lote buscado no servidor
+            as_dict: Se True retorna dicts (RealDictCursor), senão tuplas
+            
+        Returns:
+            Iterador de linhas
+        """
+        for rows in self.stream_chunks(query, params, chunk_size=chunk_size, as_dict=as_dict):
+            yield from rows
+    
     def execute_many(self, query: str, params_list: List[tuple]) -> bool:
         """
         Executa múltiplas operações de uma vez
@@ -98,11 +382,11 @@ class DatabaseManager:
                 with conn.cursor() as cursor:
                     cursor.executemany(query, params_list)
                     conn.commit()
-                    logger.info(f"Executadas {len(params_list)} operações com sucesso")
+                    logger.info("Executadas %s operações com sucesso", len(params_list))
                     return True
                     
         except Exception as e:
-            logger.error(f"Erro ao executar batch: {e}")
+            logger.error("Erro ao executar batch: %s", e)
             return False
     
     def fetch_one(self, query: str, params: tuple = None) -> Optional[Dict]:
@@ -132,45 +416,131 @@ class DatabaseManager:
         """
         return self.execute_query(query, params, fetch=True) or []
     
-    def execute_ddl(self, query: str, params: Tuple = None) -> bool:
+    def _fetch_columns(self, query: str, params: tuple = None) -> Tuple[List[str], List[int], List[tuple]]:
+        """
+        Executa query com cursor de tuplas e transpõe o resultado em colunas
+        
+        Args:
+            query: SQL query para executar
+            params: Parâmetros para a query
+            
+        Returns:
+            Tuple (nomes das colunas, OIDs dos tipos, valores por coluna)
+        """
+        try:
+            with self.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(query, params)
+                    rows = cursor.fetchall()
+                    description = cursor.description
+                    
+        except Exception as e:
+            logger.error("Erro ao executar query colunar: %s", e, extra={'query': _query_summary(query)})
+            raise
+        
+        names = [column.name for column in description]
+        type_codes = [column.type_code for column in description]
+        columns = list(zip(*rows)) if rows else [() for _ in description]
+        
+        return names, type_codes, columns
+    
+    def fetch_frame(self, query: str, params: tuple = None) -> pd.DataFrame:
+        """
+        Executa query e retorna um DataFrame montado direto das colunas
+        
+        Evita a lista intermediária de dicts: cada coluna vira um array
+        NumPy tipado pelo OID do PostgreSQL e o DataFrame é criado sem cópia.
+        
+        Args:
+            query: SQL query para executar
+            params: Parâmetros para a query
+            
+        Returns:
+            DataFrame com os resultados (vazio, com as colunas, se não houver linhas)
+        """
+        names, type_codes, columns = self._fetch_columns(query, params)
+        
+        data = {
+            name: _column_to_array(values, type_code)
+            for name, type_code, values in zip(names, type_codes, columns)
+        }
+        
+        return pd.DataFrame(data, columns=names, copy=False)
+    
+    def fetch_arrow(self, query: str, params: tuple = None):
+        """
+        Executa query e retorna uma pyarrow.Table tipada pelos OIDs do PostgreSQL
+        
+        Args:
+            query: SQL query para executar
+            params: Parâmetros para a query
+            
+        Returns:
+            pyarrow.Table com os resultados
+        """
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise RuntimeError("fetch_arrow requer o pacote 'pyarrow'") from e
+        
+        names, type_codes, columns = self._fetch_columns(query, params)
+        
+        arrays = []
+        for type_code, values in zip(type_codes, columns):
+            if type_code in PG_FLOAT_OIDS:
+                # numeric chega como Decimal
+                values = [None if value is None else float(value) for value in values]
+            arrays.append(pa.array(values, type=_arrow_type(type_code)))
+        
+        return pa.Table.from_arrays(arrays, names=names)
+    
+    def execute_ddl(self, query: str, params: Tuple = None, autocommit: bool = False) -> bool:
         """
         Executa comandos DDL (CREATE, ALTER, DROP, etc.)
         
         Args:
             query: SQL DDL command
             params: Parâmetros para a query
+            autocommit: Executa fora de transação (necessário para CONCURRENTLY)
             
         Returns:
             True se executado com sucesso, False caso contrário
         """
         try:
             with self.get_connection() as conn:
+                conn.autocommit = autocommit
                 with conn.cursor() as cursor:
                     cursor.execute(query, params)
                     conn.commit()
                     return True
                     
         except Exception as e:
-            logger.error(f"Erro ao executar DDL: {e}")
-            logger.error(f"Query: {query}")
+            logger.error("Erro ao executar DDL: %s", e, extra={'query': _query_summary(query)})
             return False
 
-    # =====================================================
-    # OPERAÇÕES ESPECÍFICAS PARA IMAGENS DE TORNEIO
-    # =====================================================
-    
-    def get_tournament_images(self, 
-                            category: Optional[str] = None,
-                            active_only: bool = False,
-                            approved_only: bool = False,
-                            search_term: Optional[str] = None,
-                            limit: int = 50,
-                            offset: int = 0) -> List[Dict]:
-        """Busca imagens de torneio com filtros opcionais"""
+    def _build_image_filters(self,
+                             category: Optional[str] = None,
+                             active_only: bool = False,
+                             approved_only: bool = False,
+                             search_term: Optional[str] = None,
+                             start_date: Optional[datetime] = None,
+                             end_date: Optional[datetime] = None) -> Tuple[str, List]:
+        """
+        Monta cláusula WHERE para os filtros de imagens de torneio
         
+        Args:
+            category: Categoria das imagens
+            active_only: Apenas imagens ativas
+            approved_only: Apenas imagens aprovadas
+            search_term: Termo de busca em nome, texto alternativo ou tags
+            start_date: Data inicial (inclusiva) do upload
+            end_date: Data final (exclusiva) do upload
+            
+        Returns:
+            Tuple (cláusula WHERE, lista de parâmetros)
+        """
         conditions = []
         params = []
-        param_count = 0
         
         if category:
             conditions.append("category = %s")
@@ -187,17 +557,223 @@ class DatabaseManager:
             search_pattern = f"%{search_term}%"
             params.extend([search_pattern, search_pattern, search_term])
         
+        if start_date:
+            conditions.append("uploaded_at >= %s")
+            params.append(start_date)
+        
+        if end_date:
+            conditions.append("uploaded_at < %s")
+            params.append(end_date)
+        
         where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
+        return where_clause, params
+    
+    def copy_to(self, query: str, output: BinaryIO, params: tuple = None,
+                options: str = "(FORMAT csv, HEADER)") -> int:
+        """
+        Executa COPY (query) TO STDOUT escrevendo direto no arquivo de saída
+        
+        O servidor formata as linhas e o psycopg2 repassa cada bloco recebido
+        para output.write, então o uso de memória não depende do tamanho do resultado.
+        
+        Args:
+            query: SQL SELECT a ser exportado
+            output: Arquivo binário de destino
+            params: Parâmetros para a query
+            options: Opções do COPY (formato, cabeçalho, etc.)
+            
+        Returns:
+            Número de linhas copiadas
+        """
+        try:
+            with self.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    select_sql = cursor.mogrify(query, params)
+                    copy_sql = b"COPY (" + select_sql + b") TO STDOUT WITH " + options.encode()
+                    cursor.copy_expert(copy_sql, output)
+                    return cursor.rowcount
+                    
+        except Exception as e:
+            logger.error("Erro ao executar COPY: %s", e, extra={'query': _query_summary(query)})
+            raise
+
+    def get_table_columns(self, table: str) -> List[str]:
+        """
+        Retorna as colunas de uma tabela (cache 'schema')
+        
+        Args:
+            table: Nome da tabela
+            
+        Returns:
+            Lista com os nomes das colunas
+        """
+        def load():
+            rows = self.execute_query(
+                "SELECT column_name FROM information_schema.columns WHERE table_name = %s",
+                (table,)
+            )
+            return [row['column_name'] for row in rows]
+        
+        return self.schema_cache.get_or_set(table, load)
+    
+    def status_sql(self) -> str:
+        """
+        Expressão SQL do status da imagem
+        
+        Returns:
+            'status' se a coluna gerada existir, senão o CASE equivalente
+        """
+        if 'status' in self.get_table_columns('tournament_images'):
+            return "status"
+        return f"({IMAGE_STATUS_SQL.strip()})"
+    
+    def fetch_all_cached(self, query: str, params: tuple = None) -> List[Dict]:
+        """
+        fetch_all com cache de resultados (cache 'queries')
+        
+        As linhas em cache são compartilhadas entre sessões; o chamador
+        recebe cópias, que pode reordenar e alterar livremente.
+        """
+        key = (query, tuple(params) if params else None)
+        return [dict(row) for row in self.query_cache.get_or_set(key, lambda: self.execute_query(query, params))]
+    
+    def invalidate_image_caches(self) -> None:
+        """
+        Descarta resultados e agregados após alterações em tournament_images
+        
+        A limpeza é propagada às demais réplicas (NOTIFY do registro de caches).
+        """
+        get_cache_registry().flush(['queries', 'rollups', 'counts'])
+    
+    # =====================================================
+    # CONTAGENS (EXATAS OU ESTIMADAS)
+    # =====================================================
+    
+    def estimate_table_rows(self, table: str = 'tournament_images') -> int:
+        """
+        Linhas estimadas pelo planner (pg_class.reltuples)
+        
+        Returns:
+            Estimativa ou -1 se a tabela nunca foi analisada
+        """
+        row = self.fetch_one(
+            "SELECT reltuples::bigint AS estimate FROM pg_class WHERE oid = %s::regclass",
+            (table,)
+        )
+        estimate = row['estimate'] if row else -1
+        # Antes do PostgreSQL 14, 0 também significa "nunca analisada"
+        return estimate if estimate > 0 else -1
+    
+    def estimate_count(self, where_clause: str = "", params: tuple = None,
+                       table: str = 'tournament_images') -> int:
+        """
+        Estimativa de COUNT(*) sem percorrer a tabela
+        
+        Sem filtro usa reltuples; com filtro usa as linhas previstas pelo
+        EXPLAIN, que dependem das estatísticas do ANALYZE.
+        """
+        if not where_clause:
+            estimate = self.estimate_table_rows(table)
+            if estimate >= 0:
+                return estimate
+        
+        rows = self.execute_query(
+            f"EXPLAIN (FORMAT JSON) SELECT 1 FROM {table} {where_clause}",
+            params
+        )
+        plan = rows[0]['QUERY PLAN']
+        return int(plan[0]['Plan']['Plan Rows'])
+    
+    def _use_estimates(self, table: str) -> bool:
+        """Decide pelo COUNT_CONFIG['mode'] se contagens usam estimativas"""
+        mode = COUNT_CONFIG['mode']
+        if mode == 'auto':
+            return self.estimate_table_rows(table) >= COUNT_CONFIG['approximate_threshold']
+        return mode == 'approximate'
+    
+    def _exact_count(self, table: str, where_clause: str, params: tuple) -> int:
+        row = self.fetch_one(f"SELECT COUNT(*) AS count FROM {table} {where_clause}", params)
+        return row['count'] if row else 0
+    
+    def count_rows(self, where_clause: str = "", params: tuple = None,
+                   table: str = 'tournament_images') -> Dict:
+        """
+        COUNT(*) exato ou estimado, conforme COUNT_CONFIG
+        
+        No modo aproximado retorna a estimativa na hora e agenda a contagem
+        exata em segundo plano; quando ela termina, o valor exato fica no
+        cache 'counts' e os agregados em cache são descartados para que a
+        próxima leitura já o use.
+        
+        Args:
+            where_clause: Cláusula WHERE (com "WHERE") ou vazio
+            params: Parâmetros da cláusula
+            table: Tabela contada
+            
+        Returns:
+            Dict com 'value' e 'approximate' (True se for estimativa)
+        """
+        key = (table, where_clause, tuple(params) if params else None)
+        
+        exact = self.count_cache.get(key)
+        if exact is not None:
+            return {'value': exact, 'approximate': False}
+        
+        if not self._use_estimates(table):
+            exact = self._exact_count(table, where_clause, params)
+            self.count_cache.set(key, exact)
+            return {'value': exact, 'approximate': False}
+        
+        self._schedule_exact_count(key)
+        return {'value': self.estimate_count(where_clause, params, table), 'approximate': True}
+    
+    def _schedule_exact_count(self, key: tuple) -> None:
+        """Agenda uma recontagem exata (uma por chave por vez)"""
+        with self._recounts_lock:
+            if key in self._recounts_in_flight:
+                return
+            self._recounts_in_flight.add(key)
+        
+        self._recount_executor.submit(self._run_exact_count, key)
+    
+    def _run_exact_count(self, key: tuple) -> None:
+        table, where_clause, params = key
+        try:
+            self.count_cache.set(key, self._exact_count(table, where_clause, params))
+            self.rollup_cache.clear()
+        except Exception as e:
+            logger.error("Erro na recontagem exata de %s: %s", table, e)
+        finally:
+            with self._recounts_lock:
+                self._recounts_in_flight.discard(key)
+    
+    # =====================================================
+    # OPERAÇÕES ESPECÍFICAS PARA IMAGENS DE TORNEIO
+    # =====================================================
+    
+    def get_tournament_images(self, 
+                            category: Optional[str] = None,
+                            active_only: bool = False,
+                            approved_only: bool = False,
+                            search_term: Optional[str] = None,
+                            limit: int = 50,
+                            offset: int = 0,
+                            start_date: Optional[datetime] = None,
+                            end_date: Optional[datetime] = None) -> List[Dict]:
+        """Busca imagens de torneio com filtros opcionais"""
+        
+        where_clause, params = self._build_image_filters(
+            category=category,
+            active_only=active_only,
+            approved_only=approved_only,
+            search_term=search_term,
+            start_date=start_date,
+            end_date=end_date
+        )
         
         # Verificar colunas disponíveis
         try:
-            columns_query = """
-            SELECT column_name 
-            FROM information_schema.columns 
-            WHERE table_name = 'tournament_images'
-            """
-            columns_result = self.execute_query(columns_query)
-            available_columns = [row['column_name'] for row in columns_result]
+            available_columns = self.get_table_columns('tournament_images')
             
             # Mapear colunas reais para as esperadas pela interface
             column_mapping = {
@@ -238,7 +814,7 @@ class DatabaseManager:
             """
             
         except Exception as e:
-            logger.error(f"Erro ao verificar colunas: {e}")
+            logger.error("Erro ao verificar colunas: %s", e)
             # Fallback para query básica
             query = f"""
             SELECT 
@@ -258,7 +834,7 @@ class DatabaseManager:
         
         params.extend([limit, offset])
         
-        return self.execute_query(query, tuple(params))
+        return self.fetch_all_cached(query, tuple(params))
     
     def get_image_by_id(self, image_id: int) -> Optional[Dict]:
         """Busca uma imagem específica por ID"""
@@ -312,9 +888,10 @@ class DatabaseManager:
                     cursor.execute(query, params)
                     result = cursor.fetchone()
                     conn.commit()
+                    self.invalidate_image_caches()
                     return result[0] if result else None
         except Exception as e:
-            logger.error(f"Erro ao inserir imagem: {e}")
+            logger.error("Erro ao inserir imagem: %s", e)
             return None
     
     def update_tournament_image(self, image_id: int, updates: Dict) -> bool:
@@ -352,9 +929,10 @@ class DatabaseManager:
         
         try:
             self.execute_query(query, tuple(params), fetch=False)
+            self.invalidate_image_caches()
             return True
         except Exception as e:
-            logger.error(f"Erro ao atualizar imagem {image_id}: {e}")
+            logger.error("Erro ao atualizar imagem %s: %s", image_id, e)
             return False
     
     def delete_tournament_image(self, image_id: int, soft_delete: bool = True) -> bool:
@@ -369,24 +947,25 @@ class DatabaseManager:
         
         try:
             self.execute_query(query, (image_id,), fetch=False)
+            self.invalidate_image_caches()
             return True
         except Exception as e:
-            logger.error(f"Erro ao deletar imagem {image_id}: {e}")
+            logger.error("Erro ao deletar imagem %s: %s", image_id, e)
             return False
     
     def get_category_stats(self) -> List[Dict]:
-        """Busca estatísticas por categoria"""
-        
-        # Primeiro verificar quais colunas existem
-        columns_query = """
-        SELECT column_name 
-        FROM information_schema.columns 
-        WHERE table_name = 'tournament_images'
-        """
+        """Busca estatísticas por categoria (cache 'rollups'; cópias das linhas)"""
+        return [dict(row) for row in self.rollup_cache.get_or_set('category_stats', self._load_category_stats)]
+    
+    def _load_category_stats(self) -> List[Dict]:
+        """Calcula as estatísticas por categoria"""
         
         try:
-            columns_result = self.execute_query(columns_query)
-            available_columns = [row['column_name'] for row in columns_result]
+            # Primeiro verificar quais colunas existem
+            available_columns = self.get_table_columns('tournament_images')
+            
+            if self.counters_available():
+                return self._load_category_stats_from_counters(available_columns)
             
             # Construir query baseada nas colunas disponíveis
             base_query = """
@@ -438,7 +1017,7 @@ class DatabaseManager:
             return self.execute_query(base_query)
             
         except Exception as e:
-            logger.error(f"Erro ao buscar estatísticas por categoria: {e}")
+            logger.error("Erro ao buscar estatísticas por categoria: %s", e)
             # Fallback para query básica
             fallback_query = """
             SELECT 
@@ -456,18 +1035,205 @@ class DatabaseManager:
             """
             return self.execute_query(fallback_query)
     
+    # =====================================================
+    # CONTADORES MANTIDOS POR TRIGGER (utils/counters.py)
+    # =====================================================
+    
+    def counters_available(self) -> bool:
+        """True se tournament_image_counters foi instalada pelo check_database.py"""
+        return bool(self.get_table_columns('tournament_image_counters'))
+    
+    def _counter_totals(self) -> Dict:
+        """Totais gerais lidos da tabela de contadores"""
+        return self.fetch_one("""
+        SELECT
+            COALESCE(SUM(image_count), 0)::bigint AS total_images,
+            COALESCE(SUM(image_count) FILTER (WHERE active), 0)::bigint AS active_images,
+            COALESCE(SUM(image_count) FILTER (WHERE approved), 0)::bigint AS approved_images,
+            COALESCE(SUM(image_count) FILTER (WHERE active AND NOT approved), 0)::bigint AS pending_approval,
+            COUNT(DISTINCT category) FILTER (WHERE image_count > 0) AS categories_count
+        FROM tournament_image_counters
+        """)
+    
+    def _load_category_stats_from_counters(self, available_columns: List[str]) -> List[Dict]:
+        """
+        Estatísticas por categoria com as contagens vindas dos contadores
+        
+        Só as contagens (total, ativas, aprovadas) saem dos contadores. As
+        métricas de uso (win_rate, views, seleções) continuam com um GROUP BY
+        category sobre tournament_images, se as colunas existirem: elas mudam
+        a cada voto, e mantê-las por trigger concentraria essas escritas em
+        uma linha por categoria. Uploads recentes usam o índice de uploaded_at.
+        """
+        queries = {
+            'counters': ("""
+            SELECT
+                category,
+                SUM(image_count)::bigint AS total_images,
+                COALESCE(SUM(image_count) FILTER (WHERE active), 0)::bigint AS active_images,
+                COALESCE(SUM(image_count) FILTER (WHERE approved), 0)::bigint AS approved_images
+            FROM tournament_image_counters
+            GROUP BY category
+            HAVING SUM(image_count) > 0
+            ORDER BY category
+            """, None)
+        }
+        
+        usage_columns = []
+        if 'win_rate' in available_columns:
+            usage_columns.append("AVG(CASE WHEN approved = true THEN win_rate ELSE NULL END) as avg_win_rate")
+        if 'total_views' in available_columns:
+            usage_columns.append("COALESCE(SUM(total_views), 0) as total_views")
+        if 'total_selections' in available_columns:
+            usage_columns.append("COALESCE(SUM(total_selections), 0) as total_selections")
+        
+        # Varre tournament_images inteira; não vem dos contadores
+        if usage_columns:
+            queries['usage'] = (
+                f"SELECT category, {', '.join(usage_columns)} FROM tournament_images GROUP BY category",
+                None
+            )
+        if 'uploaded_at' in available_columns:
+            queries['recent'] = ("""
+            SELECT category, COUNT(*) as recent_uploads
+            FROM tournament_images
+            WHERE uploaded_at > NOW() - INTERVAL '7 days'
+            GROUP BY category
+            """, None)
+        
+        # As três leituras são independentes
+        results = self.run_parallel(queries)
+        if results['counters']['error']:
+            raise RuntimeError(results['counters']['error'])
+        
+        stats = {}
+        for row in results['counters']['rows']:
+            stats[row['category']] = {
+                **row,
+                'avg_win_rate': 0.0,
+                'total_views': 0,
+                'total_selections': 0,
+                'recent_uploads': 0,
+            }
+        
+        for name in ('usage', 'recent'):
+            if name not in results:
+                continue
+            for row in results[name]['rows']:
+                category_stats = stats.get(str(row['category']))
+                if category_stats is not None:
+                    category_stats.update({key: value for key, value in row.items() if key != 'category'})
+        
+        return list(stats.values())
+    
+    def get_dashboard_overview(self) -> Dict:
+        """
+        Carrega todos os dados da página Dashboard em uma única query
+        
+        Totais, distribuição por status, top categorias, timeline de 30 dias
+        e atividade recente saem de um CTE (referenciado várias vezes, o
+        PostgreSQL o materializa: uma leitura da tabela) com as
+        partes agregadas em JSON. O resultado fica no cache 'rollups'; os
+        DataFrames são montados a cada chamada para que a página possa
+        alterá-los sem afetar o cache.
+        
+        Returns:
+            Dict com 'totals' (dict) e DataFrames 'status', 'categories',
+            'timeline' e 'recent'
+        """
+        row = self.rollup_cache.get_or_set('dashboard_overview', self._load_dashboard_overview)
+        
+        recent = pd.DataFrame(row['recent'], columns=['id', 'title', 'category', 'status', 'upload_date', 'file_path'])
+        recent['upload_date'] = pd.to_datetime(recent['upload_date'])
+        
+        timeline = pd.DataFrame(row['timeline'], columns=['date', 'status', 'uploads'])
+        timeline['date'] = pd.to_datetime(timeline['date'])
+        
+        return {
+            'totals': dict(row['totals']),
+            'status': pd.DataFrame(row['status_counts'], columns=['status', 'count']),
+            'categories': pd.DataFrame(row['category_counts'], columns=['category', 'count']),
+            'timeline': timeline,
+            'recent': recent,
+        }
+    
+    def _load_dashboard_overview(self) -> Dict:
+        """Executa a query única da página Dashboard"""
+        status = self.status_sql()
+        query = f"""
+        WITH images AS (
+            SELECT
+                category,
+                approved,
+                active,
+                uploaded_at,
+                file_size,
+                {status} AS status
+            FROM tournament_images
+        ),
+        totals AS (
+            SELECT
+                COUNT(*) AS total,
+                COUNT(*) FILTER (WHERE approved = true) AS approved,
+                COUNT(*) FILTER (WHERE approved = false AND active = true) AS pending,
+                COUNT(*) FILTER (WHERE uploaded_at >= NOW() - INTERVAL '30 days') AS uploads_30d,
+                AVG(file_size) FILTER (WHERE file_size IS NOT NULL) AS avg_file_size
+            FROM images
+        )
+        SELECT
+            (SELECT row_to_json(totals) FROM totals) AS totals,
+            (
+                SELECT COALESCE(json_agg(s ORDER BY s.count DESC), '[]'::json)
+                FROM (SELECT status, COUNT(*) AS count FROM images GROUP BY status) s
+            ) AS status_counts,
+            (
+                SELECT COALESCE(json_agg(c ORDER BY c.count DESC), '[]'::json)
+                FROM (
+                    SELECT category, COUNT(*) AS count
+                    FROM images
+                    WHERE approved = true
+                    GROUP BY category
+                    ORDER BY count DESC
+                    LIMIT 10
+                ) c
+            ) AS category_counts,
+            (
+                SELECT COALESCE(json_agg(t ORDER BY t.date DESC), '[]'::json)
+                FROM (
+                    SELECT DATE(uploaded_at) AS date, status, COUNT(*) AS uploads
+                    FROM images
+                    WHERE uploaded_at >= NOW() - INTERVAL '30 days'
+                    GROUP BY DATE(uploaded_at), status
+                ) t
+            ) AS timeline,
+            (
+                SELECT COALESCE(json_agg(r ORDER BY r.upload_date DESC), '[]'::json)
+                FROM (
+                    SELECT
+                        id,
+                        title,
+                        category,
+                        {status} AS status,
+                        uploaded_at AS upload_date,
+                        image_url AS file_path
+                    FROM tournament_images
+                    ORDER BY uploaded_at DESC
+                    LIMIT 10
+                ) r
+            ) AS recent
+        """
+        return self.fetch_one(query)
+    
     def get_dashboard_stats(self) -> Dict:
-        """Busca estatísticas gerais para o dashboard"""
+        """Busca estatísticas gerais para o dashboard (cache 'rollups')"""
+        return dict(self.rollup_cache.get_or_set('dashboard_stats', self._load_dashboard_stats))
+    
+    def _load_dashboard_stats(self) -> Dict:
+        """Calcula as estatísticas gerais"""
         
         # Verificar colunas disponíveis primeiro
         try:
-            columns_query = """
-            SELECT column_name 
-            FROM information_schema.columns 
-            WHERE table_name = 'tournament_images'
-            """
-            columns_result = self.execute_query(columns_query)
-            available_columns = [row['column_name'] for row in columns_result]
+            available_columns = self.get_table_columns('tournament_images')
             
             # Construir queries baseadas nas colunas disponíveis
             queries = {
@@ -509,7 +1275,7 @@ class DatabaseManager:
                 queries['recent_uploads'] = "SELECT 0 as count"
                 
         except Exception as e:
-            logger.error(f"Erro ao verificar colunas: {e}")
+            logger.error("Erro ao verificar colunas: %s", e)
             # Fallback para queries básicas
             queries = {
                 'total_images': "SELECT COUNT(*) as count FROM tournament_images",
@@ -522,16 +1288,40 @@ class DatabaseManager:
                 'categories_count': "SELECT COUNT(DISTINCT category) as count FROM tournament_images"
             }
         
-        stats = {}
+        # Contadores mantidos por trigger substituem as contagens (exatos, O(1))
+        try:
+            counter_totals = self._counter_totals() if self.counters_available() else {}
+        except Exception as e:
+            logger.error("Erro ao ler contadores: %s", e)
+            counter_totals = {}
+        
+        # Chaves cujo valor é estimativa (exibidas com "≈")
+        stats = {'approximate': []}
+        parallel_queries = {}
         for key, query in queries.items():
             try:
-                result = self.execute_query(query)
-                if result:
-                    stats[key] = result[0].get('count', 0) or result[0].get('total', 0)
-                else:
-                    stats[key] = 0
+                if key in counter_totals:
+                    stats[key] = counter_totals[key]
+                    continue
+                
+                if query.startswith(_COUNT_QUERY_PREFIX):
+                    count = self.count_rows(query[len(_COUNT_QUERY_PREFIX):].strip())
+                    stats[key] = count['value']
+                    if count['approximate']:
+                        stats['approximate'].append(key)
+                    continue
+                
+                parallel_queries[key] = (query, None)
             except Exception as e:
-                logger.error(f"Erro ao buscar estatística {key}: {e}")
+                logger.error("Erro ao buscar estatística %s: %s", key, e)
+                stats[key] = 0
+        
+        # Somas e contagens distintas restantes são independentes entre si
+        for key, result in self.run_parallel(parallel_queries).items():
+            rows = result['rows']
+            if rows:
+                stats[key] = rows[0].get('count', 0) or rows[0].get('total', 0)
+            else:
                 stats[key] = 0
         
         return stats
@@ -540,12 +1330,9 @@ class DatabaseManager:
         """Atualiza aprovação de múltiplas imagens em lote"""
         if not image_ids:
             return True
-            
-        placeholders = ','.join(['%s' for _ in range(len(image_ids))])
-        params = list(image_ids)
         
         set_clause = "approved = %s"
-        params.append(approved)
+        params = [approved]
         
         if approved_by:
             set_clause += ", approved_by = %s"
@@ -554,18 +1341,148 @@ class DatabaseManager:
         if approved:
             set_clause += ", approved_at = NOW()"
         
+        params.append(list(image_ids))
+        
         query = f"""
         UPDATE tournament_images 
         SET {set_clause}, updated_at = NOW()
-        WHERE id IN ({placeholders})
+        WHERE id = ANY(%s)
         """
         
         try:
             self.execute_query(query, tuple(params), fetch=False)
+            self.invalidate_image_caches()
             return True
         except Exception as e:
-            logger.error(f"Erro no update em lote: {e}")
+            logger.error("Erro no update em lote: %s", e)
             return False
+    
+    # =====================================================
+    # FILA DE REVISÃO (MODERAÇÃO)
+    # =====================================================
+    
+    def claim_review_batch(self, moderator: str, limit: int = 10, lease_minutes: int = 15) -> List[Dict]:
+        """
+        Reserva as próximas imagens pendentes para um moderador
+        
+        Usa FOR UPDATE SKIP LOCKED para que moderadores concorrentes nunca
+        recebam a mesma imagem. Reservas expiradas (lease_minutes) voltam
+        para a fila.
+        
+        Args:
+            moderator: Usuário que está revisando
+            limit: Quantidade de imagens a reservar
+            lease_minutes: Validade da reserva em minutos
+            
+        Returns:
+            Lista de imagens reservadas, da mais antiga para a mais recente
+        """
+        query = """
+        WITH next_batch AS (
+            SELECT id
+            FROM tournament_images
+            WHERE approved = false AND active = true
+              AND (review_claimed_at IS NULL
+                   OR review_claimed_at < NOW() - %s * INTERVAL '1 minute')
+            ORDER BY uploaded_at, id
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+        )
+        UPDATE tournament_images t
+        SET review_claimed_by = %s, review_claimed_at = NOW()
+        FROM next_batch
+        WHERE t.id = next_batch.id
+        RETURNING 
+            t.id, t.category, t.image_url, NULL as thumbnail_url,
+            t.image_name as title, t.alt_text as description,
+            COALESCE(t.tags, ARRAY[]::text[]) as tags,
+            t.uploaded_at as upload_date, t.file_size, t.image_width, t.image_height
+        """
+        
+        try:
+            with self.get_connection() as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                    cursor.execute(query, (lease_minutes, limit, moderator))
+                    claimed = cursor.fetchall()
+                    conn.commit()
+        except Exception as e:
+            logger.error("Erro ao reservar lote de revisão: %s", e)
+            raise
+        
+        # UPDATE ... RETURNING não garante ordem
+        return sorted(claimed, key=lambda row: (row['upload_date'] is None, row['upload_date'], row['id']))
+    
+    def release_review_claims(self, moderator: str, image_ids: Optional[List[int]] = None) -> bool:
+        """
+        Libera reservas de revisão de um moderador
+        
+        Args:
+            moderator: Usuário dono das reservas
+            image_ids: IDs a liberar (todas as reservas do moderador se None)
+            
+        Returns:
+            True se sucesso
+        """
+        query = """
+        UPDATE tournament_images
+        SET review_claimed_by = NULL, review_claimed_at = NULL
+        WHERE review_claimed_by = %s
+        """
+        params = [moderator]
+        
+        if image_ids is not None:
+            if not image_ids:
+                return True
+            query += " AND id = ANY(%s)"
+            params.append(list(image_ids))
+        
+        try:
+            self.execute_query(query, tuple(params), fetch=False)
+            return True
+        except Exception as e:
+            logger.error("Erro ao liberar reservas de revisão: %s", e)
+            return False
+    
+    def apply_review_decisions(self, decisions: Dict[int, bool], moderator: str,
+                               moderator_id: Optional[int] = None) -> int:
+        """
+        Grava decisões de revisão em um único UPDATE
+        
+        Aprovadas ficam approved = true, com approved_by/approved_at como em
+        bulk_update_approval; rejeitadas ficam inativas e saem da fila.
+        Apenas imagens ainda reservadas pelo moderador são alteradas.
+        
+        Args:
+            decisions: Dict {image_id: aprovada}
+            moderator: Usuário dono das reservas (review_claimed_by)
+            moderator_id: ID do usuário gravado em approved_by (opcional)
+            
+        Returns:
+            Número de imagens atualizadas
+        """
+        if not decisions:
+            return 0
+        
+        # O moderador vai em cada linha do VALUES: nada é interpolado na query
+        values = review_decision_rows(decisions, moderator, moderator_id)
+        
+        try:
+            with self.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    execute_values(
+                        cursor,
+                        REVIEW_DECISIONS_SQL,
+                        values,
+                        template=REVIEW_DECISIONS_TEMPLATE,
+                        page_size=len(values)
+                    )
+                    updated = cursor.rowcount
+                    conn.commit()
+                    self.invalidate_image_caches()
+                    return updated
+        except Exception as e:
+            logger.error("Erro ao gravar decisões de revisão: %s", e)
+            raise
 
 # Singleton instance
 @st.cache_resource
@@ -0,0 +1,189 @@
+# utils/encoder.py - Codificação JPEG/WebP com qualidade escolhida por imagem
+import io
+import os
+import logging
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# Lado máximo das versões em tons de cinza comparadas pelo SSIM
+SSIM_SAMPLE_SIZE = 256
+SSIM_BLOCK = 8
+_SSIM_C1 = (0.01 * 255) ** 2
+_SSIM_C2 = (0.03 * 255) ** 2
+
+
+def format_for_path(path: str) -> str:
+    """Formato de saída pela extensão do arquivo (WebP ou JPEG)"""
+    return 'WEBP' if path.lower().endswith('.webp') else 'JPEG'
+
+
+def encode(img: Image.Image, fmt: str, quality: int, optimize: bool = True) -> bytes:
+    """Codifica a imagem em memória"""
+    buffer = io.BytesIO()
+    if fmt == 'WEBP':
+        # method 6 é o equivalente ao optimize do JPEG
+        img.save(buffer, 'WEBP', quality=quality, method=6 if optimize else 4)
+    else:
+        img.save(buffer, 'JPEG', quality=quality, optimize=optimize)
+    return buffer.getvalue()
+
+
+def _luma_sample(img: Image.Image, size: Tuple[int, int]) -> np.ndarray:
+    """Luminância reduzida para size, como matriz float"""
+    return np.asarray(img.convert('L').resize(size, Image.Resampling.BILINEAR), dtype=np.float64)
+
+
+def estimate_ssim(reference: np.ndarray, candidate: np.ndarray) -> float:
+    """
+    SSIM médio por blocos de SSIM_BLOCK x SSIM_BLOCK
+
+    Aproximação do SSIM gaussiano, suficiente para comparar níveis de
+    qualidade da mesma imagem.
+    """
+    block = SSIM_BLOCK
+    height = reference.shape[0] // block * block
+    width = reference.shape[1] // block * block
+    if not height or not width:
+        return 1.0
+
+    def blocks(array: np.ndarray) -> np.ndarray:
+        return array[:height, :width].reshape(height // block, block, width // block, block).swapaxes(1, 2).reshape(-1, block * block)
+
+    x = blocks(reference)
+    y = blocks(candidate)
+
+    mean_x = x.mean(axis=1)
+    mean_y = y.mean(axis=1)
+    var_x = x.var(axis=1)
+    var_y = y.var(axis=1)
+    cov = ((x - mean_x[:, None]) * (y - mean_y[:, None])).mean(axis=1)
+
+    ssim = ((2 * mean_x * mean_y + _SSIM_C1) * (2 * cov + _SSIM_C2)) / (
+        (mean_x ** 2 + mean_y ** 2 + _SSIM_C1) * (var_x + var_y + _SSIM_C2)
+    )
+    return float(ssim.mean())
+
+
+class _QualitySearch:
+    """Codificações já feitas por qualidade (cada nível é codificado uma vez)"""
+
+    def __init__(self, img: Image.Image, fmt: str):
+        self.img = img
+        self.fmt = fmt
+        self._encoded: Dict[int, bytes] = {}
+        self._ssim: Dict[int, float] = {}
+
+        scale = min(1.0, SSIM_SAMPLE_SIZE / max(img.size))
+        self._sample_size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+        self._reference: Optional[np.ndarray] = None
+
+    def size(self, quality: int) -> int:
+        if quality not in self._encoded:
+            # Sem optimize na busca; a versão final com optimize só fica menor
+            self._encoded[quality] = encode(self.img, self.fmt, quality, optimize=False)
+        return len(self._encoded[quality])
+
+    def ssim(self, quality: int) -> float:
+        if quality not in self._ssim:
+            if self._reference is None:
+                self._reference = _luma_sample(self.img, self._sample_size)
+            self.size(quality)
+            with Image.open(io.BytesIO(self._encoded[quality])) as decoded:
+                self._ssim[quality] = estimate_ssim(self._reference, _luma_sample(decoded, self._sample_size))
+        return self._ssim[quality]
+
+
+def _lowest_passing(low: int, high: int, passes) -> Optional[int]:
+    """Menor q em [low, high] com passes(q) (passes monotônica crescente)"""
+    found = None
+    while low <= high:
+        middle = (low + high) // 2
+        if passes(middle):
+            found, high = middle, middle - 1
+        else:
+            low = middle + 1
+    return found
+
+
+def choose_quality(img: Image.Image, fmt: str, target: Dict, min_quality: int, max_quality: int) -> int:
+    """
+    Escolhe a qualidade por bisseção
+
+    Primeiro a menor qualidade que atinge ssim_floor (imagens simples, como
+    paletas de cores, param cedo); depois, se o resultado passar de
+    max_bytes, a maior qualidade que cabe no orçamento. O orçamento
+    prevalece sobre o piso de SSIM.
+
+    Args:
+        img: Imagem preparada
+        fmt: 'JPEG' ou 'WEBP'
+        target: Dict com 'max_bytes' e/ou 'ssim_floor' (None desativa)
+        min_quality: Limite inferior da busca
+        max_quality: Limite superior da busca
+
+    Returns:
+        Qualidade escolhida
+    """
+    search = _QualitySearch(img, fmt)
+    quality = max_quality
+
+    if target.get('ssim_floor'):
+        quality = _lowest_passing(
+            min_quality, max_quality, lambda q: search.ssim(q) >= target['ssim_floor']
+        ) or max_quality
+
+    max_bytes = target.get('max_bytes')
+    if max_bytes and search.size(quality) > max_bytes:
+        # Maior qualidade dentro do orçamento = menor q cujo sucessor estoura
+        over = _lowest_passing(min_quality, quality, lambda q: search.size(q) > max_bytes)
+        quality = max(min_quality, over - 1) if over is not None else quality
+
+    return quality
+
+
+def encode_rendition(img: Image.Image, fmt: str, quality: int, encoding: Optional[Dict] = None,
+                     rendition: str = 'main') -> Tuple[bytes, int]:
+    """
+    Codifica em memória com qualidade fixa ou adaptativa
+
+    Returns:
+        Tuple (bytes codificados, qualidade usada)
+    """
+    if encoding and encoding.get('mode') == 'adaptive':
+        quality = choose_quality(
+            img, fmt, encoding[rendition], encoding['min_quality'], encoding['max_quality']
+        )
+
+    return encode(img, fmt, quality), quality
+
+
+def save_rendition(img: Image.Image, path: str, quality: int, encoding: Optional[Dict] = None,
+                   rendition: str = 'main') -> Tuple[int, int]:
+    """
+    Codifica e grava de forma atômica (arquivo temporário + rename)
+
+    Leitores nunca veem um arquivo pela metade, o que permite regravar
+    imagens em uso. Função pura: segura para uso em pools de processos.
+
+    Args:
+        img: Imagem preparada
+        path: Destino (.webp grava WebP, demais extensões JPEG)
+        quality: Qualidade fixa (modo 'fixed')
+        encoding: UPLOAD_CONFIG['encoding']
+        rendition: Chave do alvo em encoding ('main' ou 'thumbnail')
+
+    Returns:
+        Tuple (bytes gravados, qualidade usada)
+    """
+    data, quality = encode_rendition(img, format_for_path(path), quality, encoding, rendition)
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+    return len(data), quality
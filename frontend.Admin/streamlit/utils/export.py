@@ -0,0 +1,195 @@
+# utils/export.py - Exportação em streaming do catálogo de imagens
+import os
+import logging
+from datetime import datetime
+from typing import Dict, Optional, BinaryIO
+import sys
+
+# Adicionar o diretório parent ao path para importar config
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import EXPORT_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Colunas do CSV já formatadas pelo PostgreSQL (sem apply por linha no pandas)
+CSV_COLUMNS = """
+    id,
+    category,
+    image_name AS title,
+    alt_text AS description,
+    array_to_string(COALESCE(tags, ARRAY[]::text[]), ', ') AS tags,
+    COALESCE(active, true) AS active,
+    COALESCE(approved, false) AS approved,
+    image_url,
+    to_char(uploaded_at, 'DD/MM/YYYY HH24:MI') AS upload_date,
+    file_size,
+    COALESCE(pg_size_pretty(file_size::bigint), 'N/A') AS file_size_formatted,
+    image_width,
+    image_height,
+    display_order
+"""
+
+# Colunas tipadas para o Parquet (mesma ordem do schema Arrow abaixo)
+PARQUET_COLUMNS = """
+    id,
+    category::text AS category,
+    image_name AS title,
+    alt_text AS description,
+    COALESCE(tags, ARRAY[]::text[]) AS tags,
+    COALESCE(active, true) AS active,
+    COALESCE(approved, false) AS approved,
+    image_url,
+    uploaded_at AS upload_date,
+    file_size,
+    image_width,
+    image_height,
+    display_order
+"""
+
+EXPORT_MIME_TYPES = {
+    'csv': 'text/csv',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+
+def _parquet_schema():
+    """Schema Arrow das colunas exportadas em Parquet"""
+    import pyarrow as pa
+
+    return pa.schema([
+        ('id', pa.int64()),
+        ('category', pa.string()),
+        ('title', pa.string()),
+        ('description', pa.string()),
+        ('tags', pa.list_(pa.string())),
+        ('active', pa.bool_()),
+        ('approved', pa.bool_()),
+        ('image_url', pa.string()),
+        ('upload_date', pa.timestamp('us')),
+        ('file_size', pa.int64()),
+        ('image_width', pa.int64()),
+        ('image_height', pa.int64()),
+        ('display_order', pa.int64()),
+    ])
+
+
+def write_catalog_csv(db, output: BinaryIO, **filters) -> int:
+    """
+    Exporta o catálogo em CSV via COPY TO STDOUT
+
+    Args:
+        db: Instância do DatabaseManager
+        output: Arquivo binário de destino
+        **filters: Filtros aceitos por DatabaseManager._build_image_filters
+
+    Returns:
+        Número de linhas exportadas
+    """
+    where_clause, params = db._build_image_filters(**filters)
+    query = f"SELECT {CSV_COLUMNS} FROM tournament_images {where_clause} ORDER BY id"
+
+    # BOM para manter compatibilidade com Excel (igual ao export_to_csv)
+    output.write(b'\xef\xbb\xbf')
+    return db.copy_to(query, output, tuple(params), options="(FORMAT csv, HEADER, ENCODING 'UTF8')")
+
+
+def write_catalog_parquet(db, output: BinaryIO, chunk_size: Optional[int] = None, **filters) -> int:
+    """
+    Exporta o catálogo em Parquet lendo lotes de um cursor nomeado no servidor
+
+    Cada lote vira um row group, então apenas chunk_size linhas ficam em memória.
+
+    Args:
+        db: Instância do DatabaseManager
+        output: Arquivo binário de destino
+        chunk_size: Linhas por lote (padrão EXPORT_CONFIG['chunk_size'])
+        **filters: Filtros aceitos por DatabaseManager._build_image_filters
+
+    Returns:
+        Número de linhas exportadas
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError("Exportação Parquet requer o pacote 'pyarrow'") from e
+
+    chunk_size = chunk_size or EXPORT_CONFIG['chunk_size']
+    schema = _parquet_schema()
+
+    where_clause, params = db._build_image_filters(**filters)
+    query = f"SELECT {PARQUET_COLUMNS} FROM tournament_images {where_clause} ORDER BY id"
+
+    total_rows = 0
+    with pq.ParquetWriter(output, schema, compression='snappy') as writer:
+        for rows in db.stream_chunks(query, tuple(params), chunk_size=chunk_size, as_dict=False):
+            columns = list(zip(*rows))
+            batch = pa.record_batch(
+                [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+                schema=schema
+            )
+            writer.write_batch(batch)
+            total_rows += len(rows)
+
+    return total_rows
+
+
+def export_catalog(db, output: BinaryIO, fmt: str = 'csv', chunk_size: Optional[int] = None, **filters) -> int:
+    """
+    Exporta o catálogo completo de imagens no formato escolhido
+
+    Args:
+        db: Instância do DatabaseManager
+        output: Arquivo binário de destino
+        fmt: 'csv' ou 'parquet'
+        chunk_size: Linhas por lote (apenas Parquet)
+        **filters: Filtros de categoria, status, busca e período
+
+    Returns:
+        Número de linhas exportadas
+    """
+    if fmt == 'csv':
+        return write_catalog_csv(db, output, **filters)
+    elif fmt == 'parquet':
+        return write_catalog_parquet(db, output, chunk_size=chunk_size, **filters)
+
+    raise ValueError(f"Formato de exportação não suportado: {fmt}")
+
+
+def export_catalog_to_file(db, fmt: str = 'csv', **filters) -> Dict:
+    """
+    Exporta o catálogo para um arquivo no diretório de exportações
+
+    Args:
+        db: Instância do DatabaseManager
+        fmt: 'csv' ou 'parquet'
+        **filters: Filtros de categoria, status, busca e período
+
+    Returns:
+        Dict com caminho, nome do arquivo, linhas e tamanho
+    """
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    filename = f"catalogo_matchit_{timestamp}.{fmt}"
+    path = os.path.join(EXPORT_CONFIG['path'], filename)
+    partial_path = f"{path}.partial"
+
+    try:
+        with open(partial_path, 'wb') as output:
+            rows = export_catalog(db, output, fmt=fmt, **filters)
+        os.replace(partial_path, path)
+    except Exception:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+
+    logger.info("Catálogo exportado: %s (%s linhas)", filename, rows)
+
+    return {
+        'path': path,
+        'filename': filename,
+        'format': fmt,
+        'mime_type': EXPORT_MIME_TYPES[fmt],
+        'rows': rows,
+        'file_size': os.path.getsize(path),
+        'exported_at': datetime.now().isoformat()
+    }
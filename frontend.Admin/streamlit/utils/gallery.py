@@ -0,0 +1,116 @@
+# utils/gallery.py - Galeria de imagens em um único elemento (st.dataframe)
+import os
+import sys
+import logging
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+import streamlit as st
+
+# Adicionar o diretório parent ao path para importar config
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import GALLERY_CONFIG
+from utils.helpers import get_category_display_info, get_image_status
+
+logger = logging.getLogger(__name__)
+
+STATUS_LABELS = {
+    'approved': '✅ Aprovada',
+    'pending': '⏳ Pendente',
+    'inactive': '❌ Rejeitada/Inativa',
+}
+
+
+def gallery_frame(images: List[Dict], handler=None) -> pd.DataFrame:
+    """
+    Monta o DataFrame da galeria (uma linha por imagem, thumbnail embutido)
+
+    Args:
+        images: Lista de dicionários com dados das imagens
+        handler: ImageHandler usado para ler os thumbnails
+
+    Returns:
+        DataFrame na ordem de images
+    """
+    if handler is None:
+        from utils.image_handler import get_image_handler
+        handler = get_image_handler()
+
+    rows = []
+    for image in images:
+        category_info = get_category_display_info(image.get('category', ''))
+
+        rows.append({
+            # Deriva o thumbnail de image_url quando thumbnail_url não existe no schema
+            'Preview': handler.thumbnail_image_url(image),
+            'ID': image.get('id'),
+            'Título': image.get('title') or 'Sem título',
+            'Categoria': f"{category_info['icon']} {category_info['display_name']}",
+            'Status': STATUS_LABELS.get(get_image_status(image), get_image_status(image)),
+            'Ativa': bool(image.get('active')),
+            'Views': image.get('total_views', 0),
+            'Seleções': image.get('total_selections', 0),
+            'Win Rate': float(image.get('win_rate') or 0),
+        })
+
+    return pd.DataFrame(rows, columns=[
+        'Preview', 'ID', 'Título', 'Categoria', 'Status', 'Ativa', 'Views', 'Seleções', 'Win Rate'
+    ])
+
+
+def show_image_gallery(images: List[Dict], key: str = 'image_gallery',
+                       actions: Optional[Dict[str, Callable[[List[int]], None]]] = None,
+                       handler=None) -> List[int]:
+    """
+    Exibe as imagens em uma única tabela com rolagem virtualizada
+
+    O navegador desenha apenas as linhas visíveis, então a página inteira
+    é um só elemento em vez de dezenas de widgets por imagem. Os dados de
+    todas as linhas ainda são enviados a cada execução: listas longas
+    (milhares de linhas) só compensam com thumbnails por URL; com bytes,
+    passe uma página de tamanho normal. Seleção múltipla pelas linhas; cada ação vira um botão que
+    chama o callback com os ids selecionados.
+
+    Args:
+        images: Lista de dicionários com dados das imagens
+        key: Chave do elemento (mantém a seleção entre reruns)
+        actions: Dict {rótulo do botão: callback(ids)}
+        handler: ImageHandler usado para ler os thumbnails
+
+    Returns:
+        Ids das imagens selecionadas
+    """
+    if not images:
+        st.info("📷 Nenhuma imagem encontrada")
+        return []
+
+    event = st.dataframe(
+        gallery_frame(images, handler),
+        key=key,
+        on_select='rerun',
+        selection_mode='multi-row',
+        hide_index=True,
+        use_container_width=True,
+        height=GALLERY_CONFIG['height'],
+        row_height=GALLERY_CONFIG['row_height'],
+        column_config={
+            'Preview': st.column_config.ImageColumn("Preview", width="small"),
+            'ID': st.column_config.NumberColumn("ID", width="small"),
+            'Título': st.column_config.TextColumn("Título", width="large"),
+            'Ativa': st.column_config.CheckboxColumn("Ativa", width="small"),
+            'Win Rate': st.column_config.ProgressColumn("Win Rate", format="%.1f%%", min_value=0, max_value=100),
+        },
+    )
+
+    selected = [images[row]['id'] for row in event.selection.rows if row < len(images)]
+
+    if actions:
+        st.caption(f"☑️ {len(selected)} de {len(images)} imagens selecionadas")
+
+        cols = st.columns(len(actions))
+        for col, (label, callback) in zip(cols, actions.items()):
+            with col:
+                if st.button(label, key=f"{key}_{label}", disabled=not selected, use_container_width=True):
+                    callback(selected)
+
+    return selected
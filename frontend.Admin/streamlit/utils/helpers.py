@@ -120,7 +120,7 @@ def format_date(date_obj: Any) -> str:
         return dt.strftime('%d/%m/%Y às %H:%M')
         
     except Exception as e:
-        logger.error(f"Erro ao formatar data {date_obj}: {e}")
+        logger.error("Erro ao formatar data %s: %s", date_obj, e)
         return str(date_obj)
 
 def format_number(number: Any, decimal_places: int = 0) -> str:
@@ -164,7 +164,8 @@ def get_category_display_info(category: str) -> Dict:
         'description': 'Categoria personalizada'
     })
 
-def create_metric_card(title: str, value: Any, delta: Any = None, help_text: str = None):
+def create_metric_card(title: str, value: Any, delta: Any = None, help_text: str = None,
+                       approximate: bool = False):
     """
     Cria um card de métrica estilizado
     
@@ -173,9 +174,14 @@ def create_metric_card(title: str, value: Any, delta: Any = None, help_text: str
         value: Valor principal
         delta: Variação (opcional)
         help_text: Texto de ajuda (opcional)
+        approximate: Valor é estimativa (exibe "≈")
     """
     formatted_value = format_number(value) if isinstance(value, (int, float)) else str(value)
     
+    if approximate:
+        formatted_value = f"≈ {formatted_value}"
+        help_text = f"{help_text or ''} (estimativa; contagem exata em andamento)".strip()
+    
     st.metric(
         label=title,
         value=formatted_value,
@@ -214,6 +220,26 @@ def create_status_badge(status: str, status_map: Dict[str, Dict] = None) -> str:
     </span>
     """
 
+def get_image_status(image: Dict) -> str:
+    """
+    Status de uma imagem ('approved', 'pending' ou 'inactive')
+    
+    Mesma regra de IMAGE_STATUS_SQL; imagens rejeitadas ficam inativas.
+    
+    Args:
+        image: Dicionário com dados da imagem
+        
+    Returns:
+        Status da imagem
+    """
+    if image.get('status'):
+        return image['status']
+    if image.get('approved'):
+        return 'approved'
+    if image.get('active', True):
+        return 'pending'
+    return 'inactive'
+
 def show_pagination(total_items: int, items_per_page: int = None) -> Tuple[int, int]:
     """
     Exibe controles de paginação
@@ -340,6 +366,33 @@ def create_filter_sidebar(categories: List[str] = None) -> Dict:
         'search_term': search_term.strip() if search_term else None
     }
 
+def get_date_range(filters: Dict) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """
+    Converte o filtro de período da sidebar em intervalo de datas
+    
+    Args:
+        filters: Dict retornado por create_filter_sidebar
+        
+    Returns:
+        Tuple (data inicial inclusiva, data final exclusiva)
+    """
+    date_filter = filters.get('date_filter', 'Todos')
+    now = datetime.now()
+    
+    if date_filter == 'Última semana':
+        return now - timedelta(days=7), None
+    elif date_filter == 'Último mês':
+        return now - timedelta(days=30), None
+    elif date_filter == 'Últimos 3 meses':
+        return now - timedelta(days=90), None
+    elif date_filter == 'Personalizado' and filters.get('custom_dates'):
+        start_date, end_date = filters['custom_dates']
+        start = datetime.combine(start_date, datetime.min.time()) if start_date else None
+        end = datetime.combine(end_date, datetime.min.time()) + timedelta(days=1) if end_date else None
+        return start, end
+    
+    return None, None
+
 def show_confirmation_dialog(title: str, message: str, key: str) -> bool:
     """
     Exibe diálogo de confirmação
@@ -455,6 +508,7 @@ def create_stats_overview(stats: Dict) -> None:
         create_metric_card(
             "📷 Total de Imagens",
             stats.get('total_images', 0),
+            approximate='total_images' in stats.get('approximate', []),
             help_text="Total de imagens no sistema"
         )
     
@@ -462,6 +516,7 @@ def create_stats_overview(stats: Dict) -> None:
         create_metric_card(
             "✅ Aprovadas",
             stats.get('approved_images', 0),
+            approximate='approved_images' in stats.get('approximate', []),
             help_text="Imagens aprovadas para uso em torneios"
         )
     
@@ -469,6 +524,7 @@ def create_stats_overview(stats: Dict) -> None:
         create_metric_card(
             "⏳ Pendentes",
             stats.get('pending_approval', 0),
+            approximate='pending_approval' in stats.get('approximate', []),
             help_text="Imagens aguardando aprovação"
         )
     
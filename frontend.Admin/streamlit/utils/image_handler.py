@@ -1,4 +1,7 @@
 # utils/image_handler.py - Processamento e gerenciamento de imagens
+import io
+import base64
+import mimetypes
 import os
 import uuid
 from PIL import Image, ImageOps
@@ -6,15 +9,186 @@ import streamlit as st
 from typing import Dict, List, Optional, Tuple, Union
 import logging
 import hashlib
+import json
 from datetime import datetime
 import sys
+from urllib.parse import quote
 
 # Adicionar o diretório parent ao path para importar config
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-from config import UPLOAD_CONFIG, TOURNAMENT_IMAGES_PATH, THUMBNAILS_PATH, TOURNAMENT_CATEGORIES
+from config import (
+    UPLOAD_CONFIG, TOURNAMENT_IMAGES_PATH, THUMBNAILS_PATH, TOURNAMENT_CATEGORIES,
+    BASE_UPLOAD_PATH, RENDITION_URL_CONFIG
+)
+from utils.cache import get_cache
+from utils.encoder import save_rendition, encode_rendition, format_for_path
+from utils.thumbnail_store import get_thumbnail_store
 
 logger = logging.getLogger(__name__)
 
+EXIF_ORIENTATION_TAG = 0x0112
+
+
+def rendition_profile() -> Dict:
+    """Parâmetros de UPLOAD_CONFIG que determinam as imagens geradas"""
+    return {
+        'quality': UPLOAD_CONFIG['quality'],
+        'thumbnail_quality': UPLOAD_CONFIG['thumbnail_quality'],
+        'thumbnail_size': list(UPLOAD_CONFIG['thumbnail_size']),
+        'max_dimension': UPLOAD_CONFIG['max_dimension'],
+        'encoding': UPLOAD_CONFIG['encoding'],
+    }
+
+
+def profile_hash(profile: Optional[Dict] = None) -> str:
+    """Hash curto do perfil de renderização (padrão: perfil atual)"""
+    payload = json.dumps(profile or rendition_profile(), sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def prepare_image(img: Image.Image, max_dimension: Optional[int] = None) -> Image.Image:
+    """
+    Converte para RGB, aplica a orientação EXIF e reduz para max_dimension
+
+    Args:
+        img: Imagem aberta
+        max_dimension: Lado máximo (None mantém o tamanho)
+
+    Returns:
+        Imagem RGB pronta para codificação
+    """
+    # Converter para RGB se necessário (para PNG com transparência)
+    if img.mode in ('RGBA', 'LA', 'P'):
+        # Criar fundo branco
+        background = Image.new('RGB', img.size, (255, 255, 255))
+        if img.mode == 'P':
+            img = img.convert('RGBA')
+        background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
+        img = background
+    elif img.mode != 'RGB':
+        img = img.convert('RGB')
+
+    # Corrigir orientação baseada em EXIF
+    img = ImageOps.exif_transpose(img)
+
+    # Otimizar tamanho se necessário
+    if max_dimension and max(img.size) > max_dimension:
+        img.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+
+    return img
+
+
+def save_image(img: Image.Image, path: str, profile: Dict) -> Tuple[int, int]:
+    """
+    Grava a imagem principal com o perfil (qualidade fixa ou adaptativa)
+
+    Returns:
+        Tuple (bytes gravados, qualidade usada)
+    """
+    return save_rendition(img, path, profile['quality'], profile['encoding'], 'main')
+
+
+def save_thumbnail(img: Image.Image, path: str, profile: Dict) -> Tuple[int, int]:
+    """
+    Gera e grava o thumbnail a partir da imagem já preparada
+
+    Com o store de thumbnails ativo, grava no pack (substituindo um arquivo
+    avulso antigo, se houver); caso contrário em path.
+    """
+    img_thumb = img.copy()
+    img_thumb.thumbnail(tuple(profile['thumbnail_size']), Image.Resampling.LANCZOS)
+
+    store = get_thumbnail_store()
+    if store is None:
+        return save_rendition(img_thumb, path, profile['thumbnail_quality'], profile['encoding'], 'thumbnail')
+
+    data, quality = encode_rendition(
+        img_thumb, format_for_path(path), profile['thumbnail_quality'], profile['encoding'], 'thumbnail'
+    )
+    store.put(os.path.basename(path), data)
+    if os.path.exists(path):
+        os.remove(path)
+    return len(data), quality
+
+
+def _session_headers():
+    """Headers HTTP da sessão atual (vazio fora de uma execução de script)"""
+    try:
+        return st.context.headers
+    except Exception:
+        return {}
+
+
+def _public_origin() -> Optional[str]:
+    """
+    Origem (esquema + host) usada pelo navegador para acessar o admin
+
+    st.image só aceita URLs absolutas; sem public_url configurada a origem
+    vem dos headers da sessão (X-Forwarded-* definidos pelo nginx).
+    """
+    configured = RENDITION_URL_CONFIG['public_url']
+    if configured:
+        return configured.rstrip('/')
+
+    headers = _session_headers()
+    if not headers.get('Host'):
+        return None
+
+    scheme = headers.get('X-Forwarded-Proto', 'http')
+    host = headers.get('X-Forwarded-Host', headers['Host'])
+    return f"{scheme}://{host}"
+
+
+def rendition_url(path: str) -> Optional[str]:
+    """
+    URL versionada de um arquivo de BASE_UPLOAD_PATH
+
+    A versão (mtime) na query string torna a URL imutável: o navegador
+    guarda o arquivo entre reruns e sessões, e um arquivo regravado
+    ganha uma URL nova.
+
+    Args:
+        path: Caminho local da imagem ou thumbnail
+
+    Returns:
+        URL absoluta ou None (modo 'bytes', arquivo inexistente ou origem desconhecida)
+    """
+    if RENDITION_URL_CONFIG['mode'] != 'nginx':
+        return None
+
+    relative = os.path.relpath(path, BASE_UPLOAD_PATH)
+    if relative.startswith('..'):
+        return None
+
+    try:
+        version = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    base = RENDITION_URL_CONFIG['nginx_base_url'].rstrip('/')
+    if not base.startswith(('http://', 'https://')):
+        origin = _public_origin()
+        if origin is None:
+            return None
+        base = origin + base
+
+    return f"{base}/{quote(relative.replace(os.sep, '/'))}?v={version:x}"
+
+
+def renditions_by_url() -> bool:
+    """
+    Indica se os thumbnails são referenciados por URL nesta sessão
+
+    Exige o modo 'nginx' com origem conhecida e o store empacotado
+    desativado (thumbnails do store sempre vão como bytes).
+    """
+    if RENDITION_URL_CONFIG['mode'] != 'nginx' or get_thumbnail_store() is not None:
+        return False
+    if RENDITION_URL_CONFIG['nginx_base_url'].startswith(('http://', 'https://')):
+        return True
+    return _public_origin() is not None
+
+
 class ImageHandler:
     """Gerenciador de upload, processamento e validação de imagens"""
     
@@ -24,6 +198,8 @@ class ImageHandler:
         self.dimensions = UPLOAD_CONFIG['image_dimensions']
         self.thumbnail_size = UPLOAD_CONFIG['thumbnail_size']
         self.quality = UPLOAD_CONFIG['quality']
+        self.max_dimension = UPLOAD_CONFIG['max_dimension']
+        self.thumbnail_cache = get_cache('thumbnails')
         
         # Garantir que diretórios existem
         os.makedirs(TOURNAMENT_IMAGES_PATH, exist_ok=True)
@@ -33,6 +209,8 @@ class ImageHandler:
         """
         Valida arquivo enviado
         
+        Lê apenas o cabeçalho da imagem (sem decodificar os pixels).
+        
         Args:
             uploaded_file: Arquivo enviado via Streamlit file_uploader
             
@@ -42,36 +220,51 @@ class ImageHandler:
         if not uploaded_file:
             return False, "Nenhum arquivo selecionado"
         
+        error = self._check_upload(uploaded_file)
+        if error:
+            return False, error
+        
+        try:
+            with Image.open(io.BytesIO(self._read_upload(uploaded_file))) as img:
+                error = self._check_dimensions(*img.size)
+        except Exception as e:
+            return False, f"Arquivo de imagem inválido: {str(e)}"
+        
+        if error:
+            return False, error
+        
+        return True, "Arquivo válido"
+    
+    def _read_upload(self, uploaded_file) -> bytes:
+        """Conteúdo completo do upload (UploadedFile já está em memória)"""
+        if hasattr(uploaded_file, 'getvalue'):
+            return uploaded_file.getvalue()
+        uploaded_file.seek(0)
+        return uploaded_file.read()
+    
+    def _check_upload(self, uploaded_file) -> Optional[str]:
+        """Verifica tamanho e extensão; retorna a mensagem de erro ou None"""
         # Verificar tamanho
         if uploaded_file.size > self.max_file_size:
             size_mb = self.max_file_size / (1024 * 1024)
-            return False, f"Arquivo muito grande. Máximo: {size_mb:.1f}MB"
+            return f"Arquivo muito grande. Máximo: {size_mb:.1f}MB"
         
         # Verificar extensão
         file_extension = os.path.splitext(uploaded_file.name)[1].lower()
         if file_extension not in self.allowed_extensions:
-            return False, f"Formato não suportado. Use: {', '.join(self.allowed_extensions)}"
+            return f"Formato não suportado. Use: {', '.join(self.allowed_extensions)}"
         
-        # Validar se é uma imagem válida
-        try:
-            uploaded_file.seek(0)
-            with Image.open(uploaded_file) as img:
-                # Verificar dimensões mínimas
-                width, height = img.size
-                if width < self.dimensions['min_width'] or height < self.dimensions['min_height']:
-                    return False, f"Imagem muito pequena. Mínimo: {self.dimensions['min_width']}x{self.dimensions['min_height']}px"
-                
-                # Verificar dimensões máximas
-                if width > self.dimensions['max_width'] or height > self.dimensions['max_height']:
-                    return False, f"Imagem muito grande. Máximo: {self.dimensions['max_width']}x{self.dimensions['max_height']}px"
-                
-        except Exception as e:
-            return False, f"Arquivo de imagem inválido: {str(e)}"
+        return None
+    
+    def _check_dimensions(self, width: int, height: int) -> Optional[str]:
+        """Verifica dimensões mínimas e máximas; retorna a mensagem de erro ou None"""
+        if width < self.dimensions['min_width'] or height < self.dimensions['min_height']:
+            return f"Imagem muito pequena. Mínimo: {self.dimensions['min_width']}x{self.dimensions['min_height']}px"
         
-        finally:
-            uploaded_file.seek(0)
+        if width > self.dimensions['max_width'] or height > self.dimensions['max_height']:
+            return f"Imagem muito grande. Máximo: {self.dimensions['max_width']}x{self.dimensions['max_height']}px"
         
-        return True, "Arquivo válido"
+        return None
     
     def generate_filename(self, original_filename: str, category: str) -> str:
         """
@@ -94,6 +287,9 @@ class ImageHandler:
         """
         Processa imagem: redimensiona, otimiza e gera thumbnail
         
+        Não valida o arquivo; para validar e processar em uma passada use
+        ingest().
+        
         Args:
             uploaded_file: Arquivo enviado
             category: Categoria da imagem
@@ -102,74 +298,110 @@ class ImageHandler:
         Returns:
             Dict com informações do processamento
         """
-        try:
-            # Gerar nome único
-            filename = self.generate_filename(uploaded_file.name, category)
+        return self.ingest(uploaded_file, category, optimize=optimize, validate=False)
+    
+    def ingest(self, uploaded_file, category: str, optimize: bool = True, validate: bool = True) -> Dict:
+        """
+        Valida e processa um upload lendo e decodificando a imagem uma vez
+        
+        Os bytes são lidos uma vez para um buffer; tamanho, formato e
+        dimensões são verificados pelo cabeçalho e os pixels decodificados
+        uma única vez. JPEGs que serão reduzidos para max_dimension são
+        decodificados já em resolução menor (draft), o que evita
+        descompactar a imagem inteira.
+        
+        Args:
+            uploaded_file: Arquivo enviado
+            category: Categoria da imagem
+            optimize: Se deve reduzir a imagem para max_dimension
+            validate: Se deve aplicar as verificações de validate_file
             
-            # Caminhos dos arquivos
-            image_path = os.path.join(TOURNAMENT_IMAGES_PATH, filename)
-            thumbnail_filename = f"thumb_{filename}"
-            thumbnail_path = os.path.join(THUMBNAILS_PATH, thumbnail_filename)
+        Returns:
+            Dict com informações do processamento ('success' e 'error'
+            em caso de falha)
+        """
+        if validate:
+            if not uploaded_file:
+                return {'success': False, 'error': "Nenhum arquivo selecionado"}
             
-            # Processar imagem principal
-            uploaded_file.seek(0)
-            with Image.open(uploaded_file) as img:
-                # Converter para RGB se necessário (para PNG com transparência)
-                if img.mode in ('RGBA', 'LA', 'P'):
-                    # Criar fundo branco
-                    background = Image.new('RGB', img.size, (255, 255, 255))
-                    if img.mode == 'P':
-                        img = img.convert('RGBA')
-                    background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-                    img = background
-                elif img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                # Corrigir orientação baseada em EXIF
-                img = ImageOps.exif_transpose(img)
+            error = self._check_upload(uploaded_file)
+            if error:
+                return {'success': False, 'error': error}
+        
+        try:
+            data = self._read_upload(uploaded_file)
+            img = Image.open(io.BytesIO(data))
+        except Exception as e:
+            return {'success': False, 'error': f"Arquivo de imagem inválido: {str(e)}"}
+        
+        try:
+            with img:
+                if validate:
+                    error = self._check_dimensions(*img.size)
+                    if error:
+                        return {'success': False, 'error': error}
                 
-                # Obter dimensões originais
+                # Dimensões originais já com a orientação EXIF aplicada
                 original_width, original_height = img.size
+                if img.getexif().get(EXIF_ORIENTATION_TAG) in (5, 6, 7, 8):
+                    original_width, original_height = original_height, original_width
                 
-                # Otimizar tamanho se necessário
-                if optimize and (original_width > 1024 or original_height > 1024):
-                    img.thumbnail((1024, 1024), Image.Resampling.LANCZOS)
+                if optimize and img.format == 'JPEG':
+                    # Decodifica em escala 1/2, 1/4 ou 1/8, nunca abaixo do tamanho final
+                    img.draft('RGB', (self.max_dimension, self.max_dimension))
                 
-                # Salvar imagem principal
-                img.save(image_path, 'JPEG', quality=self.quality, optimize=True)
-                
-                # Gerar thumbnail
-                img_thumb = img.copy()
-                img_thumb.thumbnail(self.thumbnail_size, Image.Resampling.LANCZOS)
-                img_thumb.save(thumbnail_path, 'JPEG', quality=85, optimize=True)
-                
-                # Obter informações finais do arquivo
-                final_width, final_height = img.size
-                file_size = os.path.getsize(image_path)
-                
-                return {
-                    'success': True,
-                    'filename': filename,
-                    'image_path': image_path,
-                    'thumbnail_path': thumbnail_path,
-                    'image_url': f'/uploads/tournament-images/{filename}',
-                    'thumbnail_url': f'/uploads/tournament-images/thumbnails/{thumbnail_filename}',
-                    'original_filename': uploaded_file.name,
-                    'file_size': file_size,
-                    'image_width': final_width,
-                    'image_height': final_height,
-                    'mime_type': 'image/jpeg',
-                    'original_dimensions': (original_width, original_height),
-                    'processed_at': datetime.now().isoformat()
-                }
+                return self._save_renditions(
+                    prepare_image(img, self.max_dimension if optimize else None),
+                    uploaded_file.name,
+                    category,
+                    (original_width, original_height)
+                )
                 
         except Exception as e:
-            logger.error(f"Erro ao processar imagem: {e}")
+            logger.error("Erro ao processar imagem: %s", e)
             return {
                 'success': False,
                 'error': str(e)
             }
     
+    def _save_renditions(self, img: Image.Image, original_filename: str, category: str,
+                         original_dimensions: Tuple[int, int]) -> Dict:
+        """Grava imagem principal e thumbnail a partir da imagem já decodificada"""
+        # Gerar nome único
+        filename = self.generate_filename(original_filename, category)
+        
+        # Caminhos dos arquivos
+        image_path = os.path.join(TOURNAMENT_IMAGES_PATH, filename)
+        thumbnail_filename = f"thumb_{filename}"
+        thumbnail_path = os.path.join(THUMBNAILS_PATH, thumbnail_filename)
+        
+        profile = rendition_profile()
+        
+        # Salvar imagem principal e thumbnail
+        file_size, quality = save_image(img, image_path, profile)
+        save_thumbnail(img, thumbnail_path, profile)
+        
+        # Obter informações finais do arquivo
+        final_width, final_height = img.size
+        
+        return {
+            'success': True,
+            'filename': filename,
+            'image_path': image_path,
+            'thumbnail_path': thumbnail_path,
+            'image_url': f'/uploads/tournament-images/{filename}',
+            'thumbnail_url': f'/uploads/tournament-images/thumbnails/{thumbnail_filename}',
+            'original_filename': original_filename,
+            'file_size': file_size,
+            'image_width': final_width,
+            'image_height': final_height,
+            'mime_type': 'image/webp' if format_for_path(image_path) == 'WEBP' else 'image/jpeg',
+            'original_dimensions': original_dimensions,
+            'profile_hash': profile_hash(profile),
+            'quality': quality,
+            'processed_at': datetime.now().isoformat()
+        }
+    
     def delete_image_files(self, image_url: str, thumbnail_url: str = None) -> bool:
         """
         Remove arquivos de imagem do sistema
@@ -190,7 +422,7 @@ class ImageHandler:
                 # Remover imagem principal
                 if os.path.exists(image_path):
                     os.remove(image_path)
-                    logger.info(f"Imagem removida: {image_path}")
+                    logger.info("Imagem removida: %s", image_path)
             
             # Remover thumbnail se especificado
             if thumbnail_url:
@@ -198,16 +430,187 @@ class ImageHandler:
                     thumb_filename = os.path.basename(thumbnail_url)
                     thumb_path = os.path.join(THUMBNAILS_PATH, thumb_filename)
                     
+                    store = get_thumbnail_store()
+                    if store is not None and store.delete(thumb_filename):
+                        logger.info("Thumbnail removido do store: %s", thumb_filename)
+                    
                     if os.path.exists(thumb_path):
                         os.remove(thumb_path)
-                        logger.info(f"Thumbnail removido: {thumb_path}")
+                        logger.info("Thumbnail removido: %s", thumb_path)
             
             return True
             
         except Exception as e:
-            logger.error(f"Erro ao remover arquivos de imagem: {e}")
+            logger.error("Erro ao remover arquivos de imagem: %s", e)
             return False
     
+    def get_thumbnail_path(self, image: Dict) -> Optional[str]:
+        """
+        Resolve o caminho local do thumbnail de uma imagem
+        
+        Usa thumbnail_url quando disponível; caso contrário deriva o nome
+        a partir de image_url (thumb_<arquivo>), como em process_image.
+        
+        Args:
+            image: Dicionário com dados da imagem
+            
+        Returns:
+            Caminho do thumbnail ou None
+        """
+        if image.get('thumbnail_url'):
+            return os.path.join(THUMBNAILS_PATH, os.path.basename(image['thumbnail_url']))
+        
+        if image.get('image_url'):
+            return os.path.join(THUMBNAILS_PATH, f"thumb_{os.path.basename(image['image_url'])}")
+        
+        return None
+
+    def thumbnail_version(self, image: Dict) -> Optional[Tuple]:
+        """
+        Identificador da versão atual do thumbnail (para chaves de cache)
+        
+        Posição no store empacotado ou mtime do arquivo avulso; muda sempre
+        que o thumbnail é regravado.
+        
+        Args:
+            image: Dicionário com dados da imagem
+        
+        Returns:
+            Tupla de versão ou None se o thumbnail não existir
+        """
+        thumbnail_path = self.get_thumbnail_path(image)
+        
+        if not thumbnail_path:
+            return None
+        
+        store = get_thumbnail_store()
+        if store is not None:
+            version = store.version(os.path.basename(thumbnail_path))
+            if version is not None:
+                return ('store',) + version
+        
+        try:
+            return ('file', os.stat(thumbnail_path).st_mtime_ns)
+        except FileNotFoundError:
+            return None
+    
+    def read_thumbnail(self, image: Dict) -> Optional[bytes]:
+        """
+        Lê os bytes do thumbnail de uma imagem (st.image exige bytes)
+        
+        Args:
+            image: Dicionário com dados da imagem
+            
+        Returns:
+            Conteúdo do thumbnail ou None se não existir
+        """
+        data = self.read_thumbnail_buffer(image)
+        return data.tobytes() if isinstance(data, memoryview) else data
+    
+    def read_thumbnail_buffer(self, image: Dict) -> Optional[Union[memoryview, bytes]]:
+        """
+        Lê o thumbnail de uma imagem sem copiar os bytes do store
+        
+        Consulta o store de thumbnails (se ativo) e depois o arquivo avulso,
+        então thumbnails antigos continuam visíveis antes de reprocessados.
+        Do store vem a fatia do mmap, para consumidores de buffer (base64).
+        
+        Args:
+            image: Dicionário com dados da imagem
+            
+        Returns:
+            memoryview (store), bytes (arquivo) ou None se não existir
+        """
+        thumbnail_path = self.get_thumbnail_path(image)
+        
+        if not thumbnail_path:
+            return None
+        
+        store = get_thumbnail_store()
+        if store is not None:
+            data = store.get(os.path.basename(thumbnail_path))
+            if data is not None:
+                return data
+        
+        try:
+            # mtime na chave: thumbnails regenerados não usam bytes antigos
+            mtime = os.stat(thumbnail_path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        
+        key = (thumbnail_path, mtime)
+        data = self.thumbnail_cache.get(key)
+        if data is not None:
+            return data
+        
+        try:
+            with open(thumbnail_path, 'rb') as f:
+                data = f.read()
+        except OSError as e:
+            logger.error("Erro ao ler thumbnail %s: %s", thumbnail_path, e)
+            return None
+        
+        self.thumbnail_cache.set(key, data)
+        return data
+    
+    def _thumbnail_url(self, thumbnail_path: str) -> Optional[str]:
+        """URL servida do thumbnail (None se estiver no store ou sem URL)"""
+        store = get_thumbnail_store()
+        if store is not None and store.version(os.path.basename(thumbnail_path)) is not None:
+            return None
+        return rendition_url(thumbnail_path)
+    
+    def thumbnail_src(self, image: Dict) -> Optional[Union[str, bytes]]:
+        """
+        Fonte do thumbnail para st.image: URL servida por arquivo ou bytes
+        
+        Thumbnails no store empacotado não existem como arquivo e continuam
+        sendo enviados como bytes.
+        
+        Args:
+            image: Dicionário com dados da imagem
+            
+        Returns:
+            URL, bytes ou None se não existir
+        """
+        thumbnail_path = self.get_thumbnail_path(image)
+        
+        if not thumbnail_path:
+            return None
+        
+        url = self._thumbnail_url(thumbnail_path)
+        if url is not None:
+            return url
+        
+        return self.read_thumbnail(image)
+    
+    def thumbnail_image_url(self, image: Dict) -> Optional[str]:
+        """
+        URL do thumbnail para colunas de imagem em tabelas
+        
+        Args:
+            image: Dicionário com dados da imagem
+        
+        Returns:
+            URL servida, data:<mime>;base64,... (thumbnail só em bytes) ou None
+        """
+        thumbnail_path = self.get_thumbnail_path(image)
+        
+        if not thumbnail_path:
+            return None
+        
+        url = self._thumbnail_url(thumbnail_path)
+        if url is not None:
+            return url
+        
+        # base64 direto do buffer (fatia do mmap, sem cópia intermediária)
+        data = self.read_thumbnail_buffer(image)
+        if data is None:
+            return None
+        
+        mime_type = mimetypes.guess_type(thumbnail_path)[0] or 'image/jpeg'
+        return f"data:{mime_type};base64,{base64.b64encode(data).decode('ascii')}"
+    
     def get_image_info(self, image_path: str) -> Optional[Dict]:
         """
         Obtém informações de uma imagem existente
@@ -235,7 +638,7 @@ class ImageHandler:
                 }
                 
         except Exception as e:
-            logger.error(f"Erro ao obter informações da imagem: {e}")
+            logger.error("Erro ao obter informações da imagem: %s", e)
             return None
     
     def create_image_grid(self, images: List[Dict], columns: int = 4) -> None:
@@ -259,12 +662,10 @@ class ImageHandler:
             with col:
                 # Exibir imagem ou placeholder
                 if image.get('thumbnail_url'):
-                    # Construir caminho local para o thumbnail
-                    thumbnail_filename = os.path.basename(image['thumbnail_url'])
-                    thumbnail_path = os.path.join(THUMBNAILS_PATH, thumbnail_filename)
+                    thumbnail = self.thumbnail_src(image)
                     
-                    if os.path.exists(thumbnail_path):
-                        st.image(thumbnail_path, use_column_width=True)
+                    if thumbnail is not None:
+                        st.image(thumbnail, use_column_width=True)
                     else:
                         st.info("🖼️ Imagem não encontrada")
                 else:
@@ -295,6 +696,11 @@ class ImageHandler:
                 
                 st.caption(f"👁️ {views} | 🎯 {selections} | 🏆 {win_rate:.1f}%")
 
+@st.cache_resource
+def get_image_handler() -> ImageHandler:
+    """Retorna instância única do ImageHandler"""
+    return ImageHandler()
+
 def show_image_upload_form(category: str = None) -> Optional[Dict]:
     """
     Exibe formulário de upload de imagem
@@ -355,24 +761,15 @@ def show_image_upload_form(category: str = None) -> Optional[Dict]:
                 st.error("❌ Por favor, selecione uma imagem")
                 return None
             
-            # Validar arquivo
-            is_valid, error_msg = handler.validate_file(uploaded_file)
-            if not is_valid:
-                st.error(f"❌ {error_msg}")
-                return None
-            
             # Progress bar
             progress_bar = st.progress(0)
             status_text = st.empty()
             
-            status_text.text("📤 Fazendo upload...")
-            progress_bar.progress(25)
-            
-            # Processar imagem
+            # Validar e processar imagem (uma leitura, uma decodificação)
             status_text.text("🔄 Processando imagem...")
             progress_bar.progress(50)
             
-            result = handler.process_image(uploaded_file, selected_category)
+            result = handler.ingest(uploaded_file, selected_category)
             
             if result['success']:
                 progress_bar.progress(75)
@@ -392,6 +789,8 @@ def show_image_upload_form(category: str = None) -> Optional[Dict]:
                     'image_width': result['image_width'],
                     'image_height': result['image_height'],
                     'mime_type': result['mime_type'],
+                    'profile_hash': result['profile_hash'],
+                    'quality': result['quality'],
                     'created_by': 1  # TODO: pegar do usuário logado
                 }
                 
@@ -401,8 +800,9 @@ def show_image_upload_form(category: str = None) -> Optional[Dict]:
                 st.success(f"🎉 Imagem '{title or result['original_filename']}' enviada com sucesso!")
                 
                 # Exibir preview
-                if os.path.exists(result['thumbnail_path']):
-                    st.image(result['thumbnail_path'], caption="Preview da imagem", width=200)
+                thumbnail = handler.thumbnail_src(result)
+                if thumbnail is not None:
+                    st.image(thumbnail, caption="Preview da imagem", width=200)
                 
                 return image_data
             else:
@@ -0,0 +1,264 @@
+# utils/indexes.py - Índices exigidos pelo dashboard e manutenção
+import math
+import os
+import sys
+import logging
+from typing import Dict, List, Optional
+
+# Adicionar o diretório parent ao path para importar config
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import INDEX_CONFIG
+from utils.database import get_db_manager
+
+logger = logging.getLogger(__name__)
+
+# Índices exigidos pelos padrões de acesso do admin. As cláusulas WHERE
+# repetem os predicados gerados por DatabaseManager._build_image_filters e
+# claim_review_batch, senão o planner não usa os índices parciais.
+# id = ANY(%s) (atualizações em lote) já é atendido pela chave primária.
+REQUIRED_INDEXES = [
+    {
+        'name': 'idx_tournament_images_uploaded_at',
+        'table': 'tournament_images',
+        'definition': '(uploaded_at DESC)',
+        'purpose': 'Listagem geral ordenada por data de upload',
+    },
+    {
+        'name': 'idx_tournament_images_category_uploaded_at',
+        'table': 'tournament_images',
+        'definition': '(category, uploaded_at DESC) WHERE active = true',
+        'purpose': 'Filtro por categoria das imagens ativas',
+    },
+    {
+        'name': 'idx_tournament_images_approved_uploaded_at',
+        'table': 'tournament_images',
+        'definition': '(uploaded_at DESC) WHERE active = true AND approved = true',
+        'purpose': 'Listagem apenas de imagens aprovadas',
+    },
+    {
+        'name': 'idx_tournament_images_status_category_uploaded_at',
+        'table': 'tournament_images',
+        'definition': '(status, category, uploaded_at)',
+        'purpose': 'Quebras por status (index-only scan na coluna gerada)',
+        'requires_column': 'status',
+    },
+    {
+        'name': 'idx_tournament_images_pending_review',
+        'table': 'tournament_images',
+        'definition': '(uploaded_at, id) WHERE approved = false AND active = true',
+        'purpose': 'Fila de revisão (imagens pendentes)',
+    },
+]
+
+INDEX_STATS_QUERY = """
+SELECT
+    s.indexrelname AS index_name,
+    s.relname AS table_name,
+    s.idx_scan,
+    s.idx_tup_read,
+    pg_relation_size(s.indexrelid) AS size_bytes,
+    c.reltuples,
+    i.indisvalid AS is_valid,
+    i.indisprimary AS is_primary,
+    i.indisunique AS is_unique,
+    pg_get_indexdef(s.indexrelid) AS definition,
+    COALESCE((
+        SELECT SUM(st.avg_width)
+        FROM pg_attribute a
+        JOIN pg_stats st
+          ON st.schemaname = s.schemaname
+         AND st.tablename = s.relname
+         AND st.attname = a.attname
+        WHERE a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+    ), 0) AS key_width
+FROM pg_stat_user_indexes s
+JOIN pg_index i ON i.indexrelid = s.indexrelid
+JOIN pg_class c ON c.oid = s.indexrelid
+WHERE s.relname = ANY(%s)
+ORDER BY s.relname, s.indexrelname
+"""
+
+# Cabeçalho da tupla de índice (8) + ponteiro de linha (4)
+_INDEX_TUPLE_OVERHEAD = 12
+_BLOCK_SIZE = 8192
+
+
+def _estimate_bloat(size_bytes: int, reltuples: float, key_width: float) -> float:
+    """
+    Estima a fração desperdiçada de um índice B-tree
+
+    Compara o tamanho real com o esperado para reltuples entradas de
+    key_width bytes com o fillfactor padrão. É uma estimativa (sem
+    pgstattuple), útil para ordenar candidatos a REINDEX.
+    """
+    if size_bytes <= _BLOCK_SIZE or reltuples <= 0:
+        return 0.0
+
+    tuple_size = math.ceil((key_width + _INDEX_TUPLE_OVERHEAD) / 8) * 8
+    usable = _BLOCK_SIZE * INDEX_CONFIG['fillfactor'] / 100
+    # +1 pela página de metadados
+    expected_bytes = (math.ceil(reltuples * tuple_size / usable) + 1) * _BLOCK_SIZE
+
+    return max(0.0, 1 - expected_bytes / size_bytes)
+
+
+def get_index_status(db=None) -> List[Dict]:
+    """
+    Situação de todos os índices das tabelas monitoradas
+
+    Returns:
+        Lista de dicts com uso (pg_stat_user_indexes), tamanho, bloat
+        estimado e se o índice é exigido/válido
+    """
+    db = db or get_db_manager()
+    required = {index['name']: index for index in REQUIRED_INDEXES}
+    tables = sorted({index['table'] for index in REQUIRED_INDEXES})
+
+    rows = db.execute_query(INDEX_STATS_QUERY, (tables,))
+    status = []
+
+    for row in rows:
+        bloat_ratio = _estimate_bloat(row['size_bytes'], row['reltuples'], float(row['key_width']))
+        status.append({
+            'index_name': row['index_name'],
+            'table_name': row['table_name'],
+            'required': row['index_name'] in required,
+            'is_valid': row['is_valid'],
+            'is_primary': row['is_primary'],
+            'scans': row['idx_scan'],
+            'tuples_read': row['idx_tup_read'],
+            'size_bytes': row['size_bytes'],
+            'bloat_ratio': bloat_ratio,
+            'bloated': (
+                bloat_ratio >= INDEX_CONFIG['bloat_ratio_threshold']
+                and row['size_bytes'] >= INDEX_CONFIG['bloat_min_size_bytes']
+            ),
+            'definition': row['definition'],
+        })
+
+    return status
+
+
+def get_missing_indexes(db=None) -> List[Dict]:
+    """
+    Índices exigidos que não existem ou ficaram inválidos
+
+    Índices sobre colunas opcionais (requires_column) só entram depois
+    que check_database.py cria a coluna.
+    """
+    db = db or get_db_manager()
+    valid = {row['index_name'] for row in get_index_status(db) if row['is_valid']}
+    missing = []
+
+    for index in REQUIRED_INDEXES:
+        if index['name'] in valid:
+            continue
+        required_column = index.get('requires_column')
+        if required_column and required_column not in db.get_table_columns(index['table']):
+            continue
+        missing.append(index)
+
+    return missing
+
+
+def create_missing_indexes(job=None, db=None) -> Dict:
+    """
+    Cria os índices exigidos com CREATE INDEX CONCURRENTLY
+
+    Um CONCURRENTLY interrompido deixa um índice inválido com o mesmo
+    nome; ele é removido (DROP INDEX CONCURRENTLY) antes de recriar.
+
+    Args:
+        job: JobContext opcional para progresso e cancelamento
+        db: DatabaseManager (padrão: instância compartilhada)
+
+    Returns:
+        Dict com índices criados e falhas
+    """
+    db = db or get_db_manager()
+    existing = {row['index_name']: row for row in get_index_status(db)}
+    missing = get_missing_indexes(db)
+    summary = {'created': [], 'failed': []}
+
+    for position, index in enumerate(missing):
+        if job is not None:
+            job.check_cancelled()
+            job.update(position, len(missing), f"Criando {index['name']}...", force=True)
+
+        if index['name'] in existing:
+            db.execute_ddl(f"DROP INDEX CONCURRENTLY IF EXISTS {index['name']}", autocommit=True)
+
+        ddl = (
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index['name']} "
+            f"ON {index['table']} {index['definition']}"
+        )
+        if db.execute_ddl(ddl, autocommit=True):
+            summary['created'].append(index['name'])
+            logger.info("Índice criado: %s", index['name'])
+        else:
+            summary['failed'].append(index['name'])
+
+    if job is not None:
+        job.update(len(missing), len(missing), f"{len(summary['created'])} índices criados", force=True)
+
+    if summary['failed']:
+        raise RuntimeError(f"Falha ao criar índices: {', '.join(summary['failed'])}")
+
+    return summary
+
+
+def reindex(job=None, index_names: Optional[List[str]] = None, db=None) -> Dict:
+    """
+    Recria índices com REINDEX INDEX CONCURRENTLY
+
+    Sem index_names, recria apenas os índices com bloat acima do limite.
+    Em servidores anteriores ao PostgreSQL 12 usa REINDEX simples.
+
+    Args:
+        job: JobContext opcional para progresso e cancelamento
+        index_names: Índices a recriar
+        db: DatabaseManager (padrão: instância compartilhada)
+
+    Returns:
+        Dict com índices recriados, falhas e bytes antes/depois
+    """
+    db = db or get_db_manager()
+    status = {row['index_name']: row for row in get_index_status(db)}
+
+    if index_names is None:
+        index_names = [name for name, row in status.items() if row['bloated']]
+
+    with db.get_connection() as conn:
+        concurrently = "CONCURRENTLY " if conn.server_version >= 120000 else ""
+
+    summary = {'reindexed': [], 'failed': [], 'bytes_before': 0, 'bytes_after': 0}
+
+    for position, name in enumerate(index_names):
+        if name not in status:
+            continue
+
+        if job is not None:
+            job.check_cancelled()
+            job.update(position, len(index_names), f"Recriando {name}...", force=True)
+
+        if db.execute_ddl(f"REINDEX INDEX {concurrently}{name}", autocommit=True):
+            summary['reindexed'].append(name)
+            summary['bytes_before'] += status[name]['size_bytes']
+        else:
+            summary['failed'].append(name)
+
+    after = {row['index_name']: row for row in get_index_status(db)}
+    summary['bytes_after'] = sum(after[name]['size_bytes'] for name in summary['reindexed'] if name in after)
+
+    if job is not None:
+        job.update(len(index_names), len(index_names), f"{len(summary['reindexed'])} índices recriados", force=True)
+
+    logger.info(
+        "REINDEX concluído: %s índices, %s -> %s bytes",
+        len(summary['reindexed']), summary['bytes_before'], summary['bytes_after']
+    )
+
+    if summary['failed']:
+        raise RuntimeError(f"Falha ao recriar índices: {', '.join(summary['failed'])}")
+
+    return summary
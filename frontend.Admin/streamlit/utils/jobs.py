@@ -0,0 +1,500 @@
+# utils/jobs.py - Execução de tarefas administrativas em segundo plano
+import json
+import os
+import socket
+import sys
+import threading
+import time
+import uuid
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import streamlit as st
+
+# Adicionar o diretório parent ao path para importar config
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import JOBS_CONFIG
+from utils.database import get_db_manager
+from utils.logging_setup import bind_request_context
+
+logger = logging.getLogger(__name__)
+
+JOBS_TABLE_DDL = """
+CREATE TABLE IF NOT EXISTS admin_jobs (
+    id SERIAL PRIMARY KEY,
+    kind VARCHAR(50) NOT NULL,
+    label VARCHAR(255) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT,
+    result JSONB,
+    error TEXT,
+    cancel_requested BOOLEAN NOT NULL DEFAULT false,
+    worker VARCHAR(255),
+    created_by VARCHAR(100),
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP,
+    heartbeat_at TIMESTAMP
+);
+ALTER TABLE admin_jobs ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMP;
+CREATE INDEX IF NOT EXISTS idx_admin_jobs_created_at ON admin_jobs (created_at DESC);
+"""
+
+# No máximo uma tarefa ativa por tipo, garantido pelo banco (submit usa
+# ON CONFLICT DO NOTHING). Criado depois de encerrar tarefas interrompidas.
+JOBS_ACTIVE_INDEX_DDL = """
+CREATE UNIQUE INDEX IF NOT EXISTS idx_admin_jobs_active_kind
+ON admin_jobs (kind) WHERE status IN ('queued', 'running');
+"""
+
+# Distingue este processo de um anterior com o mesmo PID (ex.: PID 1 em containers)
+_PROCESS_TOKEN = uuid.uuid4().hex[:8]
+
+JOB_STATUS_LABELS = {
+    'queued': '🕒 Na fila',
+    'running': '⚙️ Executando',
+    'succeeded': '✅ Concluída',
+    'failed': '❌ Falhou',
+    'cancelled': '⏹️ Cancelada',
+}
+
+ACTIVE_STATUSES = ('queued', 'running')
+
+
+class JobCancelled(Exception):
+    """Levantada dentro de uma tarefa quando o cancelamento foi solicitado"""
+
+
+class JobContext:
+    """
+    Contexto entregue à função da tarefa
+
+    Permite reportar progresso e verificar cancelamento. As gravações de
+    progresso no banco são limitadas a uma a cada progress_interval segundos;
+    a mesma gravação renova o heartbeat e lê o pedido de cancelamento
+    persistido, então um cancelamento feito por outra réplica também é percebido.
+    """
+
+    def __init__(self, manager: 'JobManager', job_id: int, cancel_event: threading.Event):
+        self.manager = manager
+        self.job_id = job_id
+        self._cancel_event = cancel_event
+        self._last_write = 0.0
+        self.progress = 0.0
+        self.message = ''
+
+    @property
+    def cancelled(self) -> bool:
+        """True se o cancelamento foi solicitado"""
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self) -> None:
+        """Interrompe a tarefa se o cancelamento foi solicitado"""
+        if self.cancelled:
+            raise JobCancelled()
+
+    def update(self, done: Optional[float] = None, total: Optional[float] = None,
+               message: Optional[str] = None, force: bool = False) -> None:
+        """
+        Reporta progresso da tarefa
+
+        Args:
+            done: Unidades concluídas (ou fração 0-1 se total for None)
+            total: Total de unidades
+            message: Mensagem de status
+            force: Grava imediatamente, ignorando o intervalo mínimo
+        """
+        if done is not None:
+            fraction = done / total if total else done
+            self.progress = max(0.0, min(1.0, float(fraction)))
+        if message is not None:
+            self.message = message
+
+        now = time.monotonic()
+        if not force and now - self._last_write < self.manager.progress_interval:
+            return
+        self._last_write = now
+
+        if self.manager.write_progress(self.job_id, self.progress, self.message):
+            self._cancel_event.set()
+
+
+class JobManager:
+    """Pool limitado de workers para tarefas administrativas com estado persistido"""
+
+    def __init__(self, db=None):
+        self.db = db or get_db_manager()
+        self.max_workers = JOBS_CONFIG['max_workers']
+        self.progress_interval = JOBS_CONFIG['progress_interval']
+        self.heartbeat_interval = JOBS_CONFIG['heartbeat_interval']
+        self.stale_after_seconds = JOBS_CONFIG['stale_after_seconds']
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{_PROCESS_TOKEN}"
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="admin-job")
+        self._cancel_events: Dict[int, threading.Event] = {}
+        self._lock = threading.Lock()
+
+        self.ensure_table()
+        self._mark_interrupted_jobs()
+        self.db.execute_ddl(JOBS_ACTIVE_INDEX_DDL)
+
+        threading.Thread(target=self._heartbeat_loop, name="admin-job-heartbeat", daemon=True).start()
+
+    def ensure_table(self) -> bool:
+        """Cria a tabela admin_jobs se não existir"""
+        return self.db.execute_ddl(JOBS_TABLE_DDL)
+
+    @staticmethod
+    def _worker_alive(worker: Optional[str]) -> bool:
+        """
+        Se o processo dono de uma tarefa ainda existe
+
+        Só é possível verificar processos deste host; os demais são
+        considerados vivos.
+        """
+        parts = (worker or '').split(':')
+        if len(parts) < 2 or parts[0] != socket.gethostname():
+            return True
+
+        try:
+            pid = int(parts[1])
+        except ValueError:
+            return True
+        token = parts[2] if len(parts) > 2 else None
+
+        if pid == os.getpid():
+            return token == _PROCESS_TOKEN
+
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    def _mark_interrupted_jobs(self) -> None:
+        """
+        Marca como falhas as tarefas ativas cujo processo não existe mais
+
+        Vale para qualquer host: tarefas sem heartbeat há stale_after_seconds
+        (ex.: container recriado com outro hostname). Neste host, processos
+        mortos são detectados na hora pelo PID.
+        """
+        try:
+            active = self.db.fetch_all(
+                """
+                SELECT id, worker,
+                       COALESCE(heartbeat_at, started_at, created_at) < NOW() - make_interval(secs => %s) AS stale
+                FROM admin_jobs
+                WHERE status IN ('queued', 'running')
+                """,
+                (self.stale_after_seconds,)
+            )
+            interrupted = [job['id'] for job in active if job['stale'] or not self._worker_alive(job['worker'])]
+            if not interrupted:
+                return
+
+            self.db.execute_query(
+                """
+                UPDATE admin_jobs
+                SET status = 'failed', error = 'Interrompida pela reinicialização do servidor',
+                    finished_at = NOW()
+                WHERE status IN ('queued', 'running') AND id = ANY(%s)
+                """,
+                (interrupted,),
+                fetch=False
+            )
+            logger.info("%s tarefas interrompidas marcadas como falhas", len(interrupted))
+        except Exception as e:
+            logger.error("Erro ao marcar tarefas interrompidas: %s", e)
+
+    def _heartbeat_loop(self) -> None:
+        """
+        Mantém o heartbeat das tarefas deste processo e encerra as abandonadas
+
+        O heartbeat é do processo, não da função: tarefas na fila do executor
+        ou presas em uma chamada longa continuam vivas enquanto o processo
+        existir. Pedidos de cancelamento persistidos também são repassados.
+        """
+        while True:
+            time.sleep(self.heartbeat_interval)
+            with self._lock:
+                job_ids = list(self._cancel_events)
+
+            try:
+                if job_ids:
+                    rows = self.db.execute_query(
+                        """
+                        UPDATE admin_jobs SET heartbeat_at = NOW()
+                        WHERE id = ANY(%s) AND status IN ('queued', 'running')
+                        RETURNING id, cancel_requested
+                        """,
+                        (job_ids,),
+                        commit=True
+                    )
+                    for row in rows or []:
+                        if row['cancel_requested']:
+                            with self._lock:
+                                event = self._cancel_events.get(row['id'])
+                            if event is not None:
+                                event.set()
+            except Exception as e:
+                logger.error("Erro ao gravar heartbeat das tarefas: %s", e)
+
+            self._mark_interrupted_jobs()
+
+    def submit(self, kind: str, label: str, func: Callable[..., Any], *args,
+               created_by: Optional[str] = None, **kwargs) -> Optional[int]:
+        """
+        Registra e agenda uma tarefa, se não houver outra ativa do mesmo tipo
+
+        A função recebe um JobContext como primeiro argumento e pode
+        retornar um dict serializável em JSON, gravado como resultado.
+        A verificação e o INSERT são um único comando; o índice único
+        parcial impede duas tarefas ativas mesmo com cliques simultâneos.
+        Tarefas abandonadas (sem heartbeat) são encerradas antes, para não
+        bloquearem o tipo.
+
+        Args:
+            kind: Tipo da tarefa (ex: 'reindex', 'backup')
+            label: Descrição exibida no painel
+            func: Função a executar
+            created_by: Usuário que disparou a tarefa
+
+        Returns:
+            ID da tarefa ou None se já houver uma ativa do tipo
+        """
+        self._mark_interrupted_jobs()
+
+        rows = self.db.execute_query(
+            """
+            INSERT INTO admin_jobs (kind, label, status, worker, created_by, heartbeat_at)
+            SELECT %s, %s, 'queued', %s, %s, NOW()
+            WHERE NOT EXISTS (
+                SELECT 1 FROM admin_jobs WHERE kind = %s AND status IN ('queued', 'running')
+            )
+            ON CONFLICT DO NOTHING
+            RETURNING id
+            """,
+            (kind, label, self.worker_id, created_by, kind),
+            commit=True
+        )
+        if not rows:
+            return None
+        job_id = rows[0]['id']
+
+        cancel_event = threading.Event()
+        with self._lock:
+            self._cancel_events[job_id] = cancel_event
+
+        self._executor.submit(self._run, job_id, cancel_event, func, args, kwargs)
+        logger.info("Tarefa %s (%s) agendada por %s", job_id, kind, created_by)
+        return job_id
+
+    def _run(self, job_id: int, cancel_event: threading.Event, func: Callable,
+             args: tuple, kwargs: Dict) -> None:
+        """Executa a tarefa no worker e persiste o estado final"""
+        context = JobContext(self, job_id, cancel_event)
+        bind_request_context(f"job-{job_id}")
+
+        try:
+            if cancel_event.is_set():
+                raise JobCancelled()
+
+            self.db.execute_query(
+                "UPDATE admin_jobs SET status = 'running', started_at = NOW(), heartbeat_at = NOW() WHERE id = %s",
+                (job_id,),
+                fetch=False
+            )
+
+            result = func(context, *args, **kwargs)
+
+            self._finish(job_id, 'succeeded', progress=1.0, message=context.message, result=result)
+        except JobCancelled:
+            self._finish(job_id, 'cancelled', progress=context.progress, message=context.message)
+        except Exception as e:
+            logger.error("Tarefa %s falhou: %s", job_id, e)
+            self._finish(job_id, 'failed', progress=context.progress, message=context.message, error=str(e))
+        finally:
+            with self._lock:
+                self._cancel_events.pop(job_id, None)
+
+    def _finish(self, job_id: int, status: str, progress: float, message: str = None,
+                result: Optional[Dict] = None, error: Optional[str] = None) -> None:
+        """Grava o estado final da tarefa"""
+        try:
+            self.db.execute_query(
+                """
+                UPDATE admin_jobs
+                SET status = %s, progress = %s, message = %s, result = %s,
+                    error = %s, finished_at = NOW()
+                WHERE id = %s
+                """,
+                (status, progress, message, json.dumps(result, default=str) if result is not None else None,
+                 error, job_id),
+                fetch=False
+            )
+        except Exception as e:
+            logger.error("Erro ao finalizar tarefa %s: %s", job_id, e)
+
+    def write_progress(self, job_id: int, progress: float, message: str) -> bool:
+        """
+        Grava progresso e retorna se o cancelamento foi solicitado
+
+        Returns:
+            True se houver pedido de cancelamento persistido
+        """
+        try:
+            rows = self.db.execute_query(
+                """
+                UPDATE admin_jobs SET progress = %s, message = %s, heartbeat_at = NOW()
+                WHERE id = %s
+                RETURNING cancel_requested
+                """,
+                (progress, message, job_id),
+                commit=True
+            )
+            return bool(rows and rows[0]['cancel_requested'])
+        except Exception as e:
+            logger.error("Erro ao gravar progresso da tarefa %s: %s", job_id, e)
+            return False
+
+    def cancel(self, job_id: int) -> bool:
+        """
+        Solicita o cancelamento de uma tarefa
+
+        Args:
+            job_id: ID da tarefa
+
+        Returns:
+            True se o pedido foi registrado
+        """
+        with self._lock:
+            event = self._cancel_events.get(job_id)
+        if event is not None:
+            event.set()
+
+        try:
+            self.db.execute_query(
+                """
+                UPDATE admin_jobs SET cancel_requested = true
+                WHERE id = %s AND status IN ('queued', 'running')
+                """,
+                (job_id,),
+                fetch=False
+            )
+            return True
+        except Exception as e:
+            logger.error("Erro ao cancelar tarefa %s: %s", job_id, e)
+            return False
+
+    def get_job(self, job_id: int) -> Optional[Dict]:
+        """Busca uma tarefa por ID"""
+        return self.db.fetch_one("SELECT * FROM admin_jobs WHERE id = %s", (job_id,))
+
+    def list_jobs(self, limit: Optional[int] = None) -> List[Dict]:
+        """Lista as tarefas mais recentes"""
+        return self.db.fetch_all(
+            "SELECT * FROM admin_jobs ORDER BY created_at DESC, id DESC LIMIT %s",
+            (limit or JOBS_CONFIG['history_limit'],)
+        )
+
+    def has_active_job(self, kind: str) -> bool:
+        """Verifica se já existe tarefa do tipo na fila ou em execução"""
+        row = self.db.fetch_one(
+            "SELECT COUNT(*) as count FROM admin_jobs WHERE kind = %s AND status IN ('queued', 'running')",
+            (kind,)
+        )
+        return bool(row and row['count'])
+
+
+@st.cache_resource
+def get_job_manager() -> JobManager:
+    """Retorna instância única do JobManager"""
+    return JobManager()
+
+
+def submit_job(kind: str, label: str, func: Callable[..., Any], *args, **kwargs) -> Optional[int]:
+    """
+    Agenda uma tarefa a partir de uma página, evitando duplicar tarefas do mesmo tipo
+
+    Returns:
+        ID da tarefa ou None se já houver uma ativa
+    """
+    manager = get_job_manager()
+
+    job_id = manager.submit(kind, label, func, *args, **kwargs)
+    if job_id is None:
+        st.warning("⏳ Já existe uma tarefa deste tipo em andamento")
+        return None
+
+    st.success(f"🚀 Tarefa #{job_id} agendada: {label}")
+    return job_id
+
+
+def _render_jobs(manager: JobManager) -> None:
+    """Renderiza a lista de tarefas recentes"""
+    try:
+        jobs = manager.list_jobs()
+    except Exception as e:
+        st.error(f"❌ Erro ao carregar tarefas: {str(e)}")
+        return
+
+    if not jobs:
+        st.info("Nenhuma tarefa executada ainda")
+        return
+
+    for job in jobs:
+        with st.container():
+            col1, col2, col3 = st.columns([3, 2, 1])
+
+            with col1:
+                st.write(f"**#{job['id']} · {job['label']}**")
+                details = [f"por {job['created_by'] or 'sistema'}"]
+                if job.get('created_at'):
+                    details.append(job['created_at'].strftime('%d/%m/%Y %H:%M:%S'))
+                if job.get('started_at') and job.get('finished_at'):
+                    elapsed = (job['finished_at'] - job['started_at']).total_seconds()
+                    details.append(f"{elapsed:.1f}s")
+                st.caption(" · ".join(details))
+
+            with col2:
+                st.write(JOB_STATUS_LABELS.get(job['status'], job['status']))
+                if job['status'] in ACTIVE_STATUSES:
+                    st.progress(float(job['progress'] or 0), text=job.get('message') or None)
+                elif job.get('error'):
+                    st.caption(f"⚠️ {job['error']}")
+                elif job.get('message'):
+                    st.caption(job['message'])
+
+            with col3:
+                if job['status'] in ACTIVE_STATUSES and not job['cancel_requested']:
+                    if st.button("⏹️", key=f"cancel_job_{job['id']}", help="Cancelar tarefa"):
+                        manager.cancel(job['id'])
+                        st.rerun()
+
+            if job.get('result'):
+                with st.expander("📄 Resultado"):
+                    st.json(job['result'])
+
+
+def show_jobs_panel() -> None:
+    """Exibe o painel de tarefas em segundo plano com atualização automática"""
+    st.write("**⚙️ Tarefas em Segundo Plano**")
+
+    try:
+        manager = get_job_manager()
+    except Exception as e:
+        st.error(f"❌ Erro ao iniciar gerenciador de tarefas: {str(e)}")
+        return
+
+    if hasattr(st, 'fragment'):
+        # Atualiza apenas o painel, sem reexecutar a página
+        st.fragment(run_every=JOBS_CONFIG['panel_refresh_seconds'])(_render_jobs)(manager)
+    else:
+        if st.button("🔄 Atualizar Tarefas", key="refresh_jobs"):
+            st.rerun()
+        _render_jobs(manager)
@@ -0,0 +1,300 @@
+# utils/log_viewer.py - Leitura incremental do arquivo de log do dashboard
+import json
+import os
+import re
+import sys
+import logging
+from collections import deque
+from typing import List, Optional
+
+import streamlit as st
+
+# Adicionar o diretório parent ao path para importar config
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import LOGGING_CONFIG, LOG_VIEWER_CONFIG
+
+logger = logging.getLogger(__name__)
+
+LOG_LEVELS = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
+
+# Eventos JSON (utils/logging_setup.py) e, para arquivos antigos, o formato
+# texto "<data> - <logger> - <NÍVEL> - <mensagem>"
+_JSON_LEVEL_PATTERN = re.compile(rb'"level": "(DEBUG|INFO|WARNING|ERROR|CRITICAL)"')
+_TEXT_LEVEL_PATTERN = re.compile(rb' - (DEBUG|INFO|WARNING|ERROR|CRITICAL) - ')
+
+
+def parse_level(line: bytes) -> Optional[str]:
+    """
+    Extrai o nível de uma linha de log sem decodificar o JSON inteiro
+
+    Returns:
+        Nome do nível ou None para linhas de continuação (ex.: tracebacks)
+    """
+    pattern = _JSON_LEVEL_PATTERN if line.startswith(b'{') else _TEXT_LEVEL_PATTERN
+    match = pattern.search(line, 0, 200)
+    return match.group(1).decode('ascii') if match else None
+
+
+def _level_allowed(level: str, min_level: Optional[str]) -> bool:
+    """Verifica se level é igual ou mais grave que min_level"""
+    if min_level is None:
+        return True
+    return LOG_LEVELS.index(level) >= LOG_LEVELS.index(min_level)
+
+
+def _decode(line: bytes) -> str:
+    """Converte uma linha do arquivo para exibição (eventos JSON ficam legíveis)"""
+    text = line.decode('utf-8', errors='replace').rstrip('\r')
+    if not text.startswith('{'):
+        return text
+
+    try:
+        event = json.loads(text)
+    except ValueError:
+        return text
+
+    request = f" [{event['request_id']}]" if event.get('request_id') else ""
+    rendered = f"{event.get('ts', '')} {event.get('level', '')} {event.get('logger', '')}{request}: {event.get('message', '')}"
+    if event.get('exception'):
+        rendered += "\n" + event['exception']
+    return rendered
+
+
+class LogFollower:
+    """
+    Leitor do fim de um arquivo de log
+
+    tail() busca as últimas linhas lendo blocos de trás para frente; poll()
+    retorna apenas o que foi escrito desde a última leitura, a partir do
+    offset salvo. Rotação (inode diferente) e truncamento são detectados e
+    nenhuma leitura passa de max_follow_bytes, então arquivos de vários GB
+    nunca são carregados inteiros.
+    """
+
+    def __init__(self, path: Optional[str] = None, min_level: Optional[str] = None):
+        self.path = path or LOGGING_CONFIG['file']
+        self.min_level = min_level
+        self.block_size = LOG_VIEWER_CONFIG['block_size']
+        self.max_scan_bytes = LOG_VIEWER_CONFIG['max_scan_bytes']
+        self.max_follow_bytes = LOG_VIEWER_CONFIG['max_follow_bytes']
+
+        self.inode: Optional[int] = None
+        self.offset = 0
+        self.skipped_bytes = 0
+        # Linhas de continuação seguem o filtro da última linha com nível
+        self._include_continuation = True
+
+    def tail(self, count: int) -> List[str]:
+        """
+        Retorna as últimas count linhas que passam no filtro de nível
+
+        Lê no máximo max_scan_bytes a partir do fim. O offset passa a
+        apontar para o fim da última linha completa.
+
+        Args:
+            count: Quantidade de linhas
+
+        Returns:
+            Linhas em ordem cronológica
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return []
+
+        with open(self.path, 'rb') as f:
+            end = self._last_complete_line_end(f, stat.st_size)
+            matched: List[bytes] = []
+            pending: List[bytes] = []
+            position = end
+            remainder = b''
+            scanned = 0
+
+            while position > 0 and len(matched) < count and scanned < self.max_scan_bytes:
+                read_size = min(self.block_size, position)
+                position -= read_size
+                f.seek(position)
+                lines = (f.read(read_size) + remainder).split(b'\n')
+                scanned += read_size
+
+                # O primeiro pedaço pode ser o fim de uma linha do bloco anterior
+                remainder = lines.pop(0) if position > 0 else b''
+
+                for line in reversed(lines):
+                    if not line:
+                        continue
+                    self._collect(line, matched, pending)
+                    if len(matched) >= count:
+                        break
+
+            if remainder and len(matched) < count and position == 0:
+                self._collect(remainder, matched, pending)
+
+        self.inode = stat.st_ino
+        self.offset = end
+        self.skipped_bytes = 0
+        self._include_continuation = True
+
+        return [_decode(line) for line in reversed(matched[:count])]
+
+    def _collect(self, line: bytes, matched: List[bytes], pending: List[bytes]) -> None:
+        """Acumula uma linha lida de trás para frente, respeitando o filtro"""
+        level = parse_level(line)
+        if level is None:
+            pending.append(line)
+            return
+
+        if _level_allowed(level, self.min_level):
+            matched.extend(pending)
+            matched.append(line)
+        pending.clear()
+
+    def _last_complete_line_end(self, f, size: int) -> int:
+        """Offset logo após o último '\\n' (ignora uma linha sendo escrita)"""
+        position = size
+        while position > 0 and size - position < self.max_scan_bytes:
+            read_size = min(self.block_size, position)
+            position -= read_size
+            f.seek(position)
+            newline = f.read(read_size).rfind(b'\n')
+            if newline != -1:
+                return position + newline + 1
+        return 0
+
+    def poll(self) -> List[str]:
+        """
+        Retorna as linhas novas desde a última leitura
+
+        Se o arquivo foi rotacionado, termina de ler o arquivo antigo
+        (<arquivo>.1) antes de começar o novo do início.
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return []
+
+        lines: List[str] = []
+
+        if self.inode is not None and stat.st_ino != self.inode:
+            rotated = f"{self.path}.1"
+            try:
+                if os.stat(rotated).st_ino == self.inode:
+                    lines.extend(self._read_from(rotated))
+            except FileNotFoundError:
+                pass
+            self.offset = 0
+        elif stat.st_size < self.offset:
+            # Truncado
+            self.offset = 0
+
+        self.inode = stat.st_ino
+        lines.extend(self._read_from(self.path))
+        return lines
+
+    def _read_from(self, path: str) -> List[str]:
+        """Lê linhas completas de path a partir do offset salvo"""
+        with open(path, 'rb') as f:
+            size = f.seek(0, os.SEEK_END)
+            if size <= self.offset:
+                return []
+
+            start = self.offset
+            if size - start > self.max_follow_bytes:
+                # Muito atrasado: pula para o fim em vez de ler tudo
+                start = size - self.max_follow_bytes
+                self.skipped_bytes += start - self.offset
+
+            f.seek(start)
+            data = f.read(size - start)
+
+        if start != self.offset:
+            # Descarta a linha parcial onde o salto caiu
+            first_newline = data.find(b'\n')
+            data = data[first_newline + 1:] if first_newline != -1 else b''
+            start = size - len(data)
+
+        last_newline = data.rfind(b'\n')
+        if last_newline == -1:
+            self.offset = start
+            return []
+
+        self.offset = start + last_newline + 1
+
+        lines = []
+        for line in data[:last_newline].split(b'\n'):
+            if not line:
+                continue
+            level = parse_level(line)
+            if level is not None:
+                self._include_continuation = _level_allowed(level, self.min_level)
+            if self._include_continuation:
+                lines.append(_decode(line))
+
+        return lines
+
+
+def _render_log_lines() -> None:
+    """Busca linhas novas e exibe o buffer do visualizador"""
+    viewer = st.session_state.get('log_viewer')
+    if viewer is None:
+        return
+
+    viewer['lines'].extend(viewer['follower'].poll())
+
+    if viewer['follower'].skipped_bytes:
+        st.caption(f"⚠️ {viewer['follower'].skipped_bytes} bytes pulados (log cresceu rápido demais)")
+
+    st.text_area(
+        "Últimas entradas do log",
+        value="\n".join(viewer['lines']) or "Nenhuma entrada para o nível selecionado",
+        height=300,
+        disabled=True
+    )
+
+
+def show_log_viewer(min_level: str) -> None:
+    """
+    Visualizador das últimas entradas do log com acompanhamento ao vivo
+
+    Args:
+        min_level: Nível mínimo exibido
+    """
+    line_count = st.number_input(
+        "Linhas",
+        min_value=10,
+        max_value=LOG_VIEWER_CONFIG['max_lines'],
+        value=LOG_VIEWER_CONFIG['default_lines'],
+        step=50,
+        key="log_viewer_lines"
+    )
+
+    viewer = st.session_state.get('log_viewer')
+    load = st.button("📄 Ver Logs Recentes")
+
+    # Mudança de filtro ou tamanho relê o fim do arquivo
+    if viewer is not None and (viewer['min_level'] != min_level or viewer['count'] != line_count):
+        load = True
+
+    if load:
+        if not os.path.exists(LOGGING_CONFIG['file']):
+            st.info("Arquivo de log ainda não foi criado")
+            return
+
+        follower = LogFollower(min_level=min_level)
+        st.session_state['log_viewer'] = {
+            'follower': follower,
+            'lines': deque(follower.tail(line_count), maxlen=line_count),
+            'min_level': min_level,
+            'count': line_count,
+        }
+
+    if 'log_viewer' not in st.session_state:
+        return
+
+    follow = st.checkbox("Acompanhar em tempo real", value=False, key="log_viewer_follow")
+
+    if follow and hasattr(st, 'fragment'):
+        # Atualiza apenas o visualizador, sem reexecutar a página
+        st.fragment(run_every=LOG_VIEWER_CONFIG['refresh_seconds'])(_render_log_lines)()
+    else:
+        _render_log_lines()
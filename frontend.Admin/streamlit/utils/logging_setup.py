@@ -0,0 +1,153 @@
+# utils/logging_setup.py - Logging estruturado (JSON) com gravação assíncrona
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Optional
+
+# Adicionar o diretório parent ao path para importar config
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import LOGGING_CONFIG
+
+# Identificador da execução atual (rerun da página ou tarefa em segundo plano)
+request_id_var: contextvars.ContextVar = contextvars.ContextVar('request_id', default=None)
+
+# Atributos padrão do LogRecord; o resto veio de extra={...}
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {
+    'message', 'asctime', 'session_id', 'request_id'
+}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_setup_lock = threading.Lock()
+
+
+def _current_session_id() -> Optional[str]:
+    """ID da sessão Streamlit da thread atual (None fora de uma página)"""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx()
+        return ctx.session_id if ctx else None
+    except Exception:
+        return None
+
+
+def bind_request_context(request_id: Optional[str] = None) -> str:
+    """
+    Define o request_id dos logs emitidos pela thread atual
+
+    Páginas chamam no início de cada execução; tarefas em segundo plano
+    usam um ID próprio (ex.: job-<id>).
+
+    Returns:
+        request_id definido
+    """
+    request_id = request_id or uuid.uuid4().hex[:12]
+    request_id_var.set(request_id)
+    return request_id
+
+
+class ContextFilter(logging.Filter):
+    """Anexa session_id e request_id ao registro na thread que gerou o log"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.session_id = _current_session_id()
+        record.request_id = request_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Formata cada registro como um objeto JSON em uma linha"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        event = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'session_id': getattr(record, 'session_id', None),
+            'request_id': getattr(record, 'request_id', None),
+            'thread': record.threadName,
+            'location': f"{record.module}:{record.funcName}:{record.lineno}",
+        }
+
+        # Campos passados em extra={...}
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                event[key] = value
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            event['exception'] = record.exc_text
+
+        return json.dumps(event, ensure_ascii=False, default=str)
+
+
+class _StructuredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler que preserva a exceção em campo separado
+
+    O prepare() padrão concatena o traceback na mensagem; aqui o texto da
+    exceção vai para exc_text e a formatação fica para o listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def setup_logging() -> None:
+    """
+    Configura o logging do dashboard a partir de LOGGING_CONFIG (idempotente)
+
+    Os módulos só enfileiram registros; um QueueListener em thread própria
+    grava JSON no arquivo rotacionado por tamanho e texto no console, então
+    I/O de disco nunca bloqueia a execução de uma página.
+    """
+    global _listener
+
+    with _setup_lock:
+        if _listener is not None:
+            return
+
+        file_handler = logging.handlers.RotatingFileHandler(
+            LOGGING_CONFIG['file'],
+            maxBytes=LOGGING_CONFIG['max_bytes'],
+            backupCount=LOGGING_CONFIG['backup_count'],
+            encoding='utf-8'
+        )
+        file_handler.setFormatter(JsonFormatter())
+
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter(LOGGING_CONFIG['format']))
+
+        log_queue = queue.SimpleQueue()
+        queue_handler = _StructuredQueueHandler(log_queue)
+        queue_handler.addFilter(ContextFilter())
+
+        root = logging.getLogger()
+        root.setLevel(LOGGING_CONFIG['level'])
+        # Reexecuções do Streamlit não devem duplicar handlers
+        for handler in list(root.handlers):
+            if isinstance(handler, _StructuredQueueHandler):
+                root.removeHandler(handler)
+        root.addHandler(queue_handler)
+
+        _listener = logging.handlers.QueueListener(
+            log_queue, file_handler, console_handler, respect_handler_level=True
+        )
+        _listener.start()
+        atexit.register(_listener.stop)
@@ -0,0 +1,235 @@
+# utils/reconcile.py - Reconciliação entre arquivos de upload e banco de dados
+import os
+import sys
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+# Adicionar o diretório parent ao path para importar config
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import TOURNAMENT_IMAGES_PATH, THUMBNAILS_PATH, ORPHAN_CONFIG
+from utils.database import get_db_manager
+
+logger = logging.getLogger(__name__)
+
+# Só URLs com este prefixo apontam para arquivos em TOURNAMENT_IMAGES_PATH
+# (mesma regra de ImageHandler.delete_image_files); as demais são externas
+LOCAL_IMAGE_URL_PREFIX = '/uploads/tournament-images/'
+
+
+def _chunks(iterable, size: int) -> Iterator[List]:
+    """Divide um iterável em listas de até size elementos"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _has_column(db, column: str) -> bool:
+    """Verifica se tournament_images possui a coluna"""
+    return column in db.get_table_columns('tournament_images')
+
+
+def load_referenced_files(db, chunk_size: int) -> Tuple[Set[str], Set[str]]:
+    """
+    Carrega em conjuntos os nomes de arquivo referenciados no banco
+
+    Uma única query em streaming percorre image_url/thumbnail_url. Imagens
+    sem thumbnail_url também reservam o nome thumb_<arquivo>, gerado pelo
+    ImageHandler.
+
+    Returns:
+        Tuple (nomes de imagens principais, nomes de thumbnails)
+    """
+    thumbnail_column = "thumbnail_url" if _has_column(db, 'thumbnail_url') else "NULL"
+    query = f"SELECT image_url, {thumbnail_column} AS thumbnail_url FROM tournament_images"
+
+    image_names: Set[str] = set()
+    thumbnail_names: Set[str] = set()
+
+    for image_url, thumbnail_url in db.stream_query(query, chunk_size=chunk_size, as_dict=False):
+        if image_url:
+            name = os.path.basename(image_url)
+            image_names.add(name)
+            thumbnail_names.add(f"thumb_{name}")
+        if thumbnail_url:
+            thumbnail_names.add(os.path.basename(thumbnail_url))
+
+    return image_names, thumbnail_names
+
+
+def iter_unreferenced_files(directory: str, referenced: Set[str]) -> Iterator[os.DirEntry]:
+    """
+    Percorre um diretório (sem recursão) retornando arquivos não referenciados
+
+    Args:
+        directory: Diretório a percorrer
+        referenced: Nomes de arquivo referenciados no banco
+    """
+    if not os.path.isdir(directory):
+        return
+
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.startswith('.') or not entry.is_file(follow_symlinks=False):
+                continue
+            if entry.name not in referenced:
+                yield entry
+
+
+def _stat_entry(entry: os.DirEntry) -> Optional[Tuple[str, int, float]]:
+    """Retorna (caminho, tamanho, mtime) ou None se o arquivo sumiu"""
+    try:
+        stat = entry.stat(follow_symlinks=False)
+        return entry.path, stat.st_size, stat.st_mtime
+    except FileNotFoundError:
+        return None
+
+
+def _file_exists(path: str) -> bool:
+    """os.path.exists para uso em pool de threads"""
+    return os.path.exists(path)
+
+
+def reconcile_uploads(job=None, remove_files: bool = False, fix_dangling: bool = False,
+                      db=None) -> Dict:
+    """
+    Compara arquivos em disco com as referências do banco
+
+    Arquivos órfãos são arquivos sem registro; registros pendurados são
+    linhas cujo arquivo principal não existe. Registros com image_url
+    externa (ex.: http://...) não são verificados nem desativados, só
+    contados em external_rows. Chamadas stat/exists rodam
+    em paralelo e tudo é processado em lotes, então a memória fica limitada
+    aos conjuntos de nomes referenciados e a um lote por vez.
+
+    Args:
+        job: JobContext opcional para progresso e cancelamento
+        remove_files: Remove os arquivos órfãos encontrados
+        fix_dangling: Desativa (soft delete) os registros sem arquivo
+        db: DatabaseManager (padrão: instância compartilhada)
+
+    Returns:
+        Dict com contagens, bytes e amostras de arquivos/registros
+    """
+    db = db or get_db_manager()
+    chunk_size = ORPHAN_CONFIG['chunk_size']
+    report_limit = ORPHAN_CONFIG['report_limit']
+    min_age_seconds = ORPHAN_CONFIG['min_age_minutes'] * 60
+    now = time.time()
+
+    def progress(message: str) -> None:
+        if job is not None:
+            job.check_cancelled()
+            job.update(message=message)
+
+    summary = {
+        'orphan_files': 0,
+        'orphan_bytes': 0,
+        'removed_files': 0,
+        'skipped_recent': 0,
+        'dangling_rows': 0,
+        'fixed_rows': 0,
+        'external_rows': 0,
+        'orphan_samples': [],
+        'dangling_samples': [],
+    }
+
+    progress("Carregando referências do banco...")
+    image_names, thumbnail_names = load_referenced_files(db, chunk_size)
+    summary['referenced_images'] = len(image_names)
+
+    with ThreadPoolExecutor(max_workers=ORPHAN_CONFIG['workers']) as pool:
+        # === ARQUIVOS ÓRFÃOS ===
+        for directory, referenced in ((TOURNAMENT_IMAGES_PATH, image_names),
+                                      (THUMBNAILS_PATH, thumbnail_names)):
+            progress(f"Verificando {directory}...")
+
+            for entries in _chunks(iter_unreferenced_files(directory, referenced), chunk_size):
+                progress(f"Verificando {directory} ({summary['orphan_files']} órfãos até agora)")
+
+                for stat in pool.map(_stat_entry, entries):
+                    if stat is None:
+                        continue
+                    path, size, mtime = stat
+
+                    # Uploads em andamento gravam o arquivo antes do registro
+                    if now - mtime < min_age_seconds:
+                        summary['skipped_recent'] += 1
+                        continue
+
+                    summary['orphan_files'] += 1
+                    summary['orphan_bytes'] += size
+                    if len(summary['orphan_samples']) < report_limit:
+                        summary['orphan_samples'].append(path)
+
+                    if remove_files:
+                        try:
+                            os.remove(path)
+                            summary['removed_files'] += 1
+                        except OSError as e:
+                            logger.error("Erro ao remover arquivo órfão %s: %s", path, e)
+
+        # Libera memória antes de percorrer os registros
+        image_names.clear()
+        thumbnail_names.clear()
+
+        # === REGISTROS SEM ARQUIVO ===
+        progress("Verificando registros sem arquivo...")
+        query = "SELECT id, image_url FROM tournament_images WHERE COALESCE(active, true) = true ORDER BY id"
+        dangling_ids: List[int] = []
+
+        for rows in db.stream_chunks(query, chunk_size=chunk_size, as_dict=False):
+            progress(f"Verificando registros ({summary['dangling_rows']} sem arquivo até agora)")
+
+            local_rows = [row for row in rows if row[1] and row[1].startswith(LOCAL_IMAGE_URL_PREFIX)]
+            summary['external_rows'] += sum(1 for row in rows if row[1]) - len(local_rows)
+            rows = local_rows
+            paths = [os.path.join(TOURNAMENT_IMAGES_PATH, os.path.basename(row[1])) for row in rows]
+
+            for (image_id, image_url), exists in zip(rows, pool.map(_file_exists, paths)):
+                if exists:
+                    continue
+
+                summary['dangling_rows'] += 1
+                if len(summary['dangling_samples']) < report_limit:
+                    summary['dangling_samples'].append({'id': image_id, 'image_url': image_url})
+                if fix_dangling:
+                    dangling_ids.append(image_id)
+
+            if fix_dangling and len(dangling_ids) >= chunk_size:
+                summary['fixed_rows'] += _deactivate_rows(db, dangling_ids)
+                dangling_ids = []
+
+        if fix_dangling and dangling_ids:
+            summary['fixed_rows'] += _deactivate_rows(db, dangling_ids)
+
+    if job is not None:
+        job.update(1, message=(
+            f"{summary['orphan_files']} arquivos órfãos, "
+            f"{summary['dangling_rows']} registros sem arquivo, "
+            f"{summary['external_rows']} com URL externa"
+        ), force=True)
+
+    logger.info(
+        "Reconciliação concluída: %s órfãos (%s removidos), %s registros sem arquivo (%s desativados), "
+        "%s com URL externa",
+        summary['orphan_files'], summary['removed_files'], summary['dangling_rows'], summary['fixed_rows'],
+        summary['external_rows']
+    )
+    return summary
+
+
+def _deactivate_rows(db, image_ids: List[int]) -> int:
+    """Desativa registros cujo arquivo não existe mais"""
+    rows = db.execute_query(
+        "UPDATE tournament_images SET active = false WHERE id = ANY(%s) RETURNING id",
+        (image_ids,),
+        commit=True
+    )
+    db.invalidate_image_caches()
+    return len(rows or [])
@@ -0,0 +1,261 @@
+# utils/reprocess.py - Reprocessamento do catálogo com o perfil de upload atual
+import os
+import sys
+import time
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image
+
+# Adicionar o diretório parent ao path para importar config
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import TOURNAMENT_IMAGES_PATH, REPROCESS_CONFIG
+from utils.database import get_db_manager
+from utils.image_handler import ImageHandler, rendition_profile, profile_hash, prepare_image, save_image, save_thumbnail
+
+logger = logging.getLogger(__name__)
+
+RENDITIONS_TABLE = 'tournament_image_renditions'
+
+# Perfil com que as imagens de cada registro foram geradas. Serve de
+# checkpoint: um lote só é gravado depois que seus arquivos foram escritos,
+# então uma execução interrompida recomeça pelas imagens que faltaram.
+RENDITIONS_TABLE_DDL = """
+CREATE TABLE IF NOT EXISTS tournament_image_renditions (
+    image_id INTEGER PRIMARY KEY,
+    profile_hash VARCHAR(32) NOT NULL,
+    quality SMALLINT,
+    processed_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+"""
+
+RECORD_RENDITIONS_SQL = """
+INSERT INTO tournament_image_renditions (image_id, profile_hash, quality, processed_at)
+VALUES (%s, %s, %s, NOW())
+ON CONFLICT (image_id) DO UPDATE
+SET profile_hash = EXCLUDED.profile_hash,
+    quality = COALESCE(EXCLUDED.quality, tournament_image_renditions.quality),
+    processed_at = NOW()
+"""
+
+
+def ensure_renditions_table(db) -> bool:
+    """Cria a tabela de perfis por imagem se não existir"""
+    if not db.execute_ddl(RENDITIONS_TABLE_DDL):
+        return False
+    db.schema_cache.invalidate(RENDITIONS_TABLE)
+    return True
+
+
+def record_rendition(db, image_id: int, rendition_hash: str, quality: Optional[int] = None) -> bool:
+    """
+    Registra o perfil de uma imagem recém-enviada
+
+    Sem a tabela (check_database.py não executado) nada é gravado e a
+    imagem apenas entra no próximo reprocessamento.
+    """
+    if not db.get_table_columns(RENDITIONS_TABLE):
+        return False
+    return db.execute_many(RECORD_RENDITIONS_SQL, [(image_id, rendition_hash, quality)])
+
+
+def _process_context():
+    """Contexto multiprocessing (forkserver evita fork de um servidor com threads)"""
+    method = REPROCESS_CONFIG['start_method']
+    if method not in multiprocessing.get_all_start_methods():
+        method = 'spawn'
+    return multiprocessing.get_context(method)
+
+
+def render_existing(task: Tuple[int, str, str, Dict]) -> Dict:
+    """
+    Regera as imagens de um registro (executado nos processos do pool)
+
+    O thumbnail é sempre regerado a partir da imagem principal. A principal
+    só é regravada se passar de max_dimension: recodificar um JPEG do
+    mesmo tamanho apenas acumularia perdas.
+
+    Args:
+        task: (id, caminho da imagem, caminho do thumbnail, perfil)
+
+    Returns:
+        Dict com id, sucesso, dimensões/tamanho da principal se regravada
+        e bytes lidos/escritos
+    """
+    image_id, image_path, thumbnail_path, profile = task
+    result = {'id': image_id, 'success': False, 'main_rewritten': False, 'bytes_in': 0, 'bytes_out': 0}
+
+    try:
+        result['bytes_in'] = os.path.getsize(image_path)
+        max_dimension = profile['max_dimension']
+
+        with Image.open(image_path) as img:
+            resize_main = max(img.size) > max_dimension
+
+            if img.format == 'JPEG':
+                # Decodifica só a resolução necessária para o maior resultado
+                target = max_dimension if resize_main else max(profile['thumbnail_size'])
+                img.draft('RGB', (target, target))
+
+            img = prepare_image(img, max_dimension)
+
+            if resize_main:
+                result['file_size'], result['quality'] = save_image(img, image_path, profile)
+                result['image_width'], result['image_height'] = img.size
+                result['main_rewritten'] = True
+                result['bytes_out'] += result['file_size']
+
+            thumbnail_bytes, _ = save_thumbnail(img, thumbnail_path, profile)
+            result['bytes_out'] += thumbnail_bytes
+
+        result['success'] = True
+    except Exception as e:
+        result['error'] = str(e)
+
+    return result
+
+
+def _pending_batch(db, rendition_hash: str, categories: Optional[List[str]], after_id: int,
+                   limit: int, force: bool) -> List[Dict]:
+    """Próximo lote (por id) de imagens cujo perfil difere do atual"""
+    conditions = ["i.id > %s", "i.image_url IS NOT NULL"]
+    params: List = [after_id]
+
+    if not force:
+        conditions.append("(r.image_id IS NULL OR r.profile_hash <> %s)")
+        params.append(rendition_hash)
+
+    if categories:
+        conditions.append("i.category::text = ANY(%s)")
+        params.append(list(categories))
+
+    thumbnail_column = "i.thumbnail_url" if 'thumbnail_url' in db.get_table_columns('tournament_images') else "NULL"
+    query = f"""
+    SELECT i.id, i.image_url, {thumbnail_column} AS thumbnail_url
+    FROM tournament_images i
+    LEFT JOIN tournament_image_renditions r ON r.image_id = i.id
+    WHERE {' AND '.join(conditions)}
+    ORDER BY i.id
+    LIMIT %s
+    """
+    params.append(limit)
+    return db.fetch_all(query, tuple(params))
+
+
+def _store_results(db, results: List[Dict], rendition_hash: str) -> None:
+    """Grava dimensões das principais regravadas e o checkpoint do lote"""
+    rewritten = [r for r in results if r['main_rewritten']]
+    if rewritten:
+        db.execute_many(
+            "UPDATE tournament_images SET file_size = %s, image_width = %s, image_height = %s WHERE id = %s",
+            [(r['file_size'], r['image_width'], r['image_height'], r['id']) for r in rewritten]
+        )
+
+    # Qualidade só muda quando a principal é regravada (None mantém a anterior)
+    done = [(r['id'], rendition_hash, r.get('quality')) for r in results if r['success']]
+    if done:
+        db.execute_many(RECORD_RENDITIONS_SQL, done)
+
+
+def reprocess_catalog(job=None, categories: Optional[List[str]] = None, force: bool = False,
+                      db=None) -> Dict:
+    """
+    Regera imagens e thumbnails do catálogo com o perfil de UPLOAD_CONFIG atual
+
+    Imagens já geradas com o perfil atual (mesmo hash) são puladas; cada
+    lote grava seu checkpoint, então basta agendar de novo após uma queda
+    (exceto com force, que sempre percorre todo o catálogo).
+    A renderização roda em um pool de processos (PIL não libera o GIL em
+    todo o pipeline).
+
+    Args:
+        job: JobContext opcional para progresso e cancelamento
+        categories: Categorias a reprocessar (None = todas)
+        force: Reprocessa também imagens já no perfil atual
+        db: DatabaseManager (padrão: instância compartilhada)
+
+    Returns:
+        Dict com contagens, falhas, bytes e vazão
+    """
+    db = db or get_db_manager()
+    handler = ImageHandler()
+    profile = rendition_profile()
+    rendition_hash = profile_hash(profile)
+    chunk_size = REPROCESS_CONFIG['chunk_size']
+
+    if not ensure_renditions_table(db):
+        raise RuntimeError("Não foi possível criar a tabela de perfis de imagem")
+
+    summary = {
+        'profile_hash': rendition_hash,
+        'processed': 0,
+        'main_rewritten': 0,
+        'failed': 0,
+        'missing_files': 0,
+        'bytes_in': 0,
+        'bytes_out': 0,
+        'failure_samples': [],
+    }
+    started = time.perf_counter()
+    after_id = 0
+
+    with ProcessPoolExecutor(max_workers=REPROCESS_CONFIG['workers'], mp_context=_process_context()) as pool:
+        while True:
+            if job is not None:
+                job.check_cancelled()
+
+            rows = _pending_batch(db, rendition_hash, categories, after_id, chunk_size, force)
+            if not rows:
+                break
+            after_id = rows[-1]['id']
+
+            tasks = []
+            for row in rows:
+                image_path = os.path.join(TOURNAMENT_IMAGES_PATH, os.path.basename(row['image_url']))
+                if not os.path.exists(image_path):
+                    summary['missing_files'] += 1
+                    continue
+                tasks.append((row['id'], image_path, handler.get_thumbnail_path(row), profile))
+
+            results = list(pool.map(render_existing, tasks, chunksize=4))
+            _store_results(db, results, rendition_hash)
+
+            for result in results:
+                summary['bytes_in'] += result['bytes_in']
+                summary['bytes_out'] += result['bytes_out']
+                if result['success']:
+                    summary['processed'] += 1
+                    summary['main_rewritten'] += int(result['main_rewritten'])
+                else:
+                    summary['failed'] += 1
+                    if len(summary['failure_samples']) < 20:
+                        summary['failure_samples'].append({'id': result['id'], 'error': result.get('error')})
+
+            elapsed = time.perf_counter() - started
+            if job is not None:
+                job.update(message=(
+                    f"{summary['processed']} imagens reprocessadas "
+                    f"({summary['processed'] / elapsed:.1f} img/s)"
+                ))
+
+    elapsed = time.perf_counter() - started
+    summary['seconds'] = round(elapsed, 2)
+    summary['images_per_second'] = round(summary['processed'] / elapsed, 2) if elapsed else None
+    summary['throughput_mb_s'] = round(summary['bytes_in'] / (1024 * 1024) / elapsed, 2) if elapsed else None
+
+    if summary['main_rewritten']:
+        db.invalidate_image_caches()
+
+    if job is not None:
+        job.update(1, message=(
+            f"{summary['processed']} imagens reprocessadas, {summary['failed']} falhas "
+            f"({summary['images_per_second'] or 0} img/s)"
+        ), force=True)
+
+    logger.info(
+        "Reprocessamento concluído: %s imagens (%s principais regravadas), %s falhas, %s img/s",
+        summary['processed'], summary['main_rewritten'], summary['failed'], summary['images_per_second']
+    )
+    return summary
@@ -0,0 +1,167 @@
+# utils/review_queue.py - Fila de revisão de imagens pendentes
+import logging
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, List, Optional
+import sys
+import os
+
+# Adicionar o diretório parent ao path para importar config
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import REVIEW_QUEUE_CONFIG
+from utils.image_handler import ImageHandler
+
+logger = logging.getLogger(__name__)
+
+class ReviewQueue:
+    """
+    Fila de revisão de um moderador
+
+    Reserva lotes de imagens pendentes no banco (FOR UPDATE SKIP LOCKED),
+    pré-carrega o próximo lote e seus thumbnails em uma thread de fundo e
+    grava as decisões em lote a cada flush_size revisões.
+    """
+
+    def __init__(self, db, moderator: str, moderator_id: Optional[int] = None):
+        self.db = db
+        self.moderator = moderator
+        self.moderator_id = moderator_id
+        self.batch_size = REVIEW_QUEUE_CONFIG['batch_size']
+        self.flush_size = REVIEW_QUEUE_CONFIG['flush_size']
+        self.lease_minutes = REVIEW_QUEUE_CONFIG['claim_lease_minutes']
+        self.handler = ImageHandler()
+
+        self.batch: List[Dict] = []
+        self.position = 0
+        self.pending_decisions: Dict[int, bool] = {}
+        self.reviewed_count = 0
+        self.exhausted = False
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="review-prefetch")
+        self._prefetch: Optional[Future] = None
+
+    def _load_batch(self) -> List[Dict]:
+        """Reserva o próximo lote e carrega os thumbnails (executa em background)"""
+        images = self.db.claim_review_batch(
+            self.moderator,
+            limit=self.batch_size,
+            lease_minutes=self.lease_minutes
+        )
+
+        for image in images:
+            # URL servida por arquivo ou, sem ela, os bytes já lidos
+            image['thumbnail_src'] = self.handler.thumbnail_src(image)
+
+        return images
+
+    def _start_prefetch(self) -> None:
+        """Dispara o pré-carregamento do próximo lote se ainda não houver um"""
+        if self._prefetch is None and not self.exhausted:
+            self._prefetch = self._executor.submit(self._load_batch)
+
+    def _next_batch(self) -> None:
+        """Troca para o lote pré-carregado (ou carrega de forma síncrona)"""
+        if self._prefetch is not None:
+            future, self._prefetch = self._prefetch, None
+            self.batch = future.result()
+        else:
+            self.batch = self._load_batch()
+
+        self.position = 0
+
+        if self.batch:
+            self._start_prefetch()
+        else:
+            self.exhausted = True
+
+    def current(self) -> Optional[Dict]:
+        """
+        Retorna a imagem em revisão
+
+        Returns:
+            Dicionário da imagem ou None se a fila estiver vazia
+        """
+        if self.position >= len(self.batch) and not self.exhausted:
+            self._next_batch()
+
+        if self.position < len(self.batch):
+            return self.batch[self.position]
+
+        return None
+
+    def remaining_in_batch(self) -> int:
+        """Quantidade de imagens ainda não revisadas no lote atual"""
+        return max(0, len(self.batch) - self.position)
+
+    def decide(self, approved: bool) -> None:
+        """
+        Registra a decisão para a imagem atual e avança
+
+        Args:
+            approved: True para aprovar, False para rejeitar
+        """
+        image = self.current()
+        if image is None:
+            return
+
+        self.pending_decisions[image['id']] = approved
+        self.reviewed_count += 1
+        self.position += 1
+
+        if len(self.pending_decisions) >= self.flush_size:
+            self.flush()
+
+    def approve(self) -> None:
+        """Aprova a imagem atual"""
+        self.decide(True)
+
+    def reject(self) -> None:
+        """Rejeita a imagem atual"""
+        self.decide(False)
+
+    def skip(self) -> None:
+        """Pula a imagem atual devolvendo-a para a fila"""
+        image = self.current()
+        if image is None:
+            return
+
+        self.db.release_review_claims(self.moderator, [image['id']])
+        self.position += 1
+
+    def flush(self) -> int:
+        """
+        Grava as decisões pendentes no banco
+
+        Returns:
+            Número de imagens atualizadas
+        """
+        if not self.pending_decisions:
+            return 0
+
+        decisions, self.pending_decisions = self.pending_decisions, {}
+
+        try:
+            return self.db.apply_review_decisions(decisions, self.moderator, self.moderator_id)
+        except Exception:
+            # Mantém as decisões para nova tentativa
+            decisions.update(self.pending_decisions)
+            self.pending_decisions = decisions
+            raise
+
+    def close(self) -> None:
+        """Grava decisões pendentes e libera todas as reservas do moderador"""
+        try:
+            self.flush()
+        finally:
+            # Se o pré-carregamento já começou, aguarda para não liberar antes da reserva
+            if self._prefetch is not None and not self._prefetch.cancel():
+                try:
+                    self._prefetch.result()
+                except Exception as e:
+                    logger.error("Erro no pré-carregamento da fila de revisão: %s", e)
+            self._prefetch = None
+
+            self.db.release_review_claims(self.moderator)
+            self._executor.shutdown(wait=False)
+            self.batch = []
+            self.position = 0
+            self.exhausted = True
@@ -0,0 +1,406 @@
+# utils/thumbnail_store.py - Thumbnails empacotados em arquivos grandes com leitura via mmap
+import mmap
+import os
+import shutil
+import struct
+import sys
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: apenas o lock entre threads do processo
+    fcntl = None
+
+# Adicionar o diretório parent ao path para importar config
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import THUMBNAIL_STORE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Registro do índice: operação, pack, offset, tamanho, tamanho do nome (+ nome)
+_RECORD = struct.Struct('<BIQIH')
+_OP_PUT = 1
+_OP_DELETE = 0
+
+# Intervalo mínimo entre verificações de escritas de outros processos em
+# leituras com acerto (faltas sempre verificam)
+REFRESH_INTERVAL = 1.0
+
+
+class ThumbnailStore:
+    """
+    Armazena thumbnails em pack files append-only com um índice de offsets
+
+    Layout em disco (path/):
+        CURRENT                 geração ativa
+        <geração>/index.log     registros (put/delete) na ordem de escrita
+        <geração>/pack-NNNNN.dat
+
+    Leituras são fatias de um mmap do pack (memoryview, sem cópia). Escritas
+    acrescentam os bytes ao pack e depois o registro ao índice, com lock de
+    arquivo para que réplicas e processos de reprocessamento compartilhem o
+    diretório. Outros processos veem as escritas relendo o fim do índice.
+    A compactação copia as entradas vivas para uma nova geração e troca
+    CURRENT; mmaps da geração antiga continuam válidos até serem liberados.
+
+    Dois locks: _write_mutex (com o lock de arquivo) serializa escritores e
+    pode ficar preso durante toda a compactação; _lock protege só o índice
+    em memória e nunca é mantido durante cópias, então leituras não esperam.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or THUMBNAIL_STORE_CONFIG['path']
+        self.pack_max_bytes = THUMBNAIL_STORE_CONFIG['pack_max_bytes']
+        os.makedirs(self.path, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._write_mutex = threading.Lock()
+        self._compacting = False
+        self._current_stat: Optional[Tuple[int, int]] = None
+        self._checked_at = 0.0
+        self._load(self._read_current())
+
+    # =====================================================
+    # ÍNDICE
+    # =====================================================
+
+    def _read_current(self) -> int:
+        """Geração ativa (0 se o diretório é novo)"""
+        try:
+            with open(os.path.join(self.path, 'CURRENT')) as f:
+                return int(f.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def _generation_dir(self, generation: int) -> str:
+        return os.path.join(self.path, f"{generation:06d}")
+
+    def _pack_path(self, pack_id: int, generation: Optional[int] = None) -> str:
+        directory = self._generation_dir(self.generation if generation is None else generation)
+        return os.path.join(directory, f"pack-{pack_id:05d}.dat")
+
+    def _load(self, generation: int) -> None:
+        """Carrega do zero o índice de uma geração"""
+        self.generation = generation
+        os.makedirs(self._generation_dir(generation), exist_ok=True)
+        self.index_path = os.path.join(self._generation_dir(generation), 'index.log')
+
+        self._entries: Dict[str, Tuple[int, int, int]] = {}
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._index_offset = 0
+        self.live_bytes = 0
+        self.dead_bytes = 0
+        self.current_pack = 1
+        self._replay()
+
+    def _replay(self) -> None:
+        """Aplica os registros do índice escritos desde a última leitura"""
+        try:
+            with open(self.index_path, 'rb') as f:
+                f.seek(self._index_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+
+        position = 0
+        while position + _RECORD.size <= len(data):
+            op, pack_id, offset, length, name_length = _RECORD.unpack_from(data, position)
+            end = position + _RECORD.size + name_length
+            if end > len(data):
+                break  # Registro sendo escrito por outro processo
+            name = data[position + _RECORD.size:end].decode('utf-8')
+            position = end
+
+            previous = self._entries.pop(name, None)
+            if previous is not None:
+                self.live_bytes -= previous[2]
+                self.dead_bytes += previous[2]
+
+            if op == _OP_PUT:
+                self._entries[name] = (pack_id, offset, length)
+                self.live_bytes += length
+                self.current_pack = max(self.current_pack, pack_id)
+
+        self._index_offset += position
+
+    def _current_changed(self) -> bool:
+        """Se CURRENT mudou desde a última leitura (stat, sem abrir o arquivo)"""
+        try:
+            stat = os.stat(os.path.join(self.path, 'CURRENT'))
+            current = (stat.st_ino, stat.st_mtime_ns)
+        except FileNotFoundError:
+            current = None
+        if current == self._current_stat:
+            return False
+        self._current_stat = current
+        return True
+
+    def _refresh(self, force: bool = False) -> None:
+        """
+        Acompanha escritas e compactações feitas por outros processos
+
+        Sem force, verifica no máximo a cada REFRESH_INTERVAL segundos.
+        """
+        now = time.monotonic()
+        if not force and now - self._checked_at < REFRESH_INTERVAL:
+            return
+        self._checked_at = now
+
+        if self._current_changed():
+            generation = self._read_current()
+            if generation != self.generation:
+                self._load(generation)
+                return
+
+        try:
+            size = os.path.getsize(self.index_path)
+        except FileNotFoundError:
+            return
+        if size > self._index_offset:
+            self._replay()
+
+    @contextmanager
+    def _write_lock(self) -> Iterator[None]:
+        """
+        Lock exclusivo entre escritores (threads e, onde houver fcntl, processos)
+
+        Não segura _lock: quem altera o índice em memória o pega só para isso.
+        """
+        with self._write_mutex:
+            with open(os.path.join(self.path, 'LOCK'), 'a') as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    with self._lock:
+                        self._refresh(force=True)
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _append_record(self, op: int, name: str, pack_id: int = 0, offset: int = 0, length: int = 0) -> None:
+        """Acrescenta um registro ao índice e o aplica localmente"""
+        encoded = name.encode('utf-8')
+        with self._lock:
+            with open(self.index_path, 'ab') as f:
+                f.write(_RECORD.pack(op, pack_id, offset, length, len(encoded)) + encoded)
+            self._replay()
+
+    # =====================================================
+    # LEITURA E ESCRITA
+    # =====================================================
+
+    def get(self, name: str) -> Optional[memoryview]:
+        """
+        Retorna os bytes de um thumbnail como fatia do mmap (sem cópia)
+
+        Consumidores de buffer (escrita em arquivo, base64, hash) usam a
+        fatia diretamente; quem precisa de bytes faz a única cópia.
+
+        Args:
+            name: Nome do arquivo do thumbnail (thumb_<arquivo>)
+
+        Returns:
+            memoryview ou None se não estiver no store
+        """
+        with self._lock:
+            self._refresh()
+            if name not in self._entries:
+                self._refresh(force=True)
+
+            try:
+                return self._slice(name)
+            except FileNotFoundError:
+                # Outro processo compactou e removeu a geração entre o
+                # refresh e a abertura do pack: recarregar e tentar de novo
+                self._load(self._read_current())
+                return self._slice(name)
+
+    def _slice(self, name: str) -> Optional[memoryview]:
+        """Fatia do mmap de uma entrada do índice carregado"""
+        entry = self._entries.get(name)
+        if entry is None:
+            return None
+        pack_id, offset, length = entry
+        return memoryview(self._map(pack_id, offset + length))[offset:offset + length]
+
+    def _map(self, pack_id: int, min_size: int = 0) -> mmap.mmap:
+        """mmap de um pack da geração carregada, remapeado se for menor que min_size"""
+        mapped = self._maps.get(pack_id)
+        if mapped is None or min_size > len(mapped):
+            # Pack cresceu desde o último mapeamento; o mmap antigo
+            # continua vivo enquanto houver fatias em uso
+            with open(self._pack_path(pack_id), 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[pack_id] = mapped
+        return mapped
+
+    def version(self, name: str) -> Optional[Tuple[int, int, int]]:
+        """Identificador da versão armazenada (muda a cada put)"""
+        with self._lock:
+            self._refresh()
+            entry = self._entries.get(name)
+            return (self.generation, entry[0], entry[1]) if entry else None
+
+    def put(self, name: str, data: bytes) -> None:
+        """Acrescenta (ou substitui) um thumbnail"""
+        with self._write_lock():
+            pack_path = self._pack_path(self.current_pack)
+            if os.path.exists(pack_path) and os.path.getsize(pack_path) + len(data) > self.pack_max_bytes:
+                self.current_pack += 1
+                pack_path = self._pack_path(self.current_pack)
+
+            # Bytes ainda sem registro no índice: leitores não os enxergam
+            with open(pack_path, 'ab') as f:
+                offset = f.tell()
+                f.write(data)
+
+            self._append_record(_OP_PUT, name, self.current_pack, offset, len(data))
+
+        self._maybe_compact()
+
+    def delete(self, name: str) -> bool:
+        """Remove um thumbnail (o espaço é recuperado na compactação)"""
+        with self._write_lock():
+            with self._lock:
+                if name not in self._entries:
+                    return False
+            self._append_record(_OP_DELETE, name)
+
+        self._maybe_compact()
+        return True
+
+    def stats(self) -> Dict:
+        """Entradas, bytes vivos/mortos e geração"""
+        with self._lock:
+            self._refresh(force=True)
+            return {
+                'entries': len(self._entries),
+                'live_bytes': self.live_bytes,
+                'dead_bytes': self.dead_bytes,
+                'generation': self.generation,
+                'packs': self.current_pack,
+            }
+
+    # =====================================================
+    # COMPACTAÇÃO
+    # =====================================================
+
+    def _maybe_compact(self) -> None:
+        """Dispara a compactação em segundo plano se houver espaço morto demais"""
+        dead = self.dead_bytes
+        if dead < THUMBNAIL_STORE_CONFIG['compact_min_dead_bytes']:
+            return
+        if dead / max(1, dead + self.live_bytes) < THUMBNAIL_STORE_CONFIG['compact_dead_ratio']:
+            return
+
+        with self._lock:
+            if self._compacting:
+                return
+            self._compacting = True
+
+        threading.Thread(target=self._compact_in_background, name="thumbnail-compaction", daemon=True).start()
+
+    def _compact_in_background(self) -> None:
+        try:
+            self.compact()
+        except Exception as e:
+            logger.error("Erro ao compactar thumbnails: %s", e)
+        finally:
+            self._compacting = False
+
+    def compact(self) -> Dict:
+        """
+        Copia as entradas vivas para uma nova geração e a ativa
+
+        Escritas ficam bloqueadas durante a cópia; leituras não: _lock só é
+        usado para tirar o retrato das entradas vivas e para trocar o índice.
+
+        Returns:
+            Dict com entradas copiadas e bytes recuperados
+        """
+        with self._write_lock():
+            # Com o lock de escrita ninguém altera a geração atual; o retrato
+            # guarda os mmaps usados, que continuam válidos mesmo se um leitor
+            # remapear o pack enquanto a cópia acontece
+            with self._lock:
+                old_generation = self.generation
+                reclaimed = self.dead_bytes
+                live = sorted(self._entries.items())
+                sizes: Dict[int, int] = {}
+                for _, (source_pack, offset, length) in live:
+                    sizes[source_pack] = max(sizes.get(source_pack, 0), offset + length)
+                maps = {source_pack: self._map(source_pack, size) for source_pack, size in sizes.items()}
+            new_generation = old_generation + 1
+
+            shutil.rmtree(self._generation_dir(new_generation), ignore_errors=True)
+            os.makedirs(self._generation_dir(new_generation))
+
+            pack_id, pack_size = 1, 0
+            records = []
+            pack = open(self._pack_path(pack_id, new_generation), 'wb')
+            try:
+                for name, (source_pack, offset, length) in live:
+                    if pack_size and pack_size + length > self.pack_max_bytes:
+                        pack.close()
+                        pack_id, pack_size = pack_id + 1, 0
+                        pack = open(self._pack_path(pack_id, new_generation), 'wb')
+                    with memoryview(maps[source_pack])[offset:offset + length] as data:
+                        pack.write(data)
+                    encoded = name.encode('utf-8')
+                    records.append(_RECORD.pack(_OP_PUT, pack_id, pack_size, length, len(encoded)) + encoded)
+                    pack_size += length
+                pack.flush()
+                os.fsync(pack.fileno())
+            finally:
+                pack.close()
+
+            index_path = os.path.join(self._generation_dir(new_generation), 'index.log')
+            with open(index_path, 'wb') as f:
+                f.write(b''.join(records))
+                f.flush()
+                os.fsync(f.fileno())
+
+            current_tmp = os.path.join(self.path, 'CURRENT.tmp')
+            with open(current_tmp, 'w') as f:
+                f.write(str(new_generation))
+            os.replace(current_tmp, os.path.join(self.path, 'CURRENT'))
+
+            with self._lock:
+                self._load(new_generation)
+            # mmaps da geração antiga continuam válidos após a remoção (POSIX)
+            shutil.rmtree(self._generation_dir(old_generation), ignore_errors=True)
+
+        logger.info("Thumbnails compactados: %s entradas, %s bytes recuperados", len(live), reclaimed)
+        return {'entries': len(live), 'reclaimed_bytes': reclaimed}
+
+
+_store: Optional[ThumbnailStore] = None
+_store_lock = threading.Lock()
+
+
+def get_thumbnail_store() -> Optional[ThumbnailStore]:
+    """Retorna o store do processo ou None se THUMBNAIL_STORE_CONFIG['enabled'] for False"""
+    global _store
+    if not THUMBNAIL_STORE_CONFIG['enabled']:
+        return None
+
+    with _store_lock:
+        if _store is None:
+            _store = ThumbnailStore()
+        return _store
+
+
+def compact_thumbnail_store(job=None) -> Dict:
+    """Compacta o store (para uso como tarefa em segundo plano)"""
+    store = get_thumbnail_store()
+    if store is None:
+        return {'entries': 0, 'reclaimed_bytes': 0}
+
+    if job is not None:
+        job.update(message="Copiando thumbnails vivos para uma nova geração...", force=True)
+    return store.compact()